@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Time the venv summaries of `pipx list` with each executor (serial, threads,
+processes) for different numbers of venvs.
+
+The venvs are synthetic: a pipx_metadata.json, a python symlink and a few
+apps each, with the apps linked into a bin directory, which is all that
+`pipx list` looks at.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+DEFAULT_VENV_COUNTS = [10, 100, 1000]
+EXECUTORS = ["serial", "threads", "processes"]
+APPS_PER_VENV = 3
+
+
+def make_venvs(pipx_home: Path, bin_dir: Path, n_venvs: int) -> None:
+    from pipx.pipx_metadata_file import PackageInfo, PipxMetadata
+    from pipx.util import get_venv_paths
+
+    python_version = f"Python {sys.version.split()[0]}"
+    bin_dir.mkdir(parents=True)
+    for i in range(n_venvs):
+        venv_dir = pipx_home / "venvs" / f"package-{i:04d}"
+        venv_bin_path, python_path = get_venv_paths(venv_dir)
+        venv_bin_path.mkdir(parents=True)
+        python_path.symlink_to(sys.executable)
+        apps = [f"app-{i:04d}-{j}" for j in range(APPS_PER_VENV)]
+        for app in apps:
+            (venv_bin_path / app).write_text("#!/bin/sh\n")
+            (bin_dir / app).symlink_to(venv_bin_path / app)
+
+        pipx_metadata = PipxMetadata(venv_dir, read=False)
+        pipx_metadata.main_package = PackageInfo(
+            package=f"package-{i:04d}",
+            package_or_url=f"package-{i:04d}",
+            pip_args=[],
+            include_dependencies=False,
+            include_apps=True,
+            apps=apps,
+            app_paths=[venv_bin_path / app for app in apps],
+            apps_of_dependencies=[],
+            app_paths_of_dependencies={},
+            package_version="1.0.0",
+        )
+        pipx_metadata.python_version = python_version
+        pipx_metadata.write()
+    # like a bin directory that was not just changed, see _get_bin_dir_index
+    an_hour_ago = time.time() - 3600
+    os.utime(bin_dir, (an_hour_ago, an_hour_ago))
+
+
+def time_summaries(venv_dirs: List[Path], executor: str, runs: int) -> List[float]:
+    from pipx.commands.list_packages import iter_package_summaries
+
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        for _ in iter_package_summaries(venv_dirs, False, executor):
+            pass
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--venvs",
+        type=int,
+        action="append",
+        help="Number of venvs to time (default: 10, 100 and 1000)",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pipx_home = Path(tmp_dir) / "pipxhome"
+        bin_dir = Path(tmp_dir) / "bin"
+        # before pipx is imported, constants are read at import time
+        os.environ["PIPX_HOME"] = str(pipx_home)
+        os.environ["PIPX_BIN_DIR"] = str(bin_dir)
+        from pipx.commands.list_packages import choose_list_executor
+
+        print(f"{'venvs':>6} " + " ".join(f"{e + ' ms':>13}" for e in EXECUTORS))
+        venv_counts = args.venvs or DEFAULT_VENV_COUNTS
+        for n_venvs in venv_counts:
+            make_venvs(pipx_home, bin_dir, n_venvs)
+            venv_dirs = sorted((pipx_home / "venvs").iterdir())
+            medians = [
+                statistics.median(time_summaries(venv_dirs, executor, args.runs))
+                for executor in EXECUTORS
+            ]
+            print(
+                f"{n_venvs:>6} "
+                + " ".join(f"{m * 1e3:>13.1f}" for m in medians)
+                + f"   (pipx list uses {choose_list_executor(n_venvs)})"
+            )
+            for venv_dir in venv_dirs:
+                venv_dir.rename(Path(tmp_dir) / f"done-{n_venvs}-{venv_dir.name}")
+            for app in bin_dir.iterdir():
+                app.unlink()
+            bin_dir.rmdir()
+
+
+if __name__ == "__main__":
+    main()
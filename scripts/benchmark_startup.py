@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Compare app startup time with the shared libraries attached to each venv via
+pipx_shared.pth (the default) and with them detached (PIPX_DETACH_SHARED_LIBS).
+
+Each app is installed into a fresh PIPX_HOME for both modes, then run
+repeatedly with arguments that make it exit immediately.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# (package, app, app args)
+DEFAULT_APPS: List[Tuple[str, str, List[str]]] = [
+    ("pycowsay", "pycowsay", ["moo"]),
+    ("black", "black", ["--version"]),
+    ("httpie", "http", ["--version"]),
+    ("pylint", "pylint", ["--version"]),
+]
+
+
+def install_apps(pipx_home: Path, packages: List[str], detach: bool) -> Dict[str, str]:
+    env = dict(os.environ)
+    env["PIPX_HOME"] = str(pipx_home)
+    env["PIPX_BIN_DIR"] = str(pipx_home / "bin")
+    env["PIPX_DETACH_SHARED_LIBS"] = "1" if detach else "0"
+    for package in packages:
+        subprocess.run(
+            [sys.executable, "-m", "pipx", "install", package],
+            env=env,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+    return env
+
+
+def time_app(app_path: Path, app_args: List[str], runs: int) -> List[float]:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [str(app_path)] + app_args,
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument(
+        "--package",
+        action="append",
+        help="Only benchmark these packages (default: all built-in examples)",
+    )
+    args = parser.parse_args()
+
+    apps = [a for a in DEFAULT_APPS if not args.package or a[0] in args.package]
+    packages = [package for (package, _, _) in apps]
+
+    results: Dict[Tuple[str, bool], List[float]] = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for detach in (False, True):
+            pipx_home = Path(tmp_dir) / ("detached" if detach else "attached")
+            print(f"installing {', '.join(packages)} into {pipx_home}")
+            install_apps(pipx_home, packages, detach)
+            for (package, app, app_args) in apps:
+                app_path = pipx_home / "bin" / app
+                # warm up filesystem caches and write bytecode
+                time_app(app_path, app_args, 2)
+                results[(app, detach)] = time_app(app_path, app_args, args.runs)
+
+    print()
+    print(f"{'app':<12} {'attached ms':>12} {'detached ms':>12} {'change':>8}")
+    for (_, app, _) in apps:
+        attached = statistics.median(results[(app, False)]) * 1e3
+        detached = statistics.median(results[(app, True)]) * 1e3
+        change = (detached - attached) / attached * 100
+        print(f"{app:<12} {attached:>12.1f} {detached:>12.1f} {change:>+7.1f}%")
+
+
+if __name__ == "__main__":
+    main()
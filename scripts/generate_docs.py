@@ -40,6 +40,8 @@ params = {
     "uninstall": get_help("uninstall"),
     "uninstallall": get_help("uninstall-all"),
     "reinstallall": get_help("reinstall-all"),
+    "relocate": get_help("relocate"),
+    "relocateall": get_help("relocate-all"),
     "list": get_help("list"),
     "run": get_help("run"),
     "version": __version__,
@@ -1,7 +1,7 @@
 import shutil
 import sys
 from contextlib import contextmanager
-from threading import Event, Thread
+from threading import Event, Thread, current_thread, main_thread
 from typing import Generator, List
 
 from pipx.constants import WINDOWS, emoji_support
@@ -24,6 +24,9 @@ if WINDOWS:
 
 
 def _env_supports_animation() -> bool:
+    # several commands running in threads would animate over each other
+    if current_thread() is not main_thread():
+        return False
     (term_cols, _) = shutil.get_terminal_size(fallback=(0, 0))
     return stderr_is_tty and term_cols > MINIMUM_COLS_ALLOW_ANIMATION
 
@@ -0,0 +1,271 @@
+"""Optional cache of installed venvs, shared between machines.
+
+With PIPX_ARTIFACT_CACHE set to a directory (which may be on a network
+filesystem) or to an http(s) URL accepting PUT and GET, `pipx install` and
+`pipx run` look for a ready venv before creating one, and add the venvs they
+build to the cache.  A fleet of machines, or CI jobs, then build each venv
+once.
+
+Entries are pipx bundles (see venv_bundle.py) of one venv, named by a key
+made of the normalized package spec, the versions pip resolves it to, and
+the platform and ABI of the interpreter.  So a new release of any
+dependency makes a new entry, and a venv is never used with an interpreter
+that cannot run its compiled extensions.  Specs pip resolves to direct
+references (URLs and local paths), and editable installs, are never cached.
+
+Errors of the cache backend are logged and treated as a cache miss: the
+cache can only make an install faster, never make it fail.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Union
+
+from packaging.requirements import InvalidRequirement, Requirement
+from packaging.utils import canonicalize_name
+
+import pipx.shared_libs  # import instead of from so mockable in tests
+from pipx import constants, trace, wheelhouse
+from pipx.animate import animate
+from pipx.package_specifier import package_or_url_from_pep508
+from pipx.pipx_metadata_file import PipxMetadata
+from pipx.util import PipxError, mkdir, rmdir, run_subprocess
+from pipx.venv import Venv
+from pipx.venv_bundle import (
+    BUNDLE_VENVS_DIR,
+    get_python_tags,
+    get_venv_info,
+    unpack_bundle,
+    write_bundle,
+)
+from pipx.venv_relocate import relocate_venv_in_place
+
+logger = logging.getLogger(__name__)
+
+_ENTRY_SUFFIX = ".tar.gz"
+_HTTP_TIMEOUT_SEC = 60
+
+
+class CacheKey(NamedTuple):
+    digest: str
+    python_tags: Dict[str, Optional[str]]
+
+
+class _DirectoryBackend:
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = cache_dir
+
+    def get(self, name: str, dest_path: Path) -> bool:
+        try:
+            shutil.copyfile(str(self.cache_dir / name), str(dest_path))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def put(self, name: str, src_path: Path) -> None:
+        mkdir(self.cache_dir)
+        # other machines must never see part of an entry
+        tmp_path = self.cache_dir / f".{name}.{os.getpid()}.tmp"
+        try:
+            shutil.copyfile(str(src_path), str(tmp_path))
+            os.replace(str(tmp_path), str(self.cache_dir / name))
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+
+class _HttpBackend:
+    def __init__(self, url: str) -> None:
+        self.url = url.rstrip("/")
+
+    def get(self, name: str, dest_path: Path) -> bool:
+        try:
+            with urllib.request.urlopen(
+                f"{self.url}/{name}", timeout=_HTTP_TIMEOUT_SEC
+            ) as response, dest_path.open("wb") as dest_fh:
+                shutil.copyfileobj(response, dest_fh)
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                return False
+            raise
+        return True
+
+    def put(self, name: str, src_path: Path) -> None:
+        with src_path.open("rb") as src_fh:
+            request = urllib.request.Request(
+                f"{self.url}/{name}",
+                data=src_fh,
+                method="PUT",
+                headers={
+                    "Content-Type": "application/octet-stream",
+                    "Content-Length": str(src_path.stat().st_size),
+                },
+            )
+            urllib.request.urlopen(request, timeout=_HTTP_TIMEOUT_SEC).close()
+
+
+def _get_backend() -> Optional[Union[_DirectoryBackend, _HttpBackend]]:
+    location = constants.PIPX_ARTIFACT_CACHE
+    if not location:
+        return None
+    if location.startswith(("http://", "https://")):
+        return _HttpBackend(location)
+    return _DirectoryBackend(Path(location).expanduser())
+
+
+def is_enabled() -> bool:
+    return bool(constants.PIPX_ARTIFACT_CACHE)
+
+
+def _resolve_versions(
+    package_spec: str, python: str, pip_args: List[str]
+) -> Optional[List[str]]:
+    """name==version of every package pip would install for package_spec, or
+    None if it cannot tell or any of them is a direct reference
+    """
+    shared_libs = pipx.shared_libs.shared_libs
+    if not shared_libs.is_valid:
+        shared_libs.create()
+    process = run_subprocess(
+        [
+            shared_libs.python_path,
+            "-m",
+            "pip",
+            "--python",
+            python,
+            "install",
+            "--dry-run",
+            "--ignore-installed",
+            "--report",
+            "-",
+            "-q",
+        ]
+        + wheelhouse.get_pip_args()
+        + pip_args
+        + [package_spec],
+        output_tail_lines=None,
+    )
+    if process.returncode:
+        logger.info(f"Unable to resolve {package_spec} for the artifact cache")
+        return None
+    try:
+        report = json.loads(process.stdout)
+    except ValueError:
+        return None
+    versions = []
+    for item in report.get("install", []):
+        if item.get("is_direct"):
+            return None
+        metadata = item["metadata"]
+        versions.append(f"{canonicalize_name(metadata['name'])}=={metadata['version']}")
+    return sorted(versions)
+
+
+def get_cache_key(
+    package_spec: str,
+    python: str,
+    pip_args: List[str],
+    venv_args: List[str],
+    *,
+    include_dependencies: bool,
+    suffix: str = "",
+) -> Optional[CacheKey]:
+    """Key of the cache entry for the venv these arguments install, or None if
+    the cache is disabled or cannot be used for it
+    """
+    if not is_enabled() or "--editable" in pip_args or "-e" in pip_args:
+        return None
+    try:
+        requirement = Requirement(package_spec)
+    except InvalidRequirement:
+        return None
+    if requirement.url:
+        return None
+
+    with trace.span("artifact_cache_key", spec=package_spec):
+        versions = _resolve_versions(package_spec, python, pip_args)
+        if versions is None:
+            return None
+        python_tags = get_python_tags(python)
+    key_data = {
+        "spec": package_or_url_from_pep508(requirement),
+        "versions": versions,
+        "python": python_tags,
+        "pip_args": pip_args,
+        "venv_args": venv_args,
+        "include_dependencies": include_dependencies,
+        "suffix": suffix,
+        "pipx_metadata_version": PipxMetadata.__METADATA_VERSION__,
+    }
+    digest = hashlib.sha256(
+        json.dumps(key_data, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+    logger.info(f"Artifact cache key {digest} for {key_data}")
+    return CacheKey(digest, python_tags)
+
+
+def fetch_venv(key: CacheKey, venv: Venv, python: str) -> bool:
+    """Unpack the venv cached under key to venv.root, which must not exist.
+    Returns whether it was in the cache.
+    """
+    backend = _get_backend()
+    if backend is None:
+        return False
+    staging_dir = constants.PIPX_STAGING_DIR / f"artifact-{os.getpid()}-{key.digest}"
+    mkdir(staging_dir)
+    entry_path = staging_dir / f"{key.digest}{_ENTRY_SUFFIX}"
+    try:
+        with animate("checking artifact cache", venv.do_animation):
+            try:
+                if not backend.get(entry_path.name, entry_path):
+                    logger.info(f"Artifact cache miss for {venv.name}")
+                    return False
+            except (OSError, urllib.error.URLError) as e:
+                logger.warning(f"Not using artifact cache: {e}")
+                return False
+            try:
+                venvs_info = unpack_bundle(
+                    entry_path, staging_dir, python, key.python_tags
+                )
+            except PipxError as e:
+                logger.warning(f"Not using invalid artifact cache entry: {e}")
+                return False
+        ((name, venv_info),) = venvs_info.items()
+        mkdir(venv.root.parent)
+        (staging_dir / BUNDLE_VENVS_DIR / name).rename(venv.root)
+    finally:
+        rmdir(staging_dir)
+
+    with animate(f"relocating {venv.name}", venv.do_animation):
+        relocate_venv_in_place(venv, python, [Path(venv_info["root"])])
+    logger.info(f"Artifact cache hit for {venv.name}")
+    return True
+
+
+def store_venv(key: CacheKey, venv: Venv) -> None:
+    """Add venv to the cache under key"""
+    backend = _get_backend()
+    if backend is None:
+        return
+    staging_dir = constants.PIPX_STAGING_DIR / f"artifact-{os.getpid()}-{key.digest}"
+    mkdir(staging_dir)
+    entry_path = staging_dir / f"{key.digest}{_ENTRY_SUFFIX}"
+    try:
+        with animate("adding to artifact cache", venv.do_animation):
+            venv_info = get_venv_info(
+                venv, {venv.python_path.resolve(): key.python_tags}
+            )
+            write_bundle(entry_path, {venv.root.name: venv_info})
+            backend.put(entry_path.name, entry_path)
+    except (OSError, urllib.error.URLError) as e:
+        logger.warning(f"Unable to add {venv.name} to artifact cache: {e}")
+    else:
+        logger.info(f"Added {venv.name} to artifact cache")
+    finally:
+        rmdir(staging_dir)
@@ -1,24 +1,39 @@
+from pipx.commands.bundle import export_bundle, import_bundle
+from pipx.commands.dedup import dedup
 from pipx.commands.ensure_path import ensure_pipx_paths
 from pipx.commands.inject import inject
-from pipx.commands.install import install
+from pipx.commands.install import install, install_packages
 from pipx.commands.list_packages import list_packages
 from pipx.commands.reinstall import reinstall, reinstall_all
+from pipx.commands.relocate import relocate, relocate_all
 from pipx.commands.run import run
 from pipx.commands.run_pip import run_pip
+from pipx.commands.sync import sync
 from pipx.commands.uninstall import uninstall, uninstall_all
-from pipx.commands.upgrade import upgrade, upgrade_all
+from pipx.commands.upgrade import upgrade, upgrade_all, upgrade_shared
+from pipx.commands.wheelhouse import wheelhouse_clear, wheelhouse_fill
 
 __all__ = [
     "upgrade",
     "upgrade_all",
+    "upgrade_shared",
     "run",
     "install",
+    "install_packages",
     "inject",
     "uninstall",
     "uninstall_all",
     "reinstall",
     "reinstall_all",
+    "relocate",
+    "relocate_all",
     "list_packages",
     "run_pip",
     "ensure_pipx_paths",
+    "sync",
+    "wheelhouse_clear",
+    "wheelhouse_fill",
+    "dedup",
+    "export_bundle",
+    "import_bundle",
 ]
@@ -0,0 +1,125 @@
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+from pipx import constants
+from pipx.animate import animate
+from pipx.colors import bold
+from pipx.commands.common import expose_venv_apps, prepare_shared_libs
+from pipx.constants import EXIT_CODE_OK, ExitCode
+from pipx.emojies import stars
+from pipx.util import PipxError, mkdir, rmdir
+from pipx.venv import Venv, VenvContainer
+from pipx.venv_bundle import (
+    BUNDLE_VENVS_DIR,
+    check_compatible,
+    get_python_tags,
+    get_venv_info,
+    read_bundle_venvs_info,
+    unpack_bundle,
+    write_bundle,
+)
+from pipx.venv_relocate import relocate_venv_in_place
+
+
+def export_bundle(
+    venv_container: VenvContainer,
+    packages: Sequence[str],
+    bundle_path: Path,
+    verbose: bool,
+    *,
+    all_venvs: bool,
+) -> ExitCode:
+    """Write the venvs named packages (or all venvs) to a bundle that
+    import_bundle can install elsewhere.  Returns pipx exit code.
+    """
+    if all_venvs:
+        venv_dirs = sorted(venv_container.iter_venv_dirs())
+    elif packages:
+        venv_dirs = [venv_container.get_venv_dir(package) for package in packages]
+    else:
+        raise PipxError("Specify the packages to export, or --all")
+
+    venvs_info: Dict[str, Any] = {}
+    tags_by_python: Dict[Path, Dict[str, Optional[str]]] = {}
+    for venv_dir in venv_dirs:
+        if not venv_dir.is_dir():
+            raise PipxError(f"Nothing to export for {venv_dir.name!r}, not installed")
+        venv = Venv(venv_dir, verbose=verbose, read_only=True)
+        if not venv.package_metadata:
+            raise PipxError(
+                f"""
+                Cannot export {venv.name!r}. It has missing internal pipx
+                metadata. Please uninstall and install this package to fix.
+                """
+            )
+        venvs_info[venv_dir.name] = get_venv_info(venv, tags_by_python)
+
+    with animate(f"exporting {len(venv_dirs)} venvs", not verbose):
+        write_bundle(bundle_path, venvs_info)
+
+    print(
+        f"exported {', '.join(bold(name) for name in venvs_info)} "
+        f"to {bundle_path} {stars}"
+    )
+    return EXIT_CODE_OK
+
+
+def import_bundle(
+    bundle_path: Path,
+    venv_container: VenvContainer,
+    local_bin_dir: Path,
+    python: str,
+    verbose: bool,
+    *,
+    force: bool,
+) -> ExitCode:
+    """Install the venvs in a bundle written by export_bundle, pointed at
+    python, and expose their apps.  Returns pipx exit code.
+    """
+    python_tags = get_python_tags(python)
+    venvs_info = read_bundle_venvs_info(bundle_path)
+    check_compatible(venvs_info, python, python_tags)
+    existing = [
+        name for name in venvs_info if venv_container.get_venv_dir(name).exists()
+    ]
+    if existing and not force:
+        raise PipxError(
+            f"""
+            {', '.join(existing)} already installed. Pass '--force' to
+            replace them with the ones in {bundle_path}.
+            """
+        )
+
+    staging_dir = constants.PIPX_STAGING_DIR / f"import-{os.getpid()}"
+    mkdir(staging_dir)
+    try:
+        with animate(f"unpacking {bundle_path.name}", not verbose):
+            unpack_bundle(bundle_path, staging_dir, python, python_tags)
+    except (Exception, KeyboardInterrupt):
+        rmdir(staging_dir)
+        raise
+
+    venvs = []
+    for name in venvs_info:
+        venv_dir = venv_container.get_venv_dir(name)
+        if venv_dir.exists():
+            rmdir(venv_dir)
+        (staging_dir / BUNDLE_VENVS_DIR / name).rename(venv_dir)
+        venvs.append(Venv(venv_dir, python=python, verbose=verbose))
+    rmdir(staging_dir)
+
+    if any(venv.uses_shared_libs for venv in venvs):
+        prepare_shared_libs(verbose, python)
+    for venv in venvs:
+        with animate(f"relocating {venv.name}", venv.do_animation):
+            relocate_venv_in_place(
+                venv, python, [Path(venvs_info[venv.root.name]["root"])]
+            )
+        expose_venv_apps(venv, local_bin_dir, force=force)
+
+    print(
+        f"imported {', '.join(bold(venv.name) for venv in venvs)} "
+        f"from {bundle_path} {stars}"
+    )
+    return EXIT_CODE_OK
@@ -1,25 +1,28 @@
 import logging
+import os
 import shlex
 import shutil
 import sys
 import tempfile
+import threading
 import time
 from pathlib import Path
 from shutil import which
 from tempfile import TemporaryDirectory
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
-import userpath  # type: ignore
 from packaging.utils import canonicalize_name
 
-from pipx import constants
+import pipx.shared_libs  # import instead of from so mockable in tests
+from pipx import constants, trace
 from pipx.colors import bold, red
-from pipx.constants import WINDOWS
+from pipx.constants import DEFAULT_JOBS, WINDOWS, ExitCode
 from pipx.emojies import hazard, stars
 from pipx.package_specifier import parse_specifier_for_install, valid_pypi_name
-from pipx.pipx_metadata_file import PackageInfo
-from pipx.util import PipxError, mkdir, pipx_wrap, rmdir
+from pipx.pipx_metadata_file import PackageInfo, PipxMetadata
+from pipx.util import PipxError, get_venv_paths, mkdir, pipx_wrap, rmdir
 from pipx.venv import Venv
+from pipx.venv_relocate import prepare_venv_move, swap_venv_dirs
 
 logger = logging.getLogger(__name__)
 
@@ -52,10 +55,91 @@ class VenvProblems:
 def expose_apps_globally(
     local_bin_dir: Path, app_paths: List[Path], *, force: bool, suffix: str = ""
 ) -> None:
-    if not _can_symlink(local_bin_dir):
-        _copy_package_apps(local_bin_dir, app_paths, suffix=suffix)
-    else:
-        _symlink_package_apps(local_bin_dir, app_paths, force=force, suffix=suffix)
+    with trace.span("expose_apps", apps=[str(p) for p in app_paths]):
+        if not _can_symlink(local_bin_dir):
+            _copy_package_apps(local_bin_dir, app_paths, suffix=suffix)
+        else:
+            _symlink_package_apps(local_bin_dir, app_paths, force=force, suffix=suffix)
+
+
+def expose_venv_apps(venv: Venv, local_bin_dir: Path, *, force: bool) -> None:
+    """Expose the apps of every package in venv that was installed with apps"""
+    for package_metadata in venv.package_metadata.values():
+        if not package_metadata.include_apps:
+            continue
+        expose_apps_globally(
+            local_bin_dir,
+            package_metadata.app_paths,
+            force=force,
+            suffix=package_metadata.suffix,
+        )
+        if package_metadata.include_dependencies:
+            for _, app_paths in package_metadata.app_paths_of_dependencies.items():
+                expose_apps_globally(
+                    local_bin_dir,
+                    app_paths,
+                    force=force,
+                    suffix=package_metadata.suffix,
+                )
+
+
+def get_app_links(venv: Venv) -> Dict[str, Path]:
+    """Map the name of each app venv exposes in the local bin dir to the app's
+    path inside venv
+    """
+    app_links: Dict[str, Path] = {}
+    for package_metadata in venv.package_metadata.values():
+        if not package_metadata.include_apps:
+            continue
+        app_paths = list(package_metadata.app_paths)
+        if package_metadata.include_dependencies:
+            for dep_paths in package_metadata.app_paths_of_dependencies.values():
+                app_paths += dep_paths
+        for app_path in app_paths:
+            app_links[add_suffix(app_path.name, package_metadata.suffix)] = app_path
+    return app_links
+
+
+def get_staged_venv_dir(venv_dir: Path) -> Path:
+    return constants.PIPX_STAGING_DIR / venv_dir.name
+
+
+def swap_in_staged_venv(
+    staged_venv: Venv,
+    venv_dir: Path,
+    local_bin_dir: Path,
+    *,
+    old_app_links: Dict[str, Path],
+    force: bool,
+) -> Venv:
+    """Replace venv_dir with the fully built staged_venv, then update the apps
+    exposed in local_bin_dir.  Apps stay on the PATH the whole time.
+    """
+    old_venv_dir = constants.PIPX_STAGING_DIR / f"{venv_dir.name}.old"
+    rmdir(old_venv_dir)
+
+    # the worker's interpreter would keep using the staged location
+    staged_venv.close_pip_worker()
+    prepare_venv_move(staged_venv.root, venv_dir, staged_venv.pipx_metadata)
+    swap_venv_dirs(staged_venv.root, venv_dir, old_venv_dir)
+    logger.info(f"swapped staged venv {staged_venv.root} into {venv_dir}")
+
+    venv = Venv(venv_dir, verbose=staged_venv.verbose)
+    new_app_links = get_app_links(venv)
+    for link_name in set(old_app_links) - set(new_app_links):
+        link_path = local_bin_dir / link_name
+        if WINDOWS:
+            if link_path.exists():
+                link_path.unlink()
+        elif link_path.is_symlink() and Path(os.readlink(str(link_path))) == (
+            old_app_links[link_name]
+        ):
+            logger.info(f"removing symlink {str(link_path)}")
+            link_path.unlink()
+    expose_venv_apps(venv, local_bin_dir, force=force)
+
+    rmdir(old_venv_dir)
+    return venv
 
 
 _can_symlink_cache: Dict[Path, bool] = {}
@@ -163,7 +247,7 @@ def get_package_summary(
     new_install: bool = False,
     include_injected: bool = False,
 ) -> Tuple[str, VenvProblems]:
-    venv = Venv(venv_dir)
+    venv = Venv(venv_dir, read_only=True)
     python_path = venv.python_path.resolve()
 
     if package is None:
@@ -226,27 +310,122 @@ def get_package_summary(
     )
 
 
+def get_venv_record(venv_dir: Path) -> Dict[str, Any]:
+    """What `pipx list --json` shows about venv_dir.  Only reads the venv's
+    pipx metadata and the apps directory, without running any subprocess.
+    """
+    bin_path, python_path = get_venv_paths(venv_dir)
+    problems = []
+    try:
+        pipx_metadata = PipxMetadata(venv_dir)
+    except PipxError:
+        pipx_metadata = PipxMetadata(venv_dir, read=False)
+        problems.append("unknown_metadata_version")
+
+    main_package = pipx_metadata.main_package
+    if main_package.package is None and not problems:
+        problems.append("missing_metadata")
+    if not python_path.resolve().is_file():
+        problems.append("invalid_interpreter")
+    if venv_dir.name != canonicalize_name(venv_dir.name):
+        problems.append("bad_venv_name")
+    if main_package.package is not None and main_package.package_version is None:
+        problems.append("not_installed")
+
+    expected_apps = set()
+    for package_info in [main_package] + list(pipx_metadata.injected_packages.values()):
+        if package_info.include_apps:
+            expected_apps.update(package_info.apps)
+        if package_info.include_dependencies:
+            expected_apps.update(package_info.apps_of_dependencies)
+    exposed_apps = sorted(
+        p.name
+        for p in _get_exposed_app_paths_for_package(
+            bin_path, sorted(expected_apps), constants.LOCAL_BIN_DIR
+        )
+    )
+    missing_apps = sorted(
+        {add_suffix(app, main_package.suffix) for app in expected_apps}
+        - set(exposed_apps)
+    )
+
+    return {
+        "venv": venv_dir.name,
+        "venv_dir": str(venv_dir),
+        "python": str(python_path),
+        "python_version": pipx_metadata.python_version,
+        "main_package": main_package._asdict(),
+        "injected_packages": {
+            name: package_info._asdict()
+            for (name, package_info) in pipx_metadata.injected_packages.items()
+        },
+        "exposed_apps": exposed_apps,
+        "missing_apps": missing_apps,
+        "problems": problems,
+    }
+
+
+# local_bin_dir -> (mtime of local_bin_dir, symlinks by the (st_dev, st_ino)
+#   of the directory they resolve into, other files)
+_bin_dir_index_cache: Dict[
+    Path, Tuple[int, Dict[Tuple[int, int], List[Path]], List[Path]]
+] = {}
+_bin_dir_index_lock = threading.Lock()
+
+
+def _get_bin_dir_index(
+    local_bin_dir: Path,
+) -> Tuple[Dict[Tuple[int, int], List[Path]], List[Path]]:
+    """Symlinks in local_bin_dir by the directory they point into, and the
+    other files in local_bin_dir.  Kept until local_bin_dir changes, so
+    `pipx list` reads local_bin_dir once rather than once per venv.
+    """
+    with _bin_dir_index_lock:
+        bin_dir_stat = local_bin_dir.stat()
+        mtime = bin_dir_stat.st_mtime_ns
+        cached = _bin_dir_index_cache.get(local_bin_dir)
+        if cached is not None and cached[0] == mtime:
+            return (cached[1], cached[2])
+
+        can_symlink = _can_symlink(local_bin_dir)
+        symlinks_by_dir: Dict[Tuple[int, int], List[Path]] = {}
+        other_files = []
+        for b in local_bin_dir.iterdir():
+            try:
+                # sometimes symlinks can resolve to a file of a different name
+                # (in the case of ansible for example) so checking the resolved paths
+                # is not a reliable way to determine if the symlink exists.
+                # We always use the stricter check on non-Windows systems. On
+                # Windows, we use a less strict check if we don't have a symlink.
+                if can_symlink and b.is_symlink():
+                    target_dir_stat = b.resolve().parent.stat()
+                    symlinks_by_dir.setdefault(
+                        (target_dir_stat.st_dev, target_dir_stat.st_ino), []
+                    ).append(b)
+                else:
+                    other_files.append(b)
+            except FileNotFoundError:
+                pass
+        # a change within the mtime resolution of some filesystems would go
+        #   unnoticed, so only keep the index of a directory that has not just
+        #   been changed
+        if time.time() - bin_dir_stat.st_mtime > 2:
+            _bin_dir_index_cache[local_bin_dir] = (mtime, symlinks_by_dir, other_files)
+        return (symlinks_by_dir, other_files)
+
+
 def _get_exposed_app_paths_for_package(
     venv_bin_path: Path, package_binary_names: List[str], local_bin_dir: Path
 ) -> Set[Path]:
-    bin_symlinks = set()
-    for b in local_bin_dir.iterdir():
-        try:
-            # sometimes symlinks can resolve to a file of a different name
-            # (in the case of ansible for example) so checking the resolved paths
-            # is not a reliable way to determine if the symlink exists.
-            # We always use the stricter check on non-Windows systems. On
-            # Windows, we use a less strict check if we don't have a symlink.
-            if _can_symlink(local_bin_dir) and b.is_symlink():
-                is_same_file = b.resolve().parent.samefile(venv_bin_path)
-            else:
-                is_same_file = b.name in package_binary_names
-
-            if is_same_file:
-                bin_symlinks.add(b)
-
-        except FileNotFoundError:
-            pass
+    symlinks_by_dir, other_files = _get_bin_dir_index(local_bin_dir)
+    bin_symlinks = {b for b in other_files if b.name in package_binary_names}
+    try:
+        venv_bin_stat = venv_bin_path.stat()
+    except FileNotFoundError:
+        return bin_symlinks
+    bin_symlinks.update(
+        symlinks_by_dir.get((venv_bin_stat.st_dev, venv_bin_stat.st_ino), [])
+    )
     return bin_symlinks
 
 
@@ -304,7 +483,9 @@ def package_name_from_spec(
     # check syntax and clean up spec and pip_args
     (package_spec, pip_args) = parse_specifier_for_install(package_spec, pip_args)
 
-    with tempfile.TemporaryDirectory() as temp_venv_dir:
+    with trace.span(
+        "package_name_from_spec", spec=package_spec
+    ), tempfile.TemporaryDirectory() as temp_venv_dir:
         venv = Venv(Path(temp_venv_dir), python=python, verbose=verbose)
         venv.create_venv(venv_args=[], pip_args=[])
         package_name = venv.install_package_no_deps(
@@ -383,6 +564,8 @@ def run_post_install_actions(
 
 
 def warn_if_not_on_path(local_bin_dir: Path) -> None:
+    import userpath  # type: ignore
+
     if not userpath.in_current_path(str(local_bin_dir)):
         logger.warning(
             pipx_wrap(
@@ -403,3 +586,46 @@ def add_suffix(name: str, suffix: str) -> str:
 
     app = Path(name)
     return f"{app.stem}{suffix}{app.suffix}"
+
+
+def prepare_shared_libs(verbose: bool, python: Optional[str] = None) -> None:
+    """Create or upgrade the shared libs for python (by default, the default
+    Python) up front, before commands that run concurrently would each check
+    them
+    """
+    if python is None:
+        shared_libs = pipx.shared_libs.shared_libs
+    else:
+        shared_libs = pipx.shared_libs.get_shared_libs_for_python(python)
+    if not shared_libs.is_valid:
+        shared_libs.create(verbose)
+    elif shared_libs.needs_upgrade:
+        shared_libs.upgrade(verbose=verbose)
+
+
+def run_concurrently(
+    tasks: List[Tuple[str, Callable[[], ExitCode]]], jobs: Optional[int] = None
+) -> List[ExitCode]:
+    """Run each (name, task) in one of up to jobs threads, and return their
+    exit codes in the same order.  A task that raises PipxError fails with its
+    message printed, prefixed with the task name, without stopping the others.
+    """
+    if jobs is None:
+        jobs = DEFAULT_JOBS
+
+    def run_task(name: str, task: Callable[[], ExitCode]) -> ExitCode:
+        try:
+            return task()
+        except PipxError as e:
+            print(f"{name}: {e}", file=sys.stderr)
+            logger.debug(f"PipxError in {name}: {e}", exc_info=True)
+            return ExitCode(1)
+
+    if jobs <= 1 or len(tasks) <= 1:
+        return [run_task(name, task) for (name, task) in tasks]
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=min(jobs, len(tasks))) as executor:
+        futures = [executor.submit(run_task, name, task) for (name, task) in tasks]
+        return [future.result() for future in futures]
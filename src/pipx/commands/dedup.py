@@ -0,0 +1,52 @@
+from functools import partial
+from pathlib import Path
+from typing import List, Optional
+
+import pipx.shared_libs  # import instead of from so mockable in tests
+from pipx import constants, dedup_store
+from pipx.commands.common import run_concurrently
+from pipx.constants import EXIT_CODE_OK, ExitCode
+from pipx.emojies import sleep, stars
+from pipx.util import mkdir
+from pipx.venv import VenvContainer
+
+
+def dedup(
+    venv_container: VenvContainer, verbose: bool, *, jobs: Optional[int] = None
+) -> ExitCode:
+    """Hardlink the installed files of all venvs, and the shared libraries, to
+    the store, and remove files no venv uses from it.  Returns pipx exit code.
+    """
+    mkdir(constants.PIPX_DEDUP_STORE_DIR)
+    venv_dirs: List[Path] = sorted(venv_container.iter_venv_dirs())
+    venv_dirs += [
+        shared_libs.root for shared_libs in pipx.shared_libs.iter_shared_libs()
+    ]
+
+    stats: List[dedup_store.DedupStats] = []
+
+    def dedup_venv(venv_dir: Path) -> ExitCode:
+        stats.append(dedup_store.dedup_venv(venv_dir))
+        return EXIT_CODE_OK
+
+    run_concurrently(
+        [(venv_dir.name, partial(dedup_venv, venv_dir)) for venv_dir in venv_dirs],
+        jobs,
+    )
+    (n_removed, bytes_removed) = dedup_store.prune_store()
+
+    n_linked = sum(s.n_linked for s in stats)
+    if n_linked:
+        mb_linked = sum(s.bytes_linked for s in stats) / 1e6
+        print(
+            f"Deduplicated {n_linked} of {sum(s.n_files for s in stats)} files "
+            f"in {len(venv_dirs)} venvs, saving {mb_linked:.1f} MB {stars}"
+        )
+    else:
+        print(f"No new files to deduplicate in {len(venv_dirs)} venvs {sleep}")
+    if n_removed:
+        print(
+            f"Removed {n_removed} unused files ({bytes_removed / 1e6:.1f} MB) "
+            f"from {constants.PIPX_DEDUP_STORE_DIR}"
+        )
+    return EXIT_CODE_OK
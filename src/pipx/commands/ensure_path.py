@@ -4,8 +4,6 @@ import sys
 from pathlib import Path
 from typing import Optional, Tuple
 
-import userpath  # type: ignore
-
 from pipx import constants
 from pipx.constants import EXIT_CODE_OK, ExitCode
 from pipx.emojies import hazard, stars
@@ -55,6 +53,8 @@ def ensure_path(location: Path, *, force: bool) -> Tuple[bool, bool]:
     """Ensure location is in user's PATH or add it to PATH.
     Returns True if location was added to PATH
     """
+    import userpath  # type: ignore
+
     location_str = str(location)
     path_added = False
     need_shell_restart = userpath.need_shell_restart(location_str)
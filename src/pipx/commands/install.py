@@ -1,9 +1,18 @@
+import sys
+from functools import partial
 from pathlib import Path
 from typing import List, Optional
 
-from pipx import constants
-from pipx.commands.common import package_name_from_spec, run_post_install_actions
+from pipx import artifact_cache, constants
+from pipx.colors import bold
+from pipx.commands.common import (
+    package_name_from_spec,
+    prepare_shared_libs,
+    run_concurrently,
+    run_post_install_actions,
+)
 from pipx.constants import EXIT_CODE_INSTALL_VENV_EXISTS, EXIT_CODE_OK, ExitCode
+from pipx.emojies import hazard, stars
 from pipx.util import pipx_wrap
 from pipx.venv import Venv, VenvContainer
 
@@ -55,17 +64,32 @@ def install(
             )
             return EXIT_CODE_INSTALL_VENV_EXISTS
 
-    try:
-        venv.create_venv(venv_args, pip_args)
-        venv.install_package(
-            package=package_name,
-            package_or_url=package_spec,
-            pip_args=pip_args,
+    cache_key = None
+    if not exists:
+        cache_key = artifact_cache.get_cache_key(
+            package_spec,
+            python,
+            pip_args,
+            venv_args,
             include_dependencies=include_dependencies,
-            include_apps=True,
-            is_main_package=True,
             suffix=suffix,
         )
+
+    try:
+        if cache_key is not None and artifact_cache.fetch_venv(cache_key, venv, python):
+            # a ready venv, from another machine or an earlier install
+            cache_key = None
+        else:
+            venv.create_venv(venv_args, pip_args)
+            venv.install_package(
+                package=package_name,
+                package_or_url=package_spec,
+                pip_args=pip_args,
+                include_dependencies=include_dependencies,
+                include_apps=True,
+                is_main_package=True,
+                suffix=suffix,
+            )
         run_post_install_actions(
             venv,
             package_name,
@@ -79,5 +103,83 @@ def install(
         venv.remove_venv()
         raise
 
+    if cache_key is not None:
+        artifact_cache.store_venv(cache_key, venv)
     # Any failure to install will raise PipxError, otherwise success
     return EXIT_CODE_OK
+
+
+def install_packages(
+    package_specs: List[str],
+    local_bin_dir: Path,
+    python: str,
+    pip_args: List[str],
+    venv_args: List[str],
+    verbose: bool,
+    *,
+    force: bool,
+    include_dependencies: bool,
+    suffix: str = "",
+    jobs: Optional[int] = None,
+) -> ExitCode:
+    """Install each of package_specs into its own venv, up to jobs at a time.
+    Returns pipx exit code, which is not OK if any package failed to install.
+    """
+    # the same spec twice would be installed into the same venv concurrently
+    package_specs = list(dict.fromkeys(package_specs))
+    if len(package_specs) == 1:
+        return install(
+            None,
+            None,
+            package_specs[0],
+            local_bin_dir,
+            python,
+            pip_args,
+            venv_args,
+            verbose,
+            force=force,
+            include_dependencies=include_dependencies,
+            suffix=suffix,
+        )
+
+    # once, instead of in every thread creating a venv
+    prepare_shared_libs(verbose, python)
+    exit_codes = run_concurrently(
+        [
+            (
+                package_spec,
+                partial(
+                    install,
+                    None,
+                    None,
+                    package_spec,
+                    local_bin_dir,
+                    python,
+                    pip_args,
+                    venv_args,
+                    verbose,
+                    force=force,
+                    include_dependencies=include_dependencies,
+                    suffix=suffix,
+                ),
+            )
+            for package_spec in package_specs
+        ],
+        jobs,
+    )
+
+    failed = [
+        package_spec
+        for (package_spec, exit_code) in zip(package_specs, exit_codes)
+        if exit_code
+    ]
+    n_installed = len(package_specs) - len(failed)
+    if not failed:
+        print(f"Installed all {n_installed} packages {stars}")
+        return EXIT_CODE_OK
+    print(
+        f"Installed {n_installed} of {len(package_specs)} packages. "
+        f"Not installed: {', '.join(bold(spec) for spec in failed)} {hazard}",
+        file=sys.stderr,
+    )
+    return ExitCode(1)
@@ -1,25 +1,114 @@
+import json
+import os
 from functools import partial
 from pathlib import Path
-from typing import Callable, Collection, Optional
+from typing import Callable, Iterator, List, Tuple, TypeVar
 
 from pipx import constants
 from pipx.colors import bold
-from pipx.commands.common import VenvProblems, get_package_summary
+from pipx.commands.common import VenvProblems, get_package_summary, get_venv_record
 from pipx.constants import EXIT_CODE_LIST_PROBLEM, EXIT_CODE_OK, ExitCode
 from pipx.emojies import sleep
 from pipx.venv import VenvContainer
 
-Pool: Optional[Callable]
-try:
-    import multiprocessing.synchronize  # noqa: F401
-    from multiprocessing import Pool
-except ImportError:
-    Pool = None
+# Summarizing a venv is mostly stat calls and reading a small JSON file, about
+#   a quarter of a millisecond.  Below a few dozen venvs that is less than
+#   the cost of starting any pool.  Threads overlap the I/O of more venvs,
+#   and for many venvs processes also avoid contention on the GIL.  See
+#   scripts/benchmark_list.py.
+LIST_THREADS_MIN_VENVS = 32
+LIST_PROCESSES_MIN_VENVS = 500
 
+# version of the `pipx list --json` format
+LIST_JSON_SPEC_VERSION = "0.1"
 
-def list_packages(venv_container: VenvContainer, include_injected: bool) -> ExitCode:
+T = TypeVar("T")
+
+
+def choose_list_executor(n_venvs: int) -> str:
+    if n_venvs < LIST_THREADS_MIN_VENVS or (os.cpu_count() or 1) == 1:
+        return "serial"
+    elif n_venvs < LIST_PROCESSES_MIN_VENVS:
+        return "threads"
+    else:
+        return "processes"
+
+
+def _map_venv_dirs(
+    func: Callable[[Path], T], dirs: List[Path], executor: str
+) -> Iterator[T]:
+    """func applied to each of dirs, in order, each result yielded as soon as
+    it and all before it are done
+    """
+    if executor != "serial":
+        # multiprocessing is slow to import, only pay for it when needed
+        try:
+            import multiprocessing.synchronize  # noqa: F401
+            from multiprocessing import Pool
+            from multiprocessing.pool import ThreadPool
+        except ImportError:
+            executor = "serial"
+    if executor == "serial":
+        yield from map(func, dirs)
+        return
+
+    n_workers = os.cpu_count() or 1
+    if executor == "processes":
+        pool = Pool(n_workers)
+        # big enough chunks to amortize pickling, small enough to keep
+        #   output flowing
+        chunksize = max(1, len(dirs) // (n_workers * 8))
+    else:
+        pool = ThreadPool(min(n_workers * 4, len(dirs)))
+        chunksize = 1
+    try:
+        yield from pool.imap(func, dirs, chunksize)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def iter_package_summaries(
+    dirs: List[Path], include_injected: bool, executor: str
+) -> Iterator[Tuple[str, VenvProblems]]:
+    summarize = partial(get_package_summary, include_injected=include_injected)
+    return _map_venv_dirs(summarize, dirs, executor)
+
+
+def _list_json(dirs: List[Path], json_lines: bool) -> ExitCode:
+    any_problems = False
+    records = _map_venv_dirs(get_venv_record, dirs, choose_list_executor(len(dirs)))
+    if json_lines:
+        for record in records:
+            print(json.dumps(record, default=str), flush=True)
+            any_problems = any_problems or bool(record["problems"])
+    else:
+        venvs = {}
+        for record in records:
+            venvs[record["venv"]] = record
+            any_problems = any_problems or bool(record["problems"])
+        print(
+            json.dumps(
+                {"pipx_spec_version": LIST_JSON_SPEC_VERSION, "venvs": venvs},
+                default=str,
+                indent=2,
+                sort_keys=True,
+            )
+        )
+    return EXIT_CODE_LIST_PROBLEM if any_problems else EXIT_CODE_OK
+
+
+def list_packages(
+    venv_container: VenvContainer,
+    include_injected: bool,
+    json_format: bool = False,
+    json_lines: bool = False,
+) -> ExitCode:
     """Returns pipx exit code."""
-    dirs: Collection[Path] = sorted(venv_container.iter_venv_dirs())
+    dirs: List[Path] = sorted(venv_container.iter_venv_dirs())
+    if json_format or json_lines:
+        return _list_json(dirs, json_lines)
+
     if not dirs:
         print(f"nothing has been installed with pipx {sleep}")
         return EXIT_CODE_OK
@@ -30,23 +119,12 @@ def list_packages(venv_container: VenvContainer, include_injected: bool) -> Exit
     venv_container.verify_shared_libs()
 
     all_venv_problems = VenvProblems()
-    if Pool:
-        p = Pool()
-        try:
-            for package_summary, venv_problems in p.map(
-                partial(get_package_summary, include_injected=include_injected), dirs
-            ):
-                print(package_summary)
-                all_venv_problems.or_(venv_problems)
-        finally:
-            p.close()
-            p.join()
-    else:
-        for package_summary, venv_problems in map(
-            partial(get_package_summary, include_injected=include_injected), dirs
-        ):
-            print(package_summary)
-            all_venv_problems.or_(venv_problems)
+    executor = choose_list_executor(len(dirs))
+    for package_summary, venv_problems in iter_package_summaries(
+        dirs, include_injected, executor
+    ):
+        print(package_summary, flush=True)
+        all_venv_problems.or_(venv_problems)
 
     if all_venv_problems.bad_venv_name:
         print(
@@ -57,7 +135,7 @@ def list_packages(venv_container: VenvContainer, include_injected: bool) -> Exit
     if all_venv_problems.invalid_interpreter:
         print(
             "\nOne or more packages have a missing python interpreter.\n"
-            "    To fix, execute: pipx reinstall-all"
+            "    To fix, execute: pipx relocate-all"
         )
     if all_venv_problems.missing_metadata:
         print(
@@ -5,17 +5,104 @@ from typing import List, Sequence
 from packaging.utils import canonicalize_name
 
 import pipx.shared_libs  # import instead of from so mockable in tests
+from pipx.commands.common import (
+    get_app_links,
+    get_package_summary,
+    get_staged_venv_dir,
+    swap_in_staged_venv,
+)
 from pipx.commands.inject import inject_dep
 from pipx.commands.install import install
 from pipx.commands.uninstall import uninstall
 from pipx.constants import EXIT_CODE_OK, EXIT_CODE_REINSTALL_VENV_NONEXISTENT, ExitCode
-from pipx.emojies import sleep
-from pipx.util import PipxError
+from pipx.emojies import sleep, stars
+from pipx.util import PipxError, rmdir
 from pipx.venv import Venv, VenvContainer
 
 
+def _reinstall_staged(
+    venv: Venv, package_or_url: str, local_bin_dir: Path, python: str, verbose: bool
+) -> None:
+    """Build a fresh copy of venv next to it, then swap it in, so that its apps
+    are never missing from the PATH and a failed build leaves venv untouched.
+    """
+    # in case legacy original dir name
+    venv_dir = venv.root.with_name(canonicalize_name(venv.root.name))
+    main_package = venv.pipx_metadata.main_package
+
+    staged_dir = get_staged_venv_dir(venv_dir)
+    rmdir(staged_dir)
+    staged_venv = Venv(staged_dir, python=python, verbose=verbose)
+    try:
+        staged_venv.create_venv(venv.pipx_metadata.venv_args, main_package.pip_args)
+        staged_venv.install_package(
+            package=venv.main_package_name,
+            package_or_url=package_or_url,
+            pip_args=main_package.pip_args,
+            include_dependencies=main_package.include_dependencies,
+            include_apps=True,
+            is_main_package=True,
+            suffix=main_package.suffix,
+        )
+        for (
+            injected_name,
+            injected_package,
+        ) in venv.pipx_metadata.injected_packages.items():
+            if injected_package.package_or_url is None:
+                raise PipxError(
+                    f"Internal Error injecting package {injected_package} into {venv.name}"
+                )
+            staged_venv.install_package(
+                package=injected_name,
+                package_or_url=injected_package.package_or_url,
+                pip_args=injected_package.pip_args,
+                include_dependencies=injected_package.include_dependencies,
+                include_apps=injected_package.include_apps,
+                is_main_package=False,
+            )
+
+        staged_main_package = staged_venv.pipx_metadata.main_package
+        if not staged_main_package.apps and not (
+            main_package.include_dependencies
+            and staged_main_package.apps_of_dependencies
+        ):
+            raise PipxError(
+                f"""
+                No apps associated with package {venv.name} after rebuilding
+                it. Not replacing existing installation in {str(venv.root)!r}.
+                """
+            )
+
+        swap_in_staged_venv(
+            staged_venv,
+            venv_dir,
+            local_bin_dir,
+            old_app_links=get_app_links(venv),
+            force=True,
+        )
+    except (Exception, KeyboardInterrupt):
+        print()
+        rmdir(staged_dir)
+        raise
+
+    if venv.root != venv_dir:
+        # legacy dir name was left in place by the swap
+        rmdir(venv.root)
+
+    package_summary, _ = get_package_summary(
+        venv_dir, package=venv.main_package_name, new_install=True
+    )
+    print(package_summary)
+    print(f"done! {stars}", file=sys.stderr)
+
+
 def reinstall(
-    *, venv_dir: Path, local_bin_dir: Path, python: str, verbose: bool
+    *,
+    venv_dir: Path,
+    local_bin_dir: Path,
+    python: str,
+    verbose: bool,
+    staged: bool = False,
 ) -> ExitCode:
     """Returns pipx exit code."""
     if not venv_dir.exists():
@@ -29,6 +116,10 @@ def reinstall(
     else:
         package_or_url = venv.main_package_name
 
+    if staged:
+        _reinstall_staged(venv, package_or_url, local_bin_dir, python, verbose)
+        return EXIT_CODE_OK
+
     uninstall(venv_dir, local_bin_dir, verbose)
 
     # in case legacy original dir name
@@ -82,9 +173,11 @@ def reinstall_all(
     verbose: bool,
     *,
     skip: Sequence[str],
+    staged: bool = False,
 ) -> ExitCode:
     """Returns pipx exit code."""
-    pipx.shared_libs.shared_libs.upgrade(verbose=verbose)
+    for shared_libs in pipx.shared_libs.iter_shared_libs():
+        shared_libs.upgrade(verbose=verbose, from_index=True)
 
     failed: List[str] = []
     for venv_dir in venv_container.iter_venv_dirs():
@@ -96,6 +189,7 @@ def reinstall_all(
                 local_bin_dir=local_bin_dir,
                 python=python,
                 verbose=verbose,
+                staged=staged,
             )
         except PipxError as e:
             print(e, file=sys.stderr)
@@ -0,0 +1,108 @@
+import logging
+import sys
+from pathlib import Path
+from typing import List, Sequence
+
+from pipx.animate import animate
+from pipx.colors import bold
+from pipx.commands.common import expose_venv_apps
+from pipx.commands.reinstall import reinstall
+from pipx.constants import EXIT_CODE_OK, EXIT_CODE_RELOCATE_VENV_NONEXISTENT, ExitCode
+from pipx.emojies import sleep, stars
+from pipx.util import PipxError, parse_major_minor, pipx_wrap
+from pipx.venv import Venv, VenvContainer
+from pipx.venv_relocate import (
+    get_python_version,
+    get_venv_python_version,
+    relocate_venv_in_place,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def relocate(
+    *, venv_dir: Path, local_bin_dir: Path, python: str, verbose: bool
+) -> ExitCode:
+    """Point an existing venv at its current location and at python, without
+    reinstalling its packages when possible.
+
+    Returns pipx exit code.
+    """
+    if not venv_dir.exists():
+        print(f"Nothing to relocate for {venv_dir.name} {sleep}")
+        return EXIT_CODE_RELOCATE_VENV_NONEXISTENT
+
+    venv = Venv(venv_dir, python=python, verbose=verbose)
+
+    if not venv.package_metadata:
+        raise PipxError(
+            f"""
+            Cannot relocate {venv.name!r}. It has missing internal pipx
+            metadata. It was likely installed using a pipx version before
+            0.15.0.0. Please uninstall and install this package to fix.
+            """
+        )
+
+    old_version = get_venv_python_version(venv_dir, venv.pipx_metadata)
+    new_version = get_python_version(python)
+    if parse_major_minor(old_version) != parse_major_minor(new_version):
+        # site-packages location and compiled extensions are both tied to
+        #   the interpreter's major.minor version, so the venv must be rebuilt
+        print(
+            pipx_wrap(
+                f"""
+                {venv.name} was built with Python {old_version or 'unknown'},
+                not compatible with Python {new_version}. Reinstalling.
+                """
+            )
+        )
+        return reinstall(
+            venv_dir=venv_dir,
+            local_bin_dir=local_bin_dir,
+            python=python,
+            verbose=verbose,
+        )
+
+    with animate(f"relocating {venv.name}", venv.do_animation):
+        relocate_venv_in_place(venv, python)
+
+    expose_venv_apps(venv, local_bin_dir, force=False)
+
+    print(
+        f"relocated {bold(venv.name)} to {venv.pipx_metadata.python_version} "
+        f"at {str(venv_dir)} {stars}"
+    )
+    return EXIT_CODE_OK
+
+
+def relocate_all(
+    venv_container: VenvContainer,
+    local_bin_dir: Path,
+    python: str,
+    verbose: bool,
+    *,
+    skip: Sequence[str],
+) -> ExitCode:
+    """Returns pipx exit code."""
+    failed: List[str] = []
+    for venv_dir in venv_container.iter_venv_dirs():
+        if venv_dir.name in skip:
+            continue
+        try:
+            package_exit = relocate(
+                venv_dir=venv_dir,
+                local_bin_dir=local_bin_dir,
+                python=python,
+                verbose=verbose,
+            )
+        except PipxError as e:
+            print(e, file=sys.stderr)
+            failed.append(venv_dir.name)
+        else:
+            if package_exit != 0:
+                failed.append(venv_dir.name)
+    if len(failed) > 0:
+        raise PipxError(
+            f"The following package(s) failed to relocate: {', '.join(failed)}"
+        )
+    return EXIT_CODE_OK
@@ -3,12 +3,11 @@ import hashlib
 import logging
 import time
 import urllib.parse
-import urllib.request
 from pathlib import Path
 from shutil import which
 from typing import List, NoReturn
 
-from pipx import constants
+from pipx import artifact_cache, constants, metrics
 from pipx.commands.common import package_name_from_spec
 from pipx.constants import TEMP_VENV_EXPIRATION_THRESHOLD_DAYS, WINDOWS
 from pipx.emojies import hazard
@@ -96,9 +95,11 @@ def run(
 
     if bin_path.exists():
         logger.info(f"Reusing cached venv {venv_dir}")
+        metrics.count("pipx_run_cache_hits_total")
         venv.run_app(app, app_filename, app_args)
     else:
         logger.info(f"venv location is {venv_dir}")
+        metrics.count("pipx_run_cache_misses_total")
         _download_and_run(
             Path(venv_dir),
             package_or_url,
@@ -126,23 +127,32 @@ def _download_and_run(
     verbose: bool,
 ) -> NoReturn:
     venv = Venv(venv_dir, python=python, verbose=verbose)
-    venv.create_venv(venv_args, pip_args)
+    cache_key = None
+    if not venv_dir.exists():
+        cache_key = artifact_cache.get_cache_key(
+            package_or_url, python, pip_args, venv_args, include_dependencies=False,
+        )
 
-    if venv.pipx_metadata.main_package.package is not None:
-        package = venv.pipx_metadata.main_package.package
+    if cache_key is not None and artifact_cache.fetch_venv(cache_key, venv, python):
+        cache_key = None
     else:
-        package = package_name_from_spec(
-            package_or_url, python, pip_args=pip_args, verbose=verbose
-        )
+        venv.create_venv(venv_args, pip_args)
 
-    venv.install_package(
-        package=package,
-        package_or_url=package_or_url,
-        pip_args=pip_args,
-        include_dependencies=False,
-        include_apps=True,
-        is_main_package=True,
-    )
+        if venv.pipx_metadata.main_package.package is not None:
+            package = venv.pipx_metadata.main_package.package
+        else:
+            package = package_name_from_spec(
+                package_or_url, python, pip_args=pip_args, verbose=verbose
+            )
+
+        venv.install_package(
+            package=package,
+            package_or_url=package_or_url,
+            pip_args=pip_args,
+            include_dependencies=False,
+            include_apps=True,
+            is_main_package=True,
+        )
 
     if not (venv.bin_path / app_filename).exists():
         apps = venv.pipx_metadata.main_package.apps
@@ -153,6 +163,9 @@ def _download_and_run(
             """
         )
 
+    if cache_key is not None:
+        artifact_cache.store_venv(cache_key, venv)
+
     if not use_cache:
         # Let future _remove_all_expired_venvs know to remove this
         (venv_dir / VENV_EXPIRED_FILENAME).touch()
@@ -201,6 +214,8 @@ def _remove_all_expired_venvs() -> None:
 
 
 def _http_get_request(url: str) -> str:
+    import urllib.request
+
     try:
         res = urllib.request.urlopen(url)
         charset = res.headers.get_content_charset() or "utf-8"  # type: ignore
@@ -0,0 +1,388 @@
+import json
+import logging
+import shlex
+import shutil
+import sys
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from pipx.colors import bold
+from pipx.commands.common import (
+    package_name_from_spec,
+    prepare_shared_libs,
+    run_concurrently,
+)
+from pipx.commands.inject import inject
+from pipx.commands.install import install
+from pipx.commands.uninstall import uninstall
+from pipx.commands.upgrade import upgrade
+from pipx.constants import EXIT_CODE_OK, ExitCode
+from pipx.emojies import sleep, stars
+from pipx.interpreter import DEFAULT_PYTHON
+from pipx.package_specifier import parse_specifier_for_metadata
+from pipx.pipx_metadata_file import PipxMetadata
+from pipx.util import PipxError, get_venv_paths
+from pipx.venv import VenvContainer
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_PACKAGE_KEYS = {
+    "spec",
+    "package",
+    "suffix",
+    "python",
+    "pip_args",
+    "include_deps",
+    "inject",
+}
+
+
+class ManifestEntry(NamedTuple):
+    spec: str
+    package: Optional[str]
+    suffix: str
+    python: Optional[str]
+    pip_args: List[str]
+    include_dependencies: bool
+    inject: List[str]
+
+
+class SyncAction(NamedTuple):
+    # "install", "reinstall", "inject", "upgrade" or "uninstall"
+    action: str
+    venv_dir: Path
+    entry: Optional[ManifestEntry]
+    package: Optional[str]
+    reason: str = ""
+    # packages to inject for "inject"
+    inject: List[str] = []
+
+
+def _load_toml(manifest_path: Path) -> Dict[str, Any]:
+    if sys.version_info >= (3, 11):
+        import tomllib
+    else:
+        try:
+            import tomli as tomllib
+        except ImportError:
+            raise PipxError(
+                f"""
+                Reading {manifest_path} requires the tomli package on Python
+                versions before 3.11. Install tomli alongside pipx, or write
+                the manifest as JSON instead.
+                """
+            )
+    with manifest_path.open("rb") as manifest_fh:
+        try:
+            return tomllib.load(manifest_fh)
+        except tomllib.TOMLDecodeError as e:
+            raise PipxError(f"Invalid manifest {manifest_path}: {e}")
+
+
+def _get_str_list(
+    package_data: Dict[str, Any], key: str, manifest_path: Path
+) -> List[str]:
+    value = package_data.get(key, [])
+    if key == "pip_args" and isinstance(value, str):
+        # like --pip-args on the command line
+        value = shlex.split(value)
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise PipxError(f"{manifest_path}: {key!r} must be a list of strings")
+    return value
+
+
+def load_manifest(manifest_path: Path) -> List[ManifestEntry]:
+    """Packages listed in a TOML (or, if the file name ends with .json, JSON)
+    manifest, one `[[package]]` table (or object in the "package" list) per
+    venv:
+
+        [[package]]
+        spec = "black==22.3.0"
+        inject = ["black-macchiato"]
+    """
+    try:
+        if manifest_path.suffix == ".json":
+            with manifest_path.open("r", encoding="utf-8") as manifest_fh:
+                try:
+                    manifest = json.load(manifest_fh)
+                except ValueError as e:
+                    raise PipxError(f"Invalid manifest {manifest_path}: {e}")
+        else:
+            manifest = _load_toml(manifest_path)
+    except OSError as e:
+        raise PipxError(f"Unable to read manifest {manifest_path}: {e}")
+
+    packages = manifest.get("package", []) if isinstance(manifest, dict) else None
+    if not isinstance(packages, list):
+        raise PipxError(f"{manifest_path}: 'package' must be a list of tables")
+
+    entries = []
+    for package_data in packages:
+        if not isinstance(package_data, dict) or not isinstance(
+            package_data.get("spec"), str
+        ):
+            raise PipxError(f"{manifest_path}: every package needs a 'spec'")
+        unknown_keys = set(package_data) - MANIFEST_PACKAGE_KEYS
+        if unknown_keys:
+            raise PipxError(
+                f"{manifest_path}: unknown keys {', '.join(sorted(unknown_keys))} "
+                f"for package {package_data['spec']!r}"
+            )
+        entries.append(
+            ManifestEntry(
+                spec=package_data["spec"],
+                package=package_data.get("package"),
+                suffix=package_data.get("suffix", ""),
+                python=package_data.get("python"),
+                pip_args=_get_str_list(package_data, "pip_args", manifest_path),
+                include_dependencies=bool(package_data.get("include_deps", False)),
+                inject=_get_str_list(package_data, "inject", manifest_path),
+            )
+        )
+    return entries
+
+
+def _get_reinstall_reason(
+    entry: ManifestEntry, venv_dir: Path, pipx_metadata: Optional[PipxMetadata]
+) -> str:
+    """Why the venv at venv_dir must be rebuilt to match entry, or "" if it
+    does not
+    """
+    if pipx_metadata is None or pipx_metadata.main_package.package is None:
+        return "missing or unreadable pipx metadata"
+    main_package = pipx_metadata.main_package
+    if main_package.package_or_url != parse_specifier_for_metadata(entry.spec):
+        return f"spec changed from {main_package.package_or_url!r}"
+    if main_package.pip_args != entry.pip_args:
+        return "pip args changed"
+    if main_package.include_dependencies != entry.include_dependencies:
+        return "include_deps changed"
+
+    _, python_path = get_venv_paths(venv_dir)
+    if not python_path.resolve().is_file():
+        return "missing python interpreter"
+    if entry.python is not None:
+        wanted_python = shutil.which(entry.python)
+        if wanted_python is None:
+            raise PipxError(f"Python interpreter {entry.python!r} not found")
+        if Path(wanted_python).resolve() != python_path.resolve():
+            return f"python changed to {entry.python}"
+
+    wanted_injected = {parse_specifier_for_metadata(spec) for spec in entry.inject}
+    extra_injected = sorted(
+        name
+        for (name, package_info) in pipx_metadata.injected_packages.items()
+        if package_info.package_or_url not in wanted_injected
+    )
+    if extra_injected:
+        return f"{', '.join(extra_injected)} injected but not in manifest"
+    return ""
+
+
+def plan_sync(
+    entries: List[ManifestEntry],
+    venv_container: VenvContainer,
+    *,
+    prune: bool,
+    upgrade: bool,
+    verbose: bool,
+) -> List[SyncAction]:
+    """The actions that make the venvs in venv_container match entries.
+    Only reads pipx metadata, except to find the package name of a spec that
+    is not installed and is not a plain PyPI requirement.
+    """
+    installed: Dict[Path, Optional[PipxMetadata]] = {}
+    venvs_by_spec: Dict[Any, Path] = {}
+    for venv_dir in sorted(venv_container.iter_venv_dirs()):
+        try:
+            pipx_metadata: Optional[PipxMetadata] = PipxMetadata(venv_dir)
+        except PipxError:
+            pipx_metadata = None
+        installed[venv_dir] = pipx_metadata
+        if pipx_metadata is not None:
+            main_package = pipx_metadata.main_package
+            venvs_by_spec[(main_package.package_or_url, main_package.suffix)] = venv_dir
+
+    actions = []
+    wanted_venv_dirs = set()
+    for entry in entries:
+        venv_dir = venvs_by_spec.get(
+            (parse_specifier_for_metadata(entry.spec), entry.suffix)
+        )
+        package = entry.package
+        if venv_dir is not None:
+            package = installed[venv_dir].main_package.package  # type: ignore
+        else:
+            if package is None:
+                package = package_name_from_spec(
+                    entry.spec,
+                    entry.python or DEFAULT_PYTHON,
+                    pip_args=entry.pip_args,
+                    verbose=verbose,
+                )
+            venv_dir = venv_container.get_venv_dir(f"{package}{entry.suffix}")
+        if venv_dir in wanted_venv_dirs:
+            raise PipxError(
+                f"Manifest lists more than one package for venv {venv_dir.name!r}"
+            )
+        wanted_venv_dirs.add(venv_dir)
+
+        if venv_dir not in installed:
+            actions.append(SyncAction("install", venv_dir, entry, package))
+            continue
+        reason = _get_reinstall_reason(entry, venv_dir, installed[venv_dir])
+        if reason:
+            actions.append(SyncAction("reinstall", venv_dir, entry, package, reason))
+            continue
+        injected_specs = {
+            package_info.package_or_url
+            for package_info in installed[venv_dir].injected_packages.values()  # type: ignore
+        }
+        missing_injected = [
+            spec
+            for spec in entry.inject
+            if parse_specifier_for_metadata(spec) not in injected_specs
+        ]
+        if missing_injected:
+            actions.append(
+                SyncAction("inject", venv_dir, entry, package, inject=missing_injected)
+            )
+        if upgrade:
+            actions.append(SyncAction("upgrade", venv_dir, entry, package))
+
+    if prune:
+        for venv_dir in installed:
+            if venv_dir not in wanted_venv_dirs:
+                actions.append(SyncAction("uninstall", venv_dir, None, None))
+    return actions
+
+
+def _describe_action(sync_action: SyncAction) -> str:
+    description = f"{sync_action.action} {bold(sync_action.venv_dir.name)}"
+    if sync_action.action == "inject":
+        description += f": {', '.join(sync_action.inject)}"
+    elif sync_action.reason:
+        description += f" ({sync_action.reason})"
+    return description
+
+
+def _run_venv_actions(
+    venv_actions: List[SyncAction], local_bin_dir: Path, verbose: bool
+) -> ExitCode:
+    """Run the actions for one venv, in order"""
+    for sync_action in venv_actions:
+        entry = sync_action.entry
+        exit_code = EXIT_CODE_OK
+        if sync_action.action == "uninstall":
+            exit_code = uninstall(sync_action.venv_dir, local_bin_dir, verbose)
+        elif sync_action.action == "upgrade":
+            assert entry is not None
+            exit_code = upgrade(
+                sync_action.venv_dir,
+                entry.pip_args,
+                verbose,
+                include_injected=True,
+                force=False,
+            )
+        elif sync_action.action == "inject":
+            assert entry is not None
+            exit_code = inject(
+                sync_action.venv_dir,
+                None,
+                sync_action.inject,
+                entry.pip_args,
+                verbose=verbose,
+                include_apps=False,
+                include_dependencies=False,
+                force=False,
+            )
+        else:
+            assert entry is not None
+            if sync_action.action == "reinstall":
+                exit_code = uninstall(sync_action.venv_dir, local_bin_dir, verbose)
+            if not exit_code:
+                exit_code = install(
+                    sync_action.venv_dir,
+                    sync_action.package,
+                    entry.spec,
+                    local_bin_dir,
+                    entry.python or DEFAULT_PYTHON,
+                    entry.pip_args,
+                    [],
+                    verbose,
+                    force=False,
+                    include_dependencies=entry.include_dependencies,
+                    suffix=entry.suffix,
+                )
+            if not exit_code and entry.inject:
+                exit_code = inject(
+                    sync_action.venv_dir,
+                    None,
+                    entry.inject,
+                    entry.pip_args,
+                    verbose=verbose,
+                    include_apps=False,
+                    include_dependencies=False,
+                    force=False,
+                )
+        if exit_code:
+            return exit_code
+    return EXIT_CODE_OK
+
+
+def sync(
+    manifest_path: Path,
+    venv_container: VenvContainer,
+    local_bin_dir: Path,
+    verbose: bool,
+    *,
+    prune: bool,
+    upgrade: bool,
+    dry_run: bool,
+    jobs: Optional[int],
+) -> ExitCode:
+    """Install, inject, upgrade and (with prune) uninstall whatever is needed
+    to make the installed venvs match the manifest.  Returns pipx exit code.
+    """
+    entries = load_manifest(manifest_path)
+    actions = plan_sync(
+        entries, venv_container, prune=prune, upgrade=upgrade, verbose=verbose
+    )
+    if not actions:
+        print(f"All {len(entries)} packages in {manifest_path} are in sync {sleep}")
+        return EXIT_CODE_OK
+
+    for sync_action in actions:
+        print(f"  {_describe_action(sync_action)}")
+    if dry_run:
+        return EXIT_CODE_OK
+
+    actions_by_venv: Dict[Path, List[SyncAction]] = {}
+    for sync_action in actions:
+        actions_by_venv.setdefault(sync_action.venv_dir, []).append(sync_action)
+
+    if any(a.action != "uninstall" for a in actions):
+        prepare_shared_libs(verbose)
+
+    exit_codes = run_concurrently(
+        [
+            (
+                venv_dir.name,
+                partial(_run_venv_actions, venv_actions, local_bin_dir, verbose),
+            )
+            for (venv_dir, venv_actions) in actions_by_venv.items()
+        ],
+        jobs,
+    )
+
+    failed = [
+        venv_dir.name
+        for (venv_dir, exit_code) in zip(actions_by_venv, exit_codes)
+        if exit_code
+    ]
+    if failed:
+        print(f"Failed to sync {', '.join(failed)}", file=sys.stderr)
+        return ExitCode(1)
+    print(f"synced {len(actions_by_venv)} venvs! {stars}", file=sys.stderr)
+    return EXIT_CODE_OK
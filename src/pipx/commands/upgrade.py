@@ -1,14 +1,22 @@
 import logging
+import shutil
 from pathlib import Path
 from typing import List, Sequence
 
+import pipx.shared_libs  # import instead of from so mockable in tests
 from pipx import constants
+from pipx.animate import animate
 from pipx.colors import bold, red
-from pipx.commands.common import expose_apps_globally
+from pipx.commands.common import (
+    expose_apps_globally,
+    get_app_links,
+    get_staged_venv_dir,
+    swap_in_staged_venv,
+)
 from pipx.constants import EXIT_CODE_OK, ExitCode
-from pipx.emojies import sleep
+from pipx.emojies import sleep, stars
 from pipx.package_specifier import parse_specifier_for_upgrade
-from pipx.util import PipxError, pipx_wrap
+from pipx.util import PipxError, pipx_wrap, rmdir
 from pipx.venv import Venv, VenvContainer
 
 logger = logging.getLogger(__name__)
@@ -21,8 +29,13 @@ def _upgrade_package(
     is_main_package: bool,
     force: bool,
     upgrading_all: bool,
+    venv_dir: Path,
+    staged: bool = False,
 ) -> int:
-    """Returns 1 if package version changed, 0 if same version"""
+    """Returns 1 if package version changed, 0 if same version
+
+    If staged, venv is a staged copy of venv_dir and apps are not exposed.
+    """
     package_metadata = venv.package_metadata[package]
 
     if package_metadata.package_or_url is None:
@@ -46,7 +59,7 @@ def _upgrade_package(
     display_name = f"{package_metadata.package}{package_metadata.suffix}"
     new_version = package_metadata.package_version
 
-    if package_metadata.include_apps:
+    if package_metadata.include_apps and not staged:
         expose_apps_globally(
             constants.LOCAL_BIN_DIR,
             package_metadata.app_paths,
@@ -54,7 +67,7 @@ def _upgrade_package(
             suffix=package_metadata.suffix,
         )
 
-    if package_metadata.include_dependencies:
+    if package_metadata.include_dependencies and not staged:
         for _, app_paths in package_metadata.app_paths_of_dependencies.items():
             expose_apps_globally(
                 constants.LOCAL_BIN_DIR,
@@ -71,7 +84,7 @@ def _upgrade_package(
                 pipx_wrap(
                     f"""
                     {display_name} is already at latest version {old_version}
-                    (location: {str(venv.root)})
+                    (location: {str(venv_dir)})
                     """
                 )
             )
@@ -81,7 +94,7 @@ def _upgrade_package(
             pipx_wrap(
                 f"""
                 upgraded package {display_name} from {old_version} to
-                {new_version} (location: {str(venv.root)})
+                {new_version} (location: {str(venv_dir)})
                 """
             )
         )
@@ -96,8 +109,13 @@ def _upgrade_venv(
     include_injected: bool,
     upgrading_all: bool,
     force: bool,
+    staged: bool = False,
 ) -> int:
-    """Returns number of packages with changed versions."""
+    """Returns number of packages with changed versions.
+
+    If staged, the upgrade is done in a copy of the venv, which then replaces
+    the original only once all packages upgraded successfully.
+    """
     if not venv_dir.is_dir():
         raise PipxError(
             f"""
@@ -116,33 +134,60 @@ def _upgrade_venv(
             wrap_message=False,
         )
 
-    # Upgrade shared libraries (pip, setuptools and wheel)
-    venv.upgrade_packaging_libraries(pip_args)
+    if staged:
+        staged_dir = get_staged_venv_dir(venv_dir)
+        rmdir(staged_dir)
+        with animate(f"staging a copy of {venv.name}", venv.do_animation):
+            shutil.copytree(str(venv_dir), str(staged_dir), symlinks=True)
+        upgrade_venv = Venv(staged_dir, verbose=verbose)
+    else:
+        upgrade_venv = venv
 
-    versions_updated = 0
+    try:
+        # Upgrade shared libraries (pip, setuptools and wheel)
+        upgrade_venv.upgrade_packaging_libraries(pip_args)
 
-    package = venv.main_package_name
-    versions_updated += _upgrade_package(
-        venv,
-        package,
-        pip_args,
-        is_main_package=True,
-        force=force,
-        upgrading_all=upgrading_all,
-    )
+        versions_updated = 0
 
-    if include_injected:
-        for package in venv.package_metadata:
-            if package == venv.main_package_name:
-                continue
-            versions_updated += _upgrade_package(
-                venv,
-                package,
-                pip_args,
-                is_main_package=False,
+        package = upgrade_venv.main_package_name
+        versions_updated += _upgrade_package(
+            upgrade_venv,
+            package,
+            pip_args,
+            is_main_package=True,
+            force=force,
+            upgrading_all=upgrading_all,
+            venv_dir=venv_dir,
+            staged=staged,
+        )
+
+        if include_injected:
+            for package in upgrade_venv.package_metadata:
+                if package == upgrade_venv.main_package_name:
+                    continue
+                versions_updated += _upgrade_package(
+                    upgrade_venv,
+                    package,
+                    pip_args,
+                    is_main_package=False,
+                    force=force,
+                    upgrading_all=upgrading_all,
+                    venv_dir=venv_dir,
+                    staged=staged,
+                )
+
+        if staged:
+            swap_in_staged_venv(
+                upgrade_venv,
+                venv_dir,
+                constants.LOCAL_BIN_DIR,
+                old_app_links=get_app_links(venv),
                 force=force,
-                upgrading_all=upgrading_all,
             )
+    except (Exception, KeyboardInterrupt):
+        if staged:
+            rmdir(upgrade_venv.root)
+        raise
 
     return versions_updated
 
@@ -154,6 +199,7 @@ def upgrade(
     *,
     include_injected: bool,
     force: bool,
+    staged: bool = False,
 ) -> ExitCode:
     """Returns pipx exit code."""
 
@@ -164,6 +210,7 @@ def upgrade(
         include_injected=include_injected,
         upgrading_all=False,
         force=force,
+        staged=staged,
     )
 
     # Any error in upgrade will raise PipxError (e.g. from venv.upgrade_package())
@@ -177,6 +224,7 @@ def upgrade_all(
     include_injected: bool,
     skip: Sequence[str],
     force: bool,
+    staged: bool = False,
 ) -> ExitCode:
     """Returns pipx exit code."""
     venv_error = False
@@ -196,6 +244,7 @@ def upgrade_all(
                 include_injected=include_injected,
                 upgrading_all=True,
                 force=force,
+                staged=staged,
             )
 
         except PipxError as e:
@@ -215,3 +264,19 @@ def upgrade_all(
         )
 
     return EXIT_CODE_OK
+
+
+def upgrade_shared(pip_args: List[str], verbose: bool) -> ExitCode:
+    """Upgrade the shared libraries of each Python version from the package
+    index.  Returns pipx exit code.
+    """
+    pipx.shared_libs.shared_libs.create(verbose)
+    for shared_libs in pipx.shared_libs.iter_shared_libs():
+        shared_libs.upgrade(pip_args=pip_args, verbose=verbose, from_index=True)
+        if not shared_libs.has_been_updated_this_run:
+            raise PipxError(
+                f"Failed to upgrade shared libraries in {shared_libs.root}. "
+                "See the log file for details."
+            )
+        print(f"upgraded shared libraries in {shared_libs.root} {stars}")
+    return EXIT_CODE_OK
@@ -0,0 +1,124 @@
+import logging
+import tempfile
+from functools import partial
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import pipx.shared_libs  # import instead of from so mockable in tests
+from pipx import constants, wheelhouse
+from pipx.commands.common import prepare_shared_libs, run_concurrently
+from pipx.constants import EXIT_CODE_OK, ExitCode
+from pipx.emojies import sleep, stars
+from pipx.util import PipxError, mkdir, rmdir, run_subprocess, subprocess_post_check
+from pipx.venv import Venv, VenvContainer
+
+logger = logging.getLogger(__name__)
+
+
+def _get_venv_specs(venv: Venv) -> Tuple[List[str], List[str]]:
+    """(specs, pip args) of the main and injected packages of venv, as
+    recorded in its pipx metadata
+    """
+    package_infos = [venv.pipx_metadata.main_package] + list(
+        venv.pipx_metadata.injected_packages.values()
+    )
+    specs = [
+        package_info.package_or_url
+        for package_info in package_infos
+        if package_info.package_or_url is not None
+        and "--editable" not in package_info.pip_args
+    ]
+    pip_args = [
+        arg
+        for arg in venv.pipx_metadata.main_package.pip_args
+        if arg not in ("--editable", "--force-reinstall")
+    ]
+    return (specs, pip_args)
+
+
+def _fill_from_venv(venv: Venv, specs: List[str], pip_args: List[str]) -> ExitCode:
+    with tempfile.TemporaryDirectory(
+        prefix=".build-", dir=str(constants.PIPX_WHEELHOUSE_DIR)
+    ) as wheel_dir:
+        venv.build_wheels(specs, Path(wheel_dir), pip_args)
+        added = wheelhouse.add_wheels(Path(wheel_dir))
+    logger.info(f"Added to wheelhouse from {venv.name}: {', '.join(added)}")
+    return EXIT_CODE_OK
+
+
+def _fill_shared_libs(verbose: bool) -> ExitCode:
+    """Wheels of the shared libraries, so they can be created offline too"""
+    with tempfile.TemporaryDirectory(
+        prefix=".build-", dir=str(constants.PIPX_WHEELHOUSE_DIR)
+    ) as wheel_dir:
+        cmd = [
+            str(pipx.shared_libs.shared_libs.python_path),
+            "-m",
+            "pip",
+            "--disable-pip-version-check",
+            "download",
+            "--only-binary=:all:",
+            "--dest",
+            wheel_dir,
+            *wheelhouse.get_pip_args(),
+            "pip",
+            "setuptools",
+            "wheel",
+        ]
+        if not verbose:
+            cmd.append("-q")
+        subprocess_post_check(run_subprocess(cmd))
+        wheelhouse.add_wheels(Path(wheel_dir))
+    return EXIT_CODE_OK
+
+
+def wheelhouse_fill(
+    venv_container: VenvContainer,
+    packages: Sequence[str],
+    verbose: bool,
+    *,
+    jobs: Optional[int] = None,
+) -> ExitCode:
+    """Build wheels of the packages recorded in the venvs named packages (or
+    in all venvs) into the wheelhouse.  Returns pipx exit code.
+    """
+    venv_dirs = (
+        [venv_container.get_venv_dir(package) for package in packages]
+        if packages
+        else sorted(venv_container.iter_venv_dirs())
+    )
+    tasks = []
+    for venv_dir in venv_dirs:
+        if not venv_dir.is_dir():
+            raise PipxError(f"Nothing to build for {venv_dir.name!r}, not installed")
+        venv = Venv(venv_dir, verbose=verbose, read_only=True)
+        (specs, pip_args) = _get_venv_specs(venv)
+        if specs:
+            tasks.append((venv.name, partial(_fill_from_venv, venv, specs, pip_args)))
+
+    mkdir(constants.PIPX_WHEELHOUSE_DIR)
+    wheels_before = set(wheelhouse.read_index())
+    prepare_shared_libs(verbose)
+    tasks.append(("shared libraries", partial(_fill_shared_libs, verbose)))
+    exit_codes = run_concurrently(tasks, jobs)
+
+    n_added = len(set(wheelhouse.read_index()) - wheels_before)
+    if n_added:
+        print(f"Added {n_added} wheels to {constants.PIPX_WHEELHOUSE_DIR} {stars}")
+    else:
+        print(f"No new wheels for {constants.PIPX_WHEELHOUSE_DIR} {sleep}")
+    if any(exit_codes):
+        raise PipxError(
+            "\nSome wheels could not be built.\n"
+            "    See specific error messages above.",
+            wrap_message=False,
+        )
+    return EXIT_CODE_OK
+
+
+def wheelhouse_clear() -> ExitCode:
+    """Delete all wheels in the wheelhouse.  Returns pipx exit code."""
+    if constants.PIPX_WHEELHOUSE_DIR.exists():
+        rmdir(constants.PIPX_WHEELHOUSE_DIR)
+    print(f"Removed {constants.PIPX_WHEELHOUSE_DIR}")
+    return EXIT_CODE_OK
@@ -0,0 +1,111 @@
+"""Cache of installed venv names and their apps for shell completion.
+
+Shell completion runs pipx on every TAB press, so it reads this one small
+file instead of listing the venvs directory or reading venv metadata.  The
+index is rebuilt after every command that can add, remove or change venvs.
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+from pipx import constants
+from pipx.pipx_metadata_file import PIPX_INFO_FILENAME, PipxMetadata
+
+logger = logging.getLogger(__name__)
+
+COMPLETION_INDEX_VERSION = 1
+
+# commands after which the completion index is rebuilt
+VENV_MODIFYING_COMMANDS = {
+    "install",
+    "inject",
+    "upgrade",
+    "upgrade-all",
+    "uninstall",
+    "uninstall-all",
+    "reinstall",
+    "reinstall-all",
+    "relocate",
+    "relocate-all",
+    "sync",
+    "import",
+}
+
+
+def _read_index(index_path: Path) -> Dict[str, Any]:
+    try:
+        with index_path.open("r", encoding="utf-8") as index_fh:
+            index = json.load(index_fh)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(index, dict) or index.get("version") != COMPLETION_INDEX_VERSION:
+        return {}
+    return index
+
+
+def _get_venv_apps(venv_dir: Path) -> List[str]:
+    pipx_metadata = PipxMetadata(venv_dir)
+    package_infos = [pipx_metadata.main_package] + list(
+        pipx_metadata.injected_packages.values()
+    )
+    apps: List[str] = []
+    for package_info in package_infos:
+        if package_info.include_apps:
+            apps.extend(package_info.apps)
+        if package_info.include_dependencies:
+            apps.extend(package_info.apps_of_dependencies)
+    return sorted(set(apps))
+
+
+def update_completion_index(venvs_root: Path) -> None:
+    """Rebuild the completion index from the venvs in venvs_root.  Metadata
+    is only re-read for venvs whose metadata changed since the last update.
+    """
+    index_path = constants.PIPX_COMPLETION_INDEX
+    old_venvs = _read_index(index_path).get("venvs", {})
+    venvs: Dict[str, Dict[str, Any]] = {}
+    try:
+        venv_dirs = sorted(p for p in venvs_root.iterdir() if p.is_dir())
+    except FileNotFoundError:
+        venv_dirs = []
+    for venv_dir in venv_dirs:
+        try:
+            mtime = (venv_dir / PIPX_INFO_FILENAME).stat().st_mtime
+        except FileNotFoundError:
+            mtime = None
+        old_entry = old_venvs.get(venv_dir.name)
+        if old_entry is not None and old_entry.get("mtime") == mtime:
+            venvs[venv_dir.name] = old_entry
+            continue
+        try:
+            apps = _get_venv_apps(venv_dir) if mtime is not None else []
+        except Exception:
+            logger.info(f"Could not read apps of {venv_dir} for completion index")
+            apps = []
+        venvs[venv_dir.name] = {"apps": apps, "mtime": mtime}
+
+    index = {"version": COMPLETION_INDEX_VERSION, "venvs": venvs}
+    tmp_index_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+    try:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        with tmp_index_path.open("w", encoding="utf-8") as index_fh:
+            json.dump(index, index_fh, sort_keys=True)
+        os.replace(str(tmp_index_path), str(index_path))
+    except OSError:
+        logger.info(f"Unable to write completion index {index_path}", exc_info=True)
+
+
+def get_completion_venvs(venvs_root: Path) -> List[str]:
+    """Names of installed venvs, from the completion index if it exists"""
+    index = _read_index(constants.PIPX_COMPLETION_INDEX)
+    if "venvs" in index:
+        return sorted(index["venvs"])
+    # No index yet (e.g. venvs installed by an older pipx): fall back to
+    #   listing the directory, still without reading any metadata
+    try:
+        return sorted(p.name for p in venvs_root.iterdir() if p.is_dir())
+    except FileNotFoundError:
+        return []
@@ -14,9 +14,20 @@ PIPX_SHARED_LIBS = Path(
     os.environ.get("PIPX_SHARED_LIBS", DEFAULT_PIPX_SHARED_LIBS)
 ).resolve()
 PIPX_SHARED_PTH = "pipx_shared.pth"
+# Same content as PIPX_SHARED_PTH, but not processed by site at interpreter
+#   startup.  Used instead of it in venvs with detached shared libraries.
+PIPX_SHARED_DETACHED = "pipx_shared.path"
 LOCAL_BIN_DIR = Path(os.environ.get("PIPX_BIN_DIR", DEFAULT_PIPX_BIN_DIR)).resolve()
 PIPX_VENV_CACHEDIR = PIPX_HOME / ".cache"
+PIPX_STAGING_DIR = PIPX_HOME / ".staging"
+PIPX_TRASH_DIR = PIPX_HOME / ".trash"
+PIPX_COMPLETION_INDEX = PIPX_HOME / "completion_index.json"
+PIPX_METRICS_DIR = PIPX_HOME / "metrics"
+PIPX_WHEELHOUSE_DIR = PIPX_HOME / "wheelhouse"
+PIPX_DEDUP_STORE_DIR = PIPX_HOME / "store"
 TEMP_VENV_EXPIRATION_THRESHOLD_DAYS = 14
+# number of venvs changed at the same time by commands acting on several
+DEFAULT_JOBS = 4
 
 ExitCode = NewType("ExitCode", int)
 # pipx shell exit codes
@@ -27,6 +38,7 @@ EXIT_CODE_LIST_PROBLEM = ExitCode(1)
 EXIT_CODE_UNINSTALL_VENV_NONEXISTENT = ExitCode(1)
 EXIT_CODE_UNINSTALL_ERROR = ExitCode(1)
 EXIT_CODE_REINSTALL_VENV_NONEXISTENT = ExitCode(1)
+EXIT_CODE_RELOCATE_VENV_NONEXISTENT = ExitCode(1)
 
 
 def is_windows() -> bool:
@@ -58,6 +70,15 @@ def use_emjois() -> bool:
 
 emoji_support = use_emjois()
 
+PIPX_DETACH_SHARED_LIBS = strtobool(os.getenv("PIPX_DETACH_SHARED_LIBS", "0"))
+PIPX_PIP_WORKER = strtobool(os.getenv("PIPX_PIP_WORKER", "1"))
+PIPX_METRICS = strtobool(os.getenv("PIPX_METRICS", "0"))
+# "prefer" or "offline", see wheelhouse.py
+PIPX_WHEELHOUSE_MODE = os.getenv("PIPX_WHEELHOUSE", "")
+PIPX_DEDUP = strtobool(os.getenv("PIPX_DEDUP", "0"))
+# directory or http(s) URL, see artifact_cache.py
+PIPX_ARTIFACT_CACHE = os.getenv("PIPX_ARTIFACT_CACHE", "")
+
 completion_instructions = dedent(
     """
 Add the appropriate command to your shell's config file
@@ -0,0 +1,165 @@
+"""Optional content-addressed store that deduplicates installed files.
+
+Files in the site-packages directories of venvs are kept once in
+$PIPX_HOME/store, by the sha256 of their contents (and their mode, which
+hardlinks share), and hardlinked into every venv that has them.  A
+dependency like requests, installed in dozens of venvs, then uses its disk
+space and page cache once.
+
+With PIPX_DEDUP set, each venv is deduplicated after pipx runs `pip install`
+in it; `pipx dedup` deduplicates all existing venvs and removes files from
+the store that no venv uses any more.
+
+Sharing files is safe because pip never modifies installed files in place:
+it removes them and writes new ones, which breaks the hardlink.  .pth files
+at the top of site-packages are written in place by pipx, so they are never
+deduplicated.  Files with no contents are not either, as they use no disk
+space and are numerous enough to reach the link limit of some filesystems.
+"""
+
+import errno
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Tuple
+
+from pipx import constants
+from pipx.constants import PIPX_SHARED_DETACHED
+
+logger = logging.getLogger(__name__)
+
+# errors of os.link meaning the store cannot be used for this venv at all,
+#   e.g. because it is on another filesystem
+_LINK_UNSUPPORTED_ERRNOS = {errno.EXDEV, errno.EPERM, errno.ENOTSUP, errno.EACCES}
+
+
+class DedupStats(NamedTuple):
+    n_files: int = 0
+    n_linked: int = 0
+    bytes_linked: int = 0
+
+
+class _LinkUnsupported(Exception):
+    pass
+
+
+def get_site_packages_dirs(venv_dir: Path) -> List[Path]:
+    """site-packages directories of venv_dir, found without running its
+    interpreter
+    """
+    return sorted(venv_dir.glob("lib/python*/site-packages")) + sorted(
+        venv_dir.glob("Lib/site-packages")
+    )
+
+
+def _iter_files(site_packages: Path) -> Iterator[os.DirEntry]:
+    stack = [site_packages]
+    while stack:
+        dir_path = stack.pop()
+        try:
+            with os.scandir(str(dir_path)) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(Path(entry.path))
+                    elif entry.is_file(follow_symlinks=False):
+                        if dir_path == site_packages and (
+                            entry.name.endswith(".pth")
+                            or entry.name == PIPX_SHARED_DETACHED
+                        ):
+                            continue
+                        yield entry
+        except OSError as e:
+            logger.info(f"Not deduplicating files in {dir_path}: {e}")
+
+
+def _get_sha256(path: str) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as file_fh:
+        for block in iter(lambda: file_fh.read(1024 * 1024), b""):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+def _get_store_path(sha256: str, mode: int) -> Path:
+    return constants.PIPX_DEDUP_STORE_DIR / sha256[:2] / f"{sha256[2:]}-{mode:o}"
+
+
+def _link(src: Path, dst: Path) -> None:
+    try:
+        os.link(str(src), str(dst))
+    except OSError as e:
+        if e.errno in _LINK_UNSUPPORTED_ERRNOS:
+            raise _LinkUnsupported(str(e))
+        raise
+
+
+def _dedup_file(entry: os.DirEntry) -> int:
+    """Hardlink the file of entry to its copy in the store, adding it to the
+    store if needed.  Returns the bytes of the file if it now shares its copy
+    with the store, else 0.
+    """
+    stat = entry.stat(follow_symlinks=False)
+    # st_nlink > 1: already in the store, as pip does not create hardlinks
+    if stat.st_size == 0 or stat.st_nlink > 1:
+        return 0
+
+    store_path = _get_store_path(_get_sha256(entry.path), stat.st_mode & 0o7777)
+    if not store_path.exists():
+        store_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            _link(Path(entry.path), store_path)
+            return 0
+        except FileExistsError:
+            pass  # added by another venv in the meantime
+
+    tmp_path = Path(f"{entry.path}.pipx-dedup")
+    try:
+        _link(store_path, tmp_path)
+    except OSError as e:
+        if e.errno != errno.EMLINK:
+            raise
+        logger.info(f"Not deduplicating {entry.path}: {e}")
+        return 0
+    os.replace(str(tmp_path), entry.path)
+    return stat.st_size
+
+
+def dedup_venv(venv_dir: Path) -> DedupStats:
+    """Hardlink the files in the site-packages of venv_dir to the store"""
+    n_files = 0
+    n_linked = 0
+    bytes_linked = 0
+    try:
+        for site_packages in get_site_packages_dirs(venv_dir):
+            for entry in _iter_files(site_packages):
+                n_files += 1
+                file_bytes_linked = _dedup_file(entry)
+                if file_bytes_linked:
+                    n_linked += 1
+                    bytes_linked += file_bytes_linked
+    except _LinkUnsupported as e:
+        logger.warning(f"Unable to deduplicate files of {venv_dir.name}: {e}")
+    logger.info(
+        f"Deduplicated {n_linked} of {n_files} files in {venv_dir.name} "
+        f"({bytes_linked} bytes)"
+    )
+    return DedupStats(n_files, n_linked, bytes_linked)
+
+
+def prune_store() -> Tuple[int, int]:
+    """Remove files from the store that no venv links to any more.  Returns
+    (number of files, bytes) removed.
+    """
+    n_removed = 0
+    bytes_removed = 0
+    if not constants.PIPX_DEDUP_STORE_DIR.is_dir():
+        return (0, 0)
+    for prefix_dir in constants.PIPX_DEDUP_STORE_DIR.iterdir():
+        for store_path in prefix_dir.iterdir():
+            stat = store_path.stat()
+            if stat.st_nlink == 1:
+                store_path.unlink()
+                n_removed += 1
+                bytes_removed += stat.st_size
+    return (n_removed, bytes_removed)
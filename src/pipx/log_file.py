@@ -0,0 +1,115 @@
+"""The pipx log file, written from a background thread.
+
+All pipx commands append to $PIPX_HOME/logs/pipx.log, which is rotated by
+size.  Log records are handed to a thread through a queue, and only that
+thread formats them and writes them to the file, so neither the disk writes
+nor the formatting of the (verbose, DEBUG level) file log slow down the
+command itself.  Opening the file, and importing logging.handlers, also
+happen on that thread.
+
+Processes forked from pipx (e.g. `pipx list` workers) do not inherit the
+thread, and do not write to the log file.
+"""
+
+import logging
+import os
+import queue
+import threading
+import weakref
+from pathlib import Path
+from typing import Optional
+
+LOG_FILENAME = "pipx.log"
+LOG_FILE_MAX_BYTES = 2 * 1024 * 1024
+LOG_FILE_BACKUP_COUNT = 5
+
+
+_handlers: "weakref.WeakSet[BackgroundFileHandler]" = weakref.WeakSet()
+
+
+def _after_fork_in_child() -> None:
+    for handler in list(_handlers):
+        handler._after_fork_in_child()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+class BackgroundFileHandler(logging.Handler):
+    """Handler that passes records to a thread writing them to log_file,
+    rotating it when it grows larger than max_bytes.
+
+    close() (called by logging.shutdown() at exit) waits for the thread to
+    write out all records handled so far.
+    """
+
+    def __init__(
+        self,
+        log_file: Path,
+        max_bytes: int = LOG_FILE_MAX_BYTES,
+        backup_count: int = LOG_FILE_BACKUP_COUNT,
+    ) -> None:
+        super().__init__()
+        self.log_file = log_file
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._queue: "queue.Queue[Optional[logging.LogRecord]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = threading.Thread(
+            target=self._write_records, name="pipx-log-file"
+        )
+        self._thread.daemon = True
+        self._thread.start()
+        _handlers.add(self)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self._thread is None:
+            return
+        # the record is formatted later, by the writer thread
+        self._queue.put_nowait(record)
+
+    def _after_fork_in_child(self) -> None:
+        # the queue's lock may have been held by a thread that does not exist
+        #   in the child
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def _open_file_handler(self) -> Optional[logging.Handler]:
+        import logging.handlers
+
+        try:
+            self.log_file.parent.mkdir(parents=True, exist_ok=True)
+            if not self.log_file.exists():
+                # pipx versions before the single log file wrote one file
+                #   per command
+                for old_log in self.log_file.parent.glob("cmd_*.log"):
+                    old_log.unlink()
+            file_handler = logging.handlers.RotatingFileHandler(
+                str(self.log_file),
+                maxBytes=self.max_bytes,
+                backupCount=self.backup_count,
+                encoding="utf-8",
+            )
+        except OSError:
+            return None
+        # format with this handler's formatter, but only here in the thread
+        file_handler.format = self.format  # type: ignore
+        return file_handler
+
+    def _write_records(self) -> None:
+        file_handler = self._open_file_handler()
+        while True:
+            record = self._queue.get()
+            if record is None:
+                break
+            if file_handler is not None:
+                file_handler.handle(record)
+        if file_handler is not None:
+            file_handler.close()
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._queue.put_nowait(None)
+            self._thread.join()
+            self._thread = None
+        super().close()
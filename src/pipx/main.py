@@ -4,30 +4,34 @@
 
 import argparse
 import logging
-import logging.config
 import os
 import re
 import shlex
 import sys
 import textwrap
-import time
 import urllib.parse
 from pathlib import Path
 from typing import Dict, List
 
-import argcomplete  # type: ignore
-from packaging.utils import canonicalize_name
-
-from pipx import commands, constants
+from pipx import constants, metrics, trace, wheelhouse
 from pipx.animate import hide_cursor, show_cursor
 from pipx.colors import bold, green
+from pipx.completion_index import (
+    VENV_MODIFYING_COMMANDS,
+    get_completion_venvs,
+    update_completion_index,
+)
 from pipx.constants import ExitCode
 from pipx.emojies import hazard
 from pipx.interpreter import DEFAULT_PYTHON
-from pipx.util import PipxError, mkdir, pipx_wrap
-from pipx.venv import VenvContainer
+from pipx.util import PipxError, empty_trash_in_background, mkdir, pipx_wrap
 from pipx.version import __version__
 
+# Command modules, the venv machinery and their dependencies (packaging,
+#   importlib.metadata, urllib.request, ...) are imported only once a command
+#   has been parsed, so `pipx --version`, `--help` and shell completion do not
+#   pay for them.  tests/test_main.py checks this stays true.
+
 logger = logging.getLogger(__name__)
 
 
@@ -62,6 +66,12 @@ PIPX_DESCRIPTION += pipx_wrap(
       PIPX_BIN_DIR          Overrides location of app installations. Apps are symlinked or copied here.
       USE_EMOJI             Overrides emoji behavior. Default value varies based on platform.
       PIPX_DEFAULT_PYTHON   Overrides default python used for commands.
+      PIPX_TRACE            Write a trace of where each command spends its time to this file, like --trace.
+      PIPX_METRICS          Keep usage metrics in $PIPX_HOME/metrics/pipx.prom, in the Prometheus text format.
+      PIPX_WHEELHOUSE       'prefer' or 'offline': install from pipx's wheelhouse too, or only, like --wheelhouse or --offline.
+      PIPX_DEDUP            Hardlink installed files of venvs to one copy in $PIPX_HOME/store after each install. See 'pipx dedup'.
+      PIPX_ARTIFACT_CACHE   Directory or http(s) URL of a cache of ready venvs, shared between machines, used by install and run.
+      PIPX_DETACH_SHARED_LIBS Keep pipx's shared pip, setuptools and wheel off the sys.path of installed apps. Applies to venvs created or relocated while set.
     """,
     subsequent_indent=" " * 24,  # match the indent of argparse options
     keep_newlines=True,
@@ -87,8 +97,12 @@ INSTALL_DESCRIPTION = textwrap.dedent(
     pipx install ./LOCAL_PATH
     pipx install ZIP_FILE
     pipx install TAR_GZ_FILE
+    pipx install PACKAGE_NAME OTHER_PACKAGE_NAME ...
 
     The PACKAGE_SPEC argument is passed directly to `pip install`.
+    Several PACKAGE_SPEC arguments are installed into separate Virtual
+    Environments, up to --jobs at the same time, after which pipx reports
+    which of them failed.
 
     The default virtual environment location is {constants.DEFAULT_PIPX_HOME}
     and can be overridden by setting the environment variable `PIPX_HOME`
@@ -111,13 +125,18 @@ class LineWrapRawTextHelpFormatter(argparse.RawDescriptionHelpFormatter):
 
 
 class InstalledVenvsCompleter:
-    def __init__(self, venv_container: VenvContainer) -> None:
-        self.packages = [str(p.name) for p in sorted(venv_container.iter_venv_dirs())]
+    def __init__(self, venvs_root: Path) -> None:
+        self.venvs_root = venvs_root
 
     def use(self, prefix: str, **kwargs) -> List[str]:
+        # only called by argcomplete, so venvs are looked up when actually
+        #   completing and not every time the parser is built
+        from packaging.utils import canonicalize_name
+
+        packages = get_completion_venvs(self.venvs_root)
         return [
             f"{prefix}{x[len(prefix):]}"
-            for x in self.packages
+            for x in packages
             if x.startswith(canonicalize_name(prefix))
         ]
 
@@ -145,10 +164,18 @@ def get_venv_args(parsed_args: Dict) -> List[str]:
 
 
 def run_pipx_command(args: argparse.Namespace) -> ExitCode:  # noqa: C901
+    from packaging.utils import canonicalize_name
+
+    from pipx import commands
+    from pipx.venv import VenvContainer
+
     verbose = args.verbose if "verbose" in args else False
     pip_args = get_pip_args(vars(args))
     venv_args = get_venv_args(vars(args))
 
+    if "wheelhouse_mode" in args and args.wheelhouse_mode is not None:
+        wheelhouse.set_mode(args.wheelhouse_mode)
+
     venv_container = VenvContainer(constants.PIPX_LOCAL_VENVS)
 
     if "package" in args:
@@ -187,9 +214,7 @@ def run_pipx_command(args: argparse.Namespace) -> ExitCode:  # noqa: C901
         # We should never reach here because run() is NoReturn.
         return ExitCode(1)
     elif args.command == "install":
-        return commands.install(
-            None,
-            None,
+        return commands.install_packages(
             args.package_spec,
             constants.LOCAL_BIN_DIR,
             args.python,
@@ -199,6 +224,7 @@ def run_pipx_command(args: argparse.Namespace) -> ExitCode:  # noqa: C901
             force=args.force,
             include_dependencies=args.include_deps,
             suffix=args.suffix,
+            jobs=args.jobs,
         )
     elif args.command == "inject":
         return commands.inject(
@@ -218,6 +244,7 @@ def run_pipx_command(args: argparse.Namespace) -> ExitCode:  # noqa: C901
             verbose,
             include_injected=args.include_injected,
             force=args.force,
+            staged=args.staged,
         )
     elif args.command == "upgrade-all":
         return commands.upgrade_all(
@@ -226,9 +253,14 @@ def run_pipx_command(args: argparse.Namespace) -> ExitCode:  # noqa: C901
             include_injected=args.include_injected,
             skip=skip_list,
             force=args.force,
+            staged=args.staged,
         )
+    elif args.command == "upgrade-shared":
+        return commands.upgrade_shared(pip_args, verbose)
     elif args.command == "list":
-        return commands.list_packages(venv_container, args.include_injected)
+        return commands.list_packages(
+            venv_container, args.include_injected, args.json, args.json_lines
+        )
     elif args.command == "uninstall":
         return commands.uninstall(venv_dir, constants.LOCAL_BIN_DIR, verbose)
     elif args.command == "uninstall-all":
@@ -239,6 +271,7 @@ def run_pipx_command(args: argparse.Namespace) -> ExitCode:  # noqa: C901
             local_bin_dir=constants.LOCAL_BIN_DIR,
             python=args.python,
             verbose=verbose,
+            staged=args.staged,
         )
     elif args.command == "reinstall-all":
         return commands.reinstall_all(
@@ -247,6 +280,58 @@ def run_pipx_command(args: argparse.Namespace) -> ExitCode:  # noqa: C901
             args.python,
             verbose,
             skip=skip_list,
+            staged=args.staged,
+        )
+    elif args.command == "relocate":
+        return commands.relocate(
+            venv_dir=venv_dir,
+            local_bin_dir=constants.LOCAL_BIN_DIR,
+            python=args.python,
+            verbose=verbose,
+        )
+    elif args.command == "relocate-all":
+        return commands.relocate_all(
+            venv_container,
+            constants.LOCAL_BIN_DIR,
+            args.python,
+            verbose,
+            skip=skip_list,
+        )
+    elif args.command == "sync":
+        return commands.sync(
+            Path(args.manifest),
+            venv_container,
+            constants.LOCAL_BIN_DIR,
+            verbose,
+            prune=args.prune,
+            upgrade=args.upgrade,
+            dry_run=args.dry_run,
+            jobs=args.jobs,
+        )
+    elif args.command == "wheelhouse":
+        if args.wheelhouse_command == "clear":
+            return commands.wheelhouse_clear()
+        return commands.wheelhouse_fill(
+            venv_container, args.packages, verbose, jobs=args.jobs
+        )
+    elif args.command == "dedup":
+        return commands.dedup(venv_container, verbose, jobs=args.jobs)
+    elif args.command == "export":
+        return commands.export_bundle(
+            venv_container,
+            args.packages,
+            Path(args.output),
+            verbose,
+            all_venvs=args.all,
+        )
+    elif args.command == "import":
+        return commands.import_bundle(
+            Path(args.bundle),
+            venv_container,
+            constants.LOCAL_BIN_DIR,
+            args.python,
+            verbose,
+            force=args.force,
         )
     elif args.command == "runpip":
         if not venv_dir:
@@ -282,6 +367,65 @@ def add_pip_venv_args(parser: argparse.ArgumentParser) -> None:
         "--pip-args",
         help="Arbitrary pip arguments to pass directly to pip install/upgrade commands",
     )
+    add_wheelhouse(parser)
+
+
+def add_wheelhouse(parser: argparse.ArgumentParser) -> None:
+    g = parser.add_mutually_exclusive_group()
+    g.add_argument(
+        "--wheelhouse",
+        dest="wheelhouse_mode",
+        action="store_const",
+        const="prefer",
+        help=(
+            "Also install wheels from pipx's wheelhouse (filled with "
+            "'pipx wheelhouse fill'), instead of building them again"
+        ),
+    )
+    g.add_argument(
+        "--offline",
+        dest="wheelhouse_mode",
+        action="store_const",
+        const="offline",
+        help="Only install wheels from pipx's wheelhouse, without using the network",
+    )
+
+
+def add_staged(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--staged",
+        action="store_true",
+        help=(
+            "Build the new Virtual Environment alongside the existing one and "
+            "swap it in once it is ready, so apps stay available throughout "
+            "and a failure leaves the existing installation untouched"
+        ),
+    )
+
+
+def add_trace(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help=(
+            "Write a trace of where the command spends its time to FILE, as "
+            "Chrome trace event JSON (view with chrome://tracing or "
+            "https://ui.perfetto.dev)."
+        ),
+    )
+
+
+def add_jobs(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=None,
+        help=(
+            "Number of Virtual Environments changed at the same time "
+            f"(default: {constants.DEFAULT_JOBS})"
+        ),
+    )
 
 
 def add_include_dependencies(parser: argparse.ArgumentParser) -> None:
@@ -297,7 +441,14 @@ def _add_install(subparsers) -> None:
         formatter_class=LineWrapRawTextHelpFormatter,
         description=INSTALL_DESCRIPTION,
     )
-    p.add_argument("package_spec", help="package name or pip installation spec")
+    p.add_argument(
+        "package_spec",
+        nargs="+",
+        help=(
+            "package name or pip installation spec. Several packages are "
+            "installed into separate Virtual Environments at the same time"
+        ),
+    )
     add_include_dependencies(p)
     p.add_argument("--verbose", action="store_true")
     p.add_argument(
@@ -322,6 +473,7 @@ def _add_install(subparsers) -> None:
             "associated app/apps. Must be v3.5+."
         ),
     )
+    add_jobs(p)
     add_pip_venv_args(p)
 
 
@@ -375,6 +527,7 @@ def _add_upgrade(subparsers, venv_completer) -> None:
         help="Modify existing virtual environment and files in PIPX_BIN_DIR",
     )
     add_pip_venv_args(p)
+    add_staged(p)
     p.add_argument("--verbose", action="store_true")
 
 
@@ -396,6 +549,33 @@ def _add_upgrade_all(subparsers) -> None:
         action="store_true",
         help="Modify existing virtual environment and files in PIPX_BIN_DIR",
     )
+    add_staged(p)
+    add_wheelhouse(p)
+    p.add_argument("--verbose", action="store_true")
+
+
+def _add_upgrade_shared(subparsers) -> None:
+    p = subparsers.add_parser(
+        "upgrade-shared",
+        help="Upgrade pipx's shared libraries from the package index",
+        description=textwrap.dedent(
+            """
+            Upgrade pip, setuptools and wheel in pipx's shared libraries, used
+            by all Virtual Environments, from the package index.
+
+            pipx creates the shared libraries, and refreshes them every 30
+            days, from wheels available without network access: those bundled
+            with Python and those in pipx's wheelhouse. The package index is
+            only used by this command, and when upgrading or reinstalling
+            packages.
+            """
+        ),
+    )
+    p.add_argument("--index-url", "-i", help="Base URL of Python Package Index")
+    p.add_argument(
+        "--pip-args", help="Arbitrary pip arguments to pass directly to pip install"
+    )
+    add_wheelhouse(p)
     p.add_argument("--verbose", action="store_true")
 
 
@@ -442,6 +622,8 @@ def _add_reinstall(subparsers, venv_completer) -> None:
             "and run the associated app/apps. Must be v3.5+."
         ),
     )
+    add_staged(p)
+    add_wheelhouse(p)
     p.add_argument("--verbose", action="store_true")
 
 
@@ -471,6 +653,66 @@ def _add_reinstall_all(subparsers) -> None:
         ),
     )
     p.add_argument("--skip", nargs="+", default=[], help="skip these packages")
+    add_staged(p)
+    add_wheelhouse(p)
+    p.add_argument("--verbose", action="store_true")
+
+
+def _add_relocate(subparsers, venv_completer) -> None:
+    p = subparsers.add_parser(
+        "relocate",
+        formatter_class=LineWrapRawTextHelpFormatter,
+        help="Repoint a package's venv at a new Python or PIPX_HOME location",
+        description=textwrap.dedent(
+            """
+            Repoints an existing package's Virtual Environment at PYTHON and at
+            its current location, without reinstalling its packages.
+
+            This rewrites the venv's pyvenv.cfg and interpreter links, the
+            interpreter paths of its scripts, its link to pipx's shared
+            libraries and the app paths recorded by pipx, then re-exposes its
+            apps. Use it after a patch-release upgrade of the base interpreter
+            or after moving PIPX_HOME. If PYTHON has a different major.minor
+            version than the venv, the package is reinstalled instead.
+
+            """
+        ),
+    )
+    p.add_argument("package").completer = venv_completer
+    p.add_argument(
+        "--python",
+        default=DEFAULT_PYTHON,
+        help=(
+            "The Python executable the Virtual Environment should use. "
+            "Must be v3.5+."
+        ),
+    )
+    p.add_argument("--verbose", action="store_true")
+
+
+def _add_relocate_all(subparsers) -> None:
+    p = subparsers.add_parser(
+        "relocate-all",
+        formatter_class=LineWrapRawTextHelpFormatter,
+        help="Repoint all venvs at a new Python or PIPX_HOME location",
+        description=textwrap.dedent(
+            """
+            Repoints all Virtual Environments at PYTHON and at their current
+            location, without reinstalling their packages. Venvs built with a
+            different major.minor version of Python are reinstalled instead.
+
+            """
+        ),
+    )
+    p.add_argument(
+        "--python",
+        default=DEFAULT_PYTHON,
+        help=(
+            "The Python executable the Virtual Environments should use. "
+            "Must be v3.5+."
+        ),
+    )
+    p.add_argument("--skip", nargs="+", default=[], help="skip these packages")
     p.add_argument("--verbose", action="store_true")
 
 
@@ -485,6 +727,201 @@ def _add_list(subparsers) -> None:
         action="store_true",
         help="Show packages injected into the main app's environment",
     )
+    g = p.add_mutually_exclusive_group()
+    g.add_argument(
+        "--json",
+        action="store_true",
+        help=(
+            "Output the pipx metadata, exposed and missing apps and problems "
+            "of all venvs as one JSON object, keyed by venv name"
+        ),
+    )
+    g.add_argument(
+        "--json-lines",
+        action="store_true",
+        help="Like --json, but output one JSON object per venv and line, as each is read",
+    )
+    p.add_argument("--verbose", action="store_true")
+
+
+def _add_sync(subparsers) -> None:
+    p = subparsers.add_parser(
+        "sync",
+        formatter_class=LineWrapRawTextHelpFormatter,
+        help="Install, inject and upgrade packages to match a manifest file",
+        description=textwrap.dedent(
+            """
+            Make the installed packages match a TOML manifest, with one
+            [[package]] table per Virtual Environment:
+
+                [[package]]
+                spec = "black==22.3.0"
+                inject = ["black-macchiato"]
+
+                [[package]]
+                spec = "pycowsay"
+                suffix = "@2"
+                python = "python3.8"
+                pip_args = ["--no-cache-dir"]
+                include_deps = false
+
+            Only the differences between the manifest and the installed
+            packages are applied, concurrently, so syncing an unchanged
+            manifest is quick. A package whose spec, pip args, include_deps,
+            Python or injected packages changed is reinstalled. Packages not
+            in the manifest are only uninstalled with --prune.
+
+            Manifests whose file name ends with .json are read as JSON, with
+            the same structure.
+            """
+        ),
+    )
+    p.add_argument("manifest", help="Path of the manifest file")
+    p.add_argument(
+        "--prune",
+        action="store_true",
+        help="Uninstall packages that are not in the manifest",
+    )
+    p.add_argument(
+        "--upgrade",
+        action="store_true",
+        help="Also upgrade the packages already in sync with the manifest",
+    )
+    p.add_argument(
+        "--dry-run", action="store_true", help="Only print what would be changed",
+    )
+    add_jobs(p)
+    add_wheelhouse(p)
+    p.add_argument("--verbose", action="store_true")
+
+
+def _add_wheelhouse(subparsers) -> None:
+    p = subparsers.add_parser(
+        "wheelhouse",
+        formatter_class=LineWrapRawTextHelpFormatter,
+        help="Build wheels of installed packages into pipx's wheelhouse",
+        description=textwrap.dedent(
+            f"""
+            Manage the wheelhouse, a directory of wheels in
+            $PIPX_HOME/wheelhouse shared by all Virtual Environments.
+
+            'pipx wheelhouse fill' builds wheels of the packages (and their
+            dependencies) recorded in the given or all installed Virtual
+            Environments, several at the same time, and downloads wheels of
+            pipx's shared libraries. Wheels already in the wheelhouse are not
+            built again.
+
+            'pipx wheelhouse clear' deletes all wheels in it.
+
+            Commands that install packages use the wheelhouse with --wheelhouse,
+            or when PIPX_WHEELHOUSE is 'prefer', in addition to the package
+            index. With --offline, or when PIPX_WHEELHOUSE is 'offline', they
+            use only the wheelhouse, so a filled wheelhouse lets packages be
+            reinstalled without network access and without building sdists.
+            The wheelhouse is at {constants.DEFAULT_PIPX_HOME / "wheelhouse"}
+            by default.
+            """
+        ),
+    )
+    p.add_argument(
+        "wheelhouse_command", choices=["fill", "clear"], help="What to do",
+    )
+    p.add_argument(
+        "packages",
+        nargs="*",
+        default=[],
+        help="Installed packages to build wheels for (default: all)",
+    )
+    add_jobs(p)
+    add_wheelhouse(p)
+    p.add_argument("--verbose", action="store_true")
+
+
+def _add_dedup(subparsers) -> None:
+    p = subparsers.add_parser(
+        "dedup",
+        formatter_class=LineWrapRawTextHelpFormatter,
+        help="Share identical installed files between Virtual Environments",
+        description=textwrap.dedent(
+            f"""
+            Keep one copy of each file installed in the Virtual Environments
+            (and pipx's shared libraries) in a content-addressed store, and
+            hardlink it into every Virtual Environment that has it. Files the
+            store holds that no Virtual Environment uses any more are removed.
+
+            Set PIPX_DEDUP to do this for each Virtual Environment whenever pipx
+            installs packages into it.
+
+            The store is at {constants.DEFAULT_PIPX_HOME / "store"} by default,
+            and must be on the same filesystem as the Virtual Environments.
+            """
+        ),
+    )
+    add_jobs(p)
+    p.add_argument("--verbose", action="store_true")
+
+
+def _add_export(subparsers, venv_completer) -> None:
+    p = subparsers.add_parser(
+        "export",
+        formatter_class=LineWrapRawTextHelpFormatter,
+        help="Write installed Virtual Environments to a bundle for 'pipx import'",
+        description=textwrap.dedent(
+            """
+            Write installed Virtual Environments, with their pipx metadata, to
+            a bundle file that 'pipx import' installs on another machine
+            without downloading or building anything.
+
+            The bundle is a tar archive, compressed according to the file name
+            of --output: .tar, .tar.gz, .tar.xz or .tar.zst (which requires
+            the zstandard package).
+            """
+        ),
+    )
+    p.add_argument(
+        "packages", nargs="*", default=[], help="Installed packages to export"
+    ).completer = venv_completer
+    p.add_argument(
+        "--all", action="store_true", help="Export all installed packages",
+    )
+    p.add_argument(
+        "--output", "-o", required=True, help="File name of the bundle to write"
+    )
+    p.add_argument("--verbose", action="store_true")
+
+
+def _add_import(subparsers) -> None:
+    p = subparsers.add_parser(
+        "import",
+        formatter_class=LineWrapRawTextHelpFormatter,
+        help="Install the Virtual Environments in a bundle from 'pipx export'",
+        description=textwrap.dedent(
+            """
+            Unpack the Virtual Environments in a bundle written by
+            'pipx export', point them at the local Python and PIPX_HOME, and
+            expose their apps.
+
+            Bundles with Virtual Environments built for another platform,
+            Python implementation or Python version than --python are refused
+            before anything is unpacked.
+            """
+        ),
+    )
+    p.add_argument("bundle", help="Bundle file written by 'pipx export'")
+    p.add_argument(
+        "--force",
+        "-f",
+        action="store_true",
+        help="Replace installed Virtual Environments and apps of the same names",
+    )
+    p.add_argument(
+        "--python",
+        default=DEFAULT_PYTHON,
+        help=(
+            "The Python executable the Virtual Environments should use. "
+            "Must be the same version as the one they were exported with."
+        ),
+    )
     p.add_argument("--verbose", action="store_true")
 
 
@@ -591,9 +1028,7 @@ def _add_ensurepath(subparsers) -> None:
 
 
 def get_command_parser() -> argparse.ArgumentParser:
-    venv_container = VenvContainer(constants.PIPX_LOCAL_VENVS)
-
-    completer_venvs = InstalledVenvsCompleter(venv_container)
+    completer_venvs = InstalledVenvsCompleter(constants.PIPX_LOCAL_VENVS)
 
     parser = argparse.ArgumentParser(
         formatter_class=LineWrapRawTextHelpFormatter, description=PIPX_DESCRIPTION
@@ -607,14 +1042,24 @@ def get_command_parser() -> argparse.ArgumentParser:
     _add_inject(subparsers, completer_venvs.use)
     _add_upgrade(subparsers, completer_venvs.use)
     _add_upgrade_all(subparsers)
+    _add_upgrade_shared(subparsers)
     _add_uninstall(subparsers, completer_venvs.use)
     _add_uninstall_all(subparsers)
     _add_reinstall(subparsers, completer_venvs.use)
     _add_reinstall_all(subparsers)
+    _add_relocate(subparsers, completer_venvs.use)
+    _add_relocate_all(subparsers)
     _add_list(subparsers)
+    _add_sync(subparsers)
+    _add_wheelhouse(subparsers)
+    _add_dedup(subparsers)
+    _add_export(subparsers, completer_venvs.use)
+    _add_import(subparsers)
     _add_run(subparsers)
     _add_runpip(subparsers, completer_venvs.use)
     _add_ensurepath(subparsers)
+    for command_parser in subparsers.choices.values():
+        add_trace(command_parser)
 
     parser.add_argument("--version", action="store_true", help="Print version and exit")
     subparsers.add_parser(
@@ -625,70 +1070,42 @@ def get_command_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def setup_log_file() -> Path:
-    max_logs = 10
-    # don't use utils.mkdir, to prevent emission of log message
-    constants.PIPX_LOG_DIR.mkdir(parents=True, exist_ok=True)
+# latency-sensitive commands that only log to the log file with --verbose
+NO_LOG_FILE_COMMANDS = {"run", "completions"}
 
-    existing_logs = sorted(constants.PIPX_LOG_DIR.glob("cmd_*.log"))
-    if len(existing_logs) > max_logs:
-        for existing_log in existing_logs[:-max_logs]:
-            try:
-                existing_log.unlink()
-            except FileNotFoundError:
-                pass
 
-    datetime_str = time.strftime("%Y-%m-%d_%H.%M.%S")
-    log_file = constants.PIPX_LOG_DIR / f"cmd_{datetime_str}.log"
-    counter = 1
-    while log_file.exists() and counter < 10:
-        log_file = constants.PIPX_LOG_DIR / f"cmd_{datetime_str}_{counter}.log"
-        counter += 1
+def setup_logging(verbose: bool, log_to_file: bool = True) -> None:
+    from pipx.log_file import LOG_FILENAME, BackgroundFileHandler
 
-    return log_file
+    pipx_str = bold(green("pipx >")) if sys.stdout.isatty() else "pipx >"
 
+    pipx_logger = logging.getLogger("pipx")
+    # remove handlers of any previous setup (e.g. earlier pytest tests)
+    for handler in list(pipx_logger.handlers):
+        pipx_logger.removeHandler(handler)
+        handler.close()
 
-def setup_logging(verbose: bool) -> None:
-    pipx_str = bold(green("pipx >")) if sys.stdout.isatty() else "pipx >"
-    log_file = setup_log_file()
-
-    # "incremental" is False so previous pytest tests don't accumulate handlers
-    logging_config = {
-        "version": 1,
-        "formatters": {
-            "stream_nonverbose": {
-                "class": "logging.Formatter",
-                "format": "{message}",
-                "style": "{",
-            },
-            "stream_verbose": {
-                "class": "logging.Formatter",
-                "format": pipx_str + "({funcName}:{lineno}): {message}",
-                "style": "{",
-            },
-            "file": {
-                "class": "logging.Formatter",
-                "format": "{relativeCreated: >8.1f}ms ({funcName}:{lineno}): {message}",
-                "style": "{",
-            },
-        },
-        "handlers": {
-            "stream": {
-                "class": "logging.StreamHandler",
-                "formatter": "stream_verbose" if verbose else "stream_nonverbose",
-                "level": "INFO" if verbose else "WARNING",
-            },
-            "file": {
-                "class": "logging.FileHandler",
-                "formatter": "file",
-                "filename": str(log_file),
-                "level": "DEBUG",
-            },
-        },
-        "loggers": {"pipx": {"handlers": ["stream", "file"], "level": "DEBUG"}},
-        "incremental": False,
-    }
-    logging.config.dictConfig(logging_config)
+    stream_handler = logging.StreamHandler()
+    if verbose:
+        stream_handler.setFormatter(
+            logging.Formatter(pipx_str + "({funcName}:{lineno}): {message}", style="{")
+        )
+        stream_handler.setLevel(logging.INFO)
+    else:
+        stream_handler.setFormatter(logging.Formatter("{message}", style="{"))
+        stream_handler.setLevel(logging.WARNING)
+    pipx_logger.addHandler(stream_handler)
+
+    if log_to_file:
+        file_handler = BackgroundFileHandler(constants.PIPX_LOG_DIR / LOG_FILENAME)
+        file_handler.setFormatter(
+            logging.Formatter(
+                "{asctime} [{process}] ({funcName}:{lineno}): {message}", style="{"
+            )
+        )
+        file_handler.setLevel(logging.DEBUG)
+        pipx_logger.addHandler(file_handler)
+    pipx_logger.setLevel(logging.DEBUG)
 
 
 def setup(args: argparse.Namespace) -> None:
@@ -696,16 +1113,22 @@ def setup(args: argparse.Namespace) -> None:
         print_version()
         sys.exit(0)
 
-    setup_logging("verbose" in args and args.verbose)
+    verbose = "verbose" in args and args.verbose
+    setup_logging(verbose, verbose or args.command not in NO_LOG_FILE_COMMANDS)
+
+    trace_file = getattr(args, "trace", None) or os.environ.get("PIPX_TRACE")
+    if trace_file:
+        trace.enable_tracing(Path(trace_file).resolve())
 
-    logger.debug(f"{time.strftime('%Y-%m-%d %H:%M:%S')}")
-    logger.debug(f"{' '.join(sys.argv)}")
+    logger.debug("%s", " ".join(sys.argv))
     logger.info(f"pipx version is {__version__}")
     logger.info(f"Default python interpreter is {repr(DEFAULT_PYTHON)}")
 
     mkdir(constants.PIPX_LOCAL_VENVS)
     mkdir(constants.LOCAL_BIN_DIR)
     mkdir(constants.PIPX_VENV_CACHEDIR)
+    # finish deleting anything a previous run trashed but did not get to
+    empty_trash_in_background()
 
     old_pipx_venv_location = constants.PIPX_LOCAL_VENVS / "pipx-app"
     if old_pipx_venv_location.exists():
@@ -738,17 +1161,34 @@ def check_args(parsed_pipx_args: argparse.Namespace) -> None:
 
 def cli() -> ExitCode:
     """Entry point from command line"""
+    if "_ARGCOMPLETE" in os.environ:
+        # shell completion: answer and exit before touching the terminal,
+        #   logging or anything else
+        import argcomplete  # type: ignore
+
+        argcomplete.autocomplete(get_command_parser())
+
     try:
         hide_cursor()
         parser = get_command_parser()
-        argcomplete.autocomplete(parser)
         parsed_pipx_args = parser.parse_args()
         setup(parsed_pipx_args)
         check_args(parsed_pipx_args)
         if not parsed_pipx_args.command:
             parser.print_help()
             return ExitCode(1)
-        return run_pipx_command(parsed_pipx_args)
+        metrics.start_command(parsed_pipx_args.command)
+        exit_code = ExitCode(1)
+        try:
+            with trace.span(f"pipx {parsed_pipx_args.command}") as span_args:
+                exit_code = run_pipx_command(parsed_pipx_args)
+                span_args["exit_code"] = exit_code
+                return exit_code
+        finally:
+            if parsed_pipx_args.command in VENV_MODIFYING_COMMANDS:
+                update_completion_index(constants.PIPX_LOCAL_VENVS)
+            metrics.finish_command(exit_code)
+            trace.write_trace()
     except PipxError as e:
         print(str(e), file=sys.stderr)
         logger.debug(f"PipxError: {e}", exc_info=True)
@@ -0,0 +1,244 @@
+"""Operational metrics in the Prometheus text format.
+
+When PIPX_METRICS is set, pipx updates $PIPX_HOME/metrics/pipx.prom after
+every command, for the node exporter's textfile collector to pick up.
+Counters are kept across commands in a state file next to it.  Both files are
+only ever replaced atomically, under a lock, so concurrent pipx commands and
+scrapes never see partial data.
+"""
+
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Generator, Optional, Tuple
+
+from pipx import constants
+from pipx.constants import WINDOWS
+
+logger = logging.getLogger(__name__)
+
+METRICS_FILENAME = "pipx.prom"
+METRICS_STATE_FILENAME = "state.json"
+METRICS_LOCK_FILENAME = "lock"
+
+# (help text, type) for every metric family written
+_METRIC_FAMILIES = {
+    "pipx_commands_total": ("Number of pipx commands run.", "counter"),
+    "pipx_command_duration_seconds": ("Duration of pipx commands.", "summary"),
+    "pipx_run_cache_hits_total": (
+        "Number of `pipx run` commands that reused a cached venv.",
+        "counter",
+    ),
+    "pipx_run_cache_misses_total": (
+        "Number of `pipx run` commands that had to create a venv.",
+        "counter",
+    ),
+    "pipx_shared_libs_upgrades_total": (
+        "Number of upgrades of the shared libraries.",
+        "counter",
+    ),
+    "pipx_venvs": ("Number of installed venvs.", "gauge"),
+    "pipx_venvs_bytes": ("Disk space used by installed venvs.", "gauge"),
+    "pipx_run_cache_venvs": ("Number of cached `pipx run` venvs.", "gauge"),
+    "pipx_run_cache_bytes": ("Disk space used by cached `pipx run` venvs.", "gauge"),
+    "pipx_last_command_timestamp_seconds": (
+        "Time the last pipx command finished.",
+        "gauge",
+    ),
+}
+
+# commands after which disk usage is measured again
+_DISK_CHANGING_COMMANDS = {
+    "install",
+    "inject",
+    "upgrade",
+    "upgrade-all",
+    "uninstall",
+    "uninstall-all",
+    "reinstall",
+    "reinstall-all",
+    "relocate",
+    "relocate-all",
+    "sync",
+    "dedup",
+    "import",
+    "run",
+}
+
+_command: Optional[str] = None
+_command_start = 0.0
+_pending_counts: Dict[str, float] = {}
+
+
+def count(name: str, value: float = 1) -> None:
+    """Add value to the counter name, written out when the command finishes"""
+    _pending_counts[name] = _pending_counts.get(name, 0) + value
+
+
+def start_command(command: str) -> None:
+    global _command, _command_start
+    _command = command
+    _command_start = time.time()
+    _pending_counts.clear()
+
+
+def finish_command(exit_code: int) -> None:
+    """Record the result of the command started with start_command and write
+    the metrics file.  Only the first call after start_command does anything.
+    """
+    global _command
+    if _command is None or not constants.PIPX_METRICS:
+        _command = None
+        return
+    command = _command
+    _command = None
+    try:
+        _update_metrics(command, exit_code, time.time() - _command_start)
+    except Exception as e:
+        logger.warning(f"Unable to update pipx metrics: {e}")
+        logger.debug("Metrics exception:", exc_info=True)
+
+
+def _get_dir_usage(path: Path) -> Tuple[int, int]:
+    """(number of subdirectories, bytes used by all files) of path"""
+    n_dirs = 0
+    total_bytes = 0
+    try:
+        entries = list(os.scandir(str(path)))
+    except OSError:
+        return (0, 0)
+    stack = []
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            n_dirs += 1
+            stack.append(entry.path)
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        total_bytes += entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            pass
+    return (n_dirs, total_bytes)
+
+
+@contextmanager
+def _locked(lock_path: Path) -> Generator[None, None, None]:
+    with lock_path.open("a+") as lock_fh:
+        if WINDOWS:
+            import msvcrt
+
+            while True:
+                try:
+                    msvcrt.locking(lock_fh.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass  # LK_LOCK gives up after 10s, keep waiting
+            try:
+                yield
+            finally:
+                lock_fh.seek(0)
+                msvcrt.locking(lock_fh.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(lock_fh.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_fh.fileno(), fcntl.LOCK_UN)
+
+
+def _replace_file(path: Path, content: str) -> None:
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(content, encoding="utf-8")
+    os.replace(str(tmp_path), str(path))
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    label_strs = []
+    for (key, value) in sorted(labels.items()):
+        value = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        label_strs.append(f'{key}="{value}"')
+    return "{" + ",".join(label_strs) + "}"
+
+
+def format_metrics(state: Dict[str, Any]) -> str:
+    """Prometheus text format for the samples in state, which maps metric
+    family names to lists of [labels, value] (or [labels, count, sum] for
+    summaries)
+    """
+    lines = []
+    for (family, (help_text, metric_type)) in _METRIC_FAMILIES.items():
+        samples = state.get(family)
+        if not samples:
+            continue
+        lines.append(f"# HELP {family} {help_text}")
+        lines.append(f"# TYPE {family} {metric_type}")
+        for sample in samples:
+            labels = _format_labels(sample[0])
+            if metric_type == "summary":
+                lines.append(f"{family}_count{labels} {sample[1]:g}")
+                lines.append(f"{family}_sum{labels} {sample[2]:.3f}")
+            else:
+                lines.append(f"{family}{labels} {sample[1]:g}")
+    return "\n".join(lines) + "\n"
+
+
+def _add_sample(
+    state: Dict[str, Any], family: str, labels: Dict[str, str], *values: float
+) -> None:
+    samples = state.setdefault(family, [])
+    for sample in samples:
+        if sample[0] == labels:
+            for (i, value) in enumerate(values, start=1):
+                sample[i] += value
+            return
+    samples.append([labels] + list(values))
+
+
+def _set_gauge(state: Dict[str, Any], family: str, value: float) -> None:
+    state[family] = [[{}, value]]
+
+
+def _update_metrics(command: str, exit_code: int, duration: float) -> None:
+    metrics_dir = constants.PIPX_METRICS_DIR
+    metrics_dir.mkdir(parents=True, exist_ok=True)
+    state_path = metrics_dir / METRICS_STATE_FILENAME
+
+    with _locked(metrics_dir / METRICS_LOCK_FILENAME):
+        try:
+            state = json.loads(state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            state = {}
+
+        result = "success" if exit_code == 0 else "failure"
+        _add_sample(
+            state, "pipx_commands_total", {"command": command, "result": result}, 1
+        )
+        _add_sample(
+            state, "pipx_command_duration_seconds", {"command": command}, 1, duration,
+        )
+        for (name, value) in _pending_counts.items():
+            _add_sample(state, name, {}, value)
+        _pending_counts.clear()
+
+        if command in _DISK_CHANGING_COMMANDS or "pipx_venvs" not in state:
+            (n_venvs, venvs_bytes) = _get_dir_usage(constants.PIPX_LOCAL_VENVS)
+            (n_cached, cached_bytes) = _get_dir_usage(constants.PIPX_VENV_CACHEDIR)
+            _set_gauge(state, "pipx_venvs", n_venvs)
+            _set_gauge(state, "pipx_venvs_bytes", venvs_bytes)
+            _set_gauge(state, "pipx_run_cache_venvs", n_cached)
+            _set_gauge(state, "pipx_run_cache_bytes", cached_bytes)
+        _set_gauge(state, "pipx_last_command_timestamp_seconds", round(time.time()))
+
+        _replace_file(state_path, json.dumps(state, sort_keys=True))
+        _replace_file(metrics_dir / METRICS_FILENAME, format_metrics(state))
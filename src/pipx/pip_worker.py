@@ -0,0 +1,205 @@
+"""A pip process that stays alive for the duration of a pipx command.
+
+Importing pip (with its vendored requests, rich, resolvelib, ...) is most of
+the time taken by a quick pip command.  Commands that run pip several times in
+the same venv (inject with several packages, upgrade --include-injected,
+reinstall, ...) send the commands to one PipWorker instead, which runs them
+in-process with pip's own CLI entry point and so only imports pip once.
+"""
+
+import atexit
+import json
+import logging
+import os
+import re
+import subprocess
+import textwrap
+import threading
+import uuid
+import weakref
+from pathlib import Path
+from typing import List, Optional
+
+from pipx import trace
+from pipx.util import (
+    SUBPROCESS_OUTPUT_TAIL_LINES,
+    OutputTail,
+    fix_subprocess_env,
+    read_subprocess_output,
+)
+
+logger = logging.getLogger(__name__)
+
+# Runs under the venv's interpreter, reading one JSON list of pip arguments
+#   per line on stdin.  After each command the sentinel and pip's exit code are
+#   written to stdout, and the sentinel alone to stderr, so the parent knows
+#   where the output of each command ends on both streams.
+_PIP_WORKER_SCRIPT = textwrap.dedent(
+    """
+    import importlib
+    import json
+    import os
+    import sys
+    import traceback
+
+    sentinel = sys.argv[1]
+    commands = sys.stdin
+    # pip must never read the command stream, e.g. for a confirmation prompt
+    sys.stdin = open(os.devnull)
+
+    def done(status):
+        sys.stdout.flush()
+        sys.stderr.flush()
+        sys.stdout.write(sentinel + " " + status + "\\n")
+        sys.stdout.flush()
+        sys.stderr.write(sentinel + "\\n")
+        sys.stderr.flush()
+
+    try:
+        from pip._internal.cli.main import main as pip_main
+    except ImportError:
+        done("unsupported")
+        sys.exit(0)
+    done("ready")
+
+    for line in commands:
+        try:
+            returncode = pip_main(json.loads(line))
+        except SystemExit as e:
+            returncode = e.code if isinstance(e.code, int) else int(bool(e.code))
+        except BaseException:
+            traceback.print_exc()
+            returncode = 1
+
+        # forget what was on disk before this command, so the next one sees
+        #   the packages it installed or removed
+        importlib.invalidate_caches()
+        sys.path_importer_cache.clear()
+        try:
+            from pip._vendor import pkg_resources
+
+            pkg_resources._initialize_master_working_set()
+        except Exception:
+            pass
+
+        done(str(returncode))
+    """
+)
+
+# Requirement or argument naming pip itself.  After pip has been changed the
+#   worker still has the old pip imported, so it must be restarted.
+_PIP_SELF_RE = re.compile(r"^pip($|[^A-Za-z0-9_.-])", re.IGNORECASE)
+
+_running_workers: "weakref.WeakSet[PipWorker]" = weakref.WeakSet()
+
+
+class PipWorkerError(Exception):
+    """The worker can not be used, pip should be run as a plain subprocess"""
+
+
+class PipWorker:
+    """Long-lived pip process for the venv with interpreter python_path"""
+
+    def __init__(self, python_path: Path) -> None:
+        self.python_path = python_path
+        self._sentinel = f"__pipx_pip_worker_{uuid.uuid4().hex}__"
+        self._process: Optional[subprocess.Popen] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def _start(self) -> None:
+        logger.info(f"starting pip worker for {self.python_path}")
+        with trace.span("pip_worker_start", python=str(self.python_path)):
+            self._process = subprocess.Popen(
+                [str(self.python_path), "-c", _PIP_WORKER_SCRIPT, self._sentinel],
+                env=fix_subprocess_env(dict(os.environ)),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                encoding="utf-8",
+                errors="replace",
+                universal_newlines=True,
+            )
+            _running_workers.add(self)
+            status = self._read_until_sentinel(OutputTail(None), OutputTail(None))
+        if status != "ready":
+            self.close()
+            raise PipWorkerError(
+                f"pip worker for {self.python_path} did not start: {status}"
+            )
+
+    def _read_until_sentinel(
+        self, stdout_tail: OutputTail, stderr_tail: OutputTail
+    ) -> Optional[str]:
+        assert self._process is not None
+        stderr_reader = threading.Thread(
+            target=read_subprocess_output,
+            args=(self._process.stderr, "stderr", stderr_tail, self._sentinel),
+        )
+        stderr_reader.daemon = True
+        stderr_reader.start()
+        status = read_subprocess_output(
+            self._process.stdout, "stdout", stdout_tail, self._sentinel  # type: ignore
+        )
+        stderr_reader.join()
+        return status
+
+    def run(self, args: List[str]) -> subprocess.CompletedProcess:
+        """Run `pip ARGS` in the worker, starting it if needed"""
+        if not self.is_running:
+            self._start()
+        assert self._process is not None and self._process.stdin is not None
+
+        cmd = [str(self.python_path), "-m", "pip"] + args
+        logger.info(f"running (pip worker) {' '.join(cmd)}")
+        stdout_tail = OutputTail(SUBPROCESS_OUTPUT_TAIL_LINES)
+        stderr_tail = OutputTail(SUBPROCESS_OUTPUT_TAIL_LINES)
+        with trace.span("pip_worker", argv=" ".join(cmd)) as span_args:
+            try:
+                self._process.stdin.write(json.dumps(args) + "\n")
+                self._process.stdin.flush()
+                status = self._read_until_sentinel(stdout_tail, stderr_tail)
+            except BaseException:
+                self.close()
+                raise
+            span_args["status"] = status
+
+        if status is None or not status.lstrip("-").isdigit():
+            # the worker died in the middle of the command
+            self.close()
+            returncode = 1
+        else:
+            returncode = int(status)
+        logger.debug(f"returncode: {returncode}")
+
+        if any(_PIP_SELF_RE.match(arg) for arg in args):
+            self.close()
+
+        return subprocess.CompletedProcess(
+            cmd, returncode, stdout_tail.text(), stderr_tail.text()
+        )
+
+    def close(self) -> None:
+        if self._process is None:
+            return
+        process = self._process
+        self._process = None
+        _running_workers.discard(self)
+        try:
+            if process.stdin is not None:
+                process.stdin.close()
+            process.wait(timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+            process.wait()
+        for stream in (process.stdout, process.stderr):
+            if stream is not None:
+                stream.close()
+
+
+@atexit.register
+def close_all_pip_workers() -> None:
+    for worker in list(_running_workers):
+        worker.close()
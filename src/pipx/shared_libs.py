@@ -1,16 +1,20 @@
 import datetime
 import logging
+import sys
+import threading
 import time
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
-from pipx import constants
+from pipx import constants, metrics, trace, wheelhouse
 from pipx.animate import animate
 from pipx.constants import WINDOWS
 from pipx.interpreter import DEFAULT_PYTHON
 from pipx.util import (
     get_site_packages,
     get_venv_paths,
+    parse_major_minor,
+    read_pyvenv_cfg,
     run_subprocess,
     subprocess_post_check,
 )
@@ -19,17 +23,67 @@ logger = logging.getLogger(__name__)
 
 
 SHARED_LIBS_MAX_AGE_SEC = datetime.timedelta(days=30).total_seconds()
+SHARED_LIBS_PACKAGES = ["pip", "setuptools", "wheel"]
+
+_ENSUREPIP_BUNDLED_DIR_SCRIPT = (
+    "import ensurepip, os; "
+    "print(os.path.join(os.path.dirname(ensurepip.__file__), '_bundled'))"
+)
+
+_python_versions: Dict[str, Optional[Tuple[int, int]]] = {}
+
+
+def get_python_major_minor(python: str) -> Optional[Tuple[int, int]]:
+    """(major, minor) version of the interpreter python, or None if it cannot
+    be run
+    """
+    if python not in _python_versions:
+        if python == sys.executable:
+            version: Optional[Tuple[int, int]] = (
+                sys.version_info.major,
+                sys.version_info.minor,
+            )
+        else:
+            process = run_subprocess(
+                [python, "-c", "import platform; print(platform.python_version())"],
+                capture_stderr=False,
+                output_tail_lines=None,
+            )
+            version = None if process.returncode else parse_major_minor(process.stdout)
+        _python_versions[python] = version
+    return _python_versions[python]
 
 
 class _SharedLibs:
-    def __init__(self) -> None:
-        self.root = constants.PIPX_SHARED_LIBS
+    def __init__(
+        self, root: Optional[Path] = None, python: str = DEFAULT_PYTHON
+    ) -> None:
+        """Shared libraries in root, created with python when needed.  By
+        default those of the default Python, in $PIPX_HOME/shared.
+        """
+        self.root = root if root is not None else constants.PIPX_SHARED_LIBS
+        self.python = python
         self.bin_path, self.python_path = get_venv_paths(self.root)
         self.pip_path = self.bin_path / ("pip" if not WINDOWS else "pip.exe")
         # i.e. bin_path is ~/.local/pipx/shared/bin
         # i.e. python_path is ~/.local/pipx/shared/python
         self._site_packages: Optional[Path] = None
+        self._python_version: Optional[Tuple[int, int]] = None
         self.has_been_updated_this_run = False
+        # Venvs created or opened in several threads at once (e.g. installing
+        #   several packages) must not create or upgrade these concurrently
+        self._lock = threading.RLock()
+
+    @property
+    def python_version(self) -> Optional[Tuple[int, int]]:
+        """(major, minor) version of Python these shared libraries are for"""
+        if self._python_version is None:
+            cfg = read_pyvenv_cfg(self.root)
+            version = parse_major_minor(cfg.get("version_info", cfg.get("version")))
+            if version is None:
+                version = get_python_major_minor(self.python)
+            self._python_version = version
+        return self._python_version
 
     @property
     def site_packages(self) -> Path:
@@ -39,16 +93,23 @@ class _SharedLibs:
         return self._site_packages
 
     def create(self, verbose: bool = False) -> None:
-        if not self.is_valid:
-            with animate("creating shared libraries", not verbose):
+        with self._lock:
+            if self.is_valid:
+                return
+            with trace.span("create_shared_libs"), animate(
+                "creating shared libraries", not verbose
+            ):
+                # venv installs pip (and setuptools) from the wheels bundled
+                #   with Python for ensurepip, without network access
                 create_process = run_subprocess(
-                    [DEFAULT_PYTHON, "-m", "venv", "--clear", self.root]
+                    [self.python, "-m", "venv", "--clear", self.root]
                 )
             subprocess_post_check(create_process)
+            self._site_packages = None
 
-            # ignore installed packages to ensure no unexpected patches from the OS vendor
-            # are used
-            self.upgrade(pip_args=["--force-reinstall"], verbose=verbose)
+            # newer wheels of pip, setuptools and wheel from the wheelhouse,
+            #   if any. The package index is only used by 'pipx upgrade-shared'
+            self.upgrade(verbose=verbose)
 
     @property
     def is_valid(self) -> bool:
@@ -70,8 +131,61 @@ class _SharedLibs:
         )
         return time_since_last_update_sec > SHARED_LIBS_MAX_AGE_SEC
 
+    def _get_local_wheel_dirs(self) -> List[Path]:
+        """Directories of wheels available without network access: those
+        bundled with Python for ensurepip, and the wheelhouse
+        """
+        wheel_dirs = []
+        process = run_subprocess(
+            [self.python_path, "-c", _ENSUREPIP_BUNDLED_DIR_SCRIPT],
+            capture_stderr=False,
+            output_tail_lines=None,
+        )
+        if not process.returncode:
+            wheel_dirs.append(Path(process.stdout.strip()))
+        if constants.PIPX_WHEELHOUSE_DIR.is_dir():
+            wheel_dirs.append(constants.PIPX_WHEELHOUSE_DIR)
+        return wheel_dirs
+
+    def _get_upgrade_source_args(self, from_index: bool) -> Optional[List[str]]:
+        """pip arguments selecting where to upgrade the shared libraries from,
+        and which of them, or None if nothing can be upgraded
+        """
+        if from_index:
+            return wheelhouse.get_pip_args() + ["--upgrade"] + SHARED_LIBS_PACKAGES
+
+        wheel_dirs = self._get_local_wheel_dirs()
+        packages = [
+            package
+            for package in SHARED_LIBS_PACKAGES
+            if any(
+                next(wheel_dir.glob(f"{package}-*.whl"), None)
+                for wheel_dir in wheel_dirs
+            )
+        ]
+        if not packages:
+            return None
+        source_args = ["--no-index"]
+        for wheel_dir in wheel_dirs:
+            source_args += ["--find-links", str(wheel_dir)]
+        return source_args + ["--upgrade"] + packages
+
     def upgrade(
-        self, *, pip_args: Optional[List[str]] = None, verbose: bool = False
+        self,
+        *,
+        pip_args: Optional[List[str]] = None,
+        verbose: bool = False,
+        from_index: bool = False,
+    ) -> None:
+        """Upgrade pip, setuptools and wheel to the newest wheels available
+        locally, or from the package index (or wheelhouse, according to the
+        wheelhouse mode) if from_index
+        """
+        with self._lock:
+            self._upgrade(pip_args, verbose, from_index)
+
+    def _upgrade(
+        self, pip_args: Optional[List[str]], verbose: bool, from_index: bool
     ) -> None:
         # Don't try to upgrade multiple times per run
         if self.has_been_updated_this_run:
@@ -81,31 +195,37 @@ class _SharedLibs:
         if pip_args is None:
             pip_args = []
 
-        logger.info(f"Upgrading shared libraries in {self.root}")
+        logger.info(
+            f"Upgrading shared libraries in {self.root} "
+            f"from {'the package index' if from_index else 'local wheels'}"
+        )
 
         ignored_args = ["--editable"]
         _pip_args = [arg for arg in pip_args if arg not in ignored_args]
         if not verbose:
             _pip_args.append("-q")
         try:
-            with animate("upgrading shared libraries", not verbose):
-                upgrade_process = run_subprocess(
-                    [
-                        self.python_path,
-                        "-m",
-                        "pip",
-                        "--disable-pip-version-check",
-                        "install",
-                        *_pip_args,
-                        "--upgrade",
-                        "pip",
-                        "setuptools",
-                        "wheel",
-                    ]
-                )
-            subprocess_post_check(upgrade_process)
+            with trace.span("upgrade_shared_libs"), animate(
+                "upgrading shared libraries", not verbose
+            ):
+                source_args = self._get_upgrade_source_args(from_index)
+                if source_args is not None:
+                    upgrade_process = run_subprocess(
+                        [
+                            self.python_path,
+                            "-m",
+                            "pip",
+                            "--disable-pip-version-check",
+                            "install",
+                            *_pip_args,
+                            *source_args,
+                        ]
+                    )
+                    subprocess_post_check(upgrade_process)
 
-            self.has_been_updated_this_run = True
+            if from_index:
+                self.has_been_updated_this_run = True
+            metrics.count("pipx_shared_libs_upgrades_total")
             self.pip_path.touch()
 
         except Exception:
@@ -113,3 +233,49 @@ class _SharedLibs:
 
 
 shared_libs = _SharedLibs()
+
+# shared libraries of Python versions other than the default's, by version
+_pools: Dict[Tuple[int, int], _SharedLibs] = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool_root(python_version: Tuple[int, int]) -> Path:
+    return Path(f"{constants.PIPX_SHARED_LIBS}-{python_version[0]}.{python_version[1]}")
+
+
+def get_shared_libs(
+    python_version: Optional[Tuple[int, int]], python: str
+) -> _SharedLibs:
+    """The shared libraries for venvs of Python python_version, created with
+    python when needed.  Those in $PIPX_HOME/shared for the version of the
+    default Python, or if python_version is unknown, else those in
+    $PIPX_HOME/shared-MAJOR.MINOR.
+    """
+    if python_version is None or python_version == shared_libs.python_version:
+        return shared_libs
+    with _pools_lock:
+        if python_version not in _pools:
+            _pools[python_version] = _SharedLibs(_get_pool_root(python_version), python)
+        return _pools[python_version]
+
+
+def get_shared_libs_for_python(python: str) -> _SharedLibs:
+    """The shared libraries for venvs created with python"""
+    if python == shared_libs.python:
+        return shared_libs
+    return get_shared_libs(get_python_major_minor(python), python)
+
+
+def iter_shared_libs() -> Iterator[_SharedLibs]:
+    """The shared libraries of all Python versions that have been created"""
+    if shared_libs.is_valid:
+        yield shared_libs
+    pool_prefix = f"{constants.PIPX_SHARED_LIBS.name}-"
+    for root in sorted(constants.PIPX_SHARED_LIBS.parent.glob(f"{pool_prefix}*")):
+        python_version = parse_major_minor(root.name[len(pool_prefix) :])
+        if python_version is None or _get_pool_root(python_version) != root:
+            continue
+        _, python_path = get_venv_paths(root)
+        pool = get_shared_libs(python_version, str(python_path))
+        if pool is not shared_libs and pool.is_valid:
+            yield pool
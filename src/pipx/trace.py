@@ -0,0 +1,106 @@
+"""Optional tracing of where a pipx command spends its time.
+
+Enabled with `--trace FILE` or the PIPX_TRACE environment variable.  Spans are
+written to FILE in the Chrome trace event format, which can be opened with
+chrome://tracing or https://ui.perfetto.dev.  When tracing is not enabled,
+span() does nothing but yield.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Generator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+_trace_file: Optional[Path] = None
+_events: List[Dict[str, Any]] = []
+_events_lock = threading.Lock()
+
+
+def enable_tracing(trace_file: Path) -> None:
+    global _trace_file
+    _trace_file = trace_file
+    _events.clear()
+    _events.append(
+        {
+            "name": "process_name",
+            "ph": "M",
+            "pid": os.getpid(),
+            "args": {"name": "pipx"},
+        }
+    )
+
+
+def is_tracing() -> bool:
+    return _trace_file is not None
+
+
+@contextmanager
+def span(name: str, **args: Any) -> Generator[Dict[str, Any], None, None]:
+    """Record the time spent in the with block as a span named name.
+
+    Yields the dict of span arguments, to which the block can add results
+    such as exit codes.
+    """
+    if _trace_file is None:
+        yield args
+        return
+
+    start = time.perf_counter()
+    try:
+        yield args
+    finally:
+        end = time.perf_counter()
+        event = {
+            "name": name,
+            "cat": "pipx",
+            "ph": "X",
+            "ts": start * 1e6,
+            "dur": (end - start) * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": args,
+        }
+        with _events_lock:
+            _events.append(event)
+
+
+def get_child_rusage() -> Dict[str, float]:
+    """CPU time used by terminated child processes so far, where available"""
+    if resource is None:
+        return {}
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return {"child_utime_s": usage.ru_utime, "child_stime_s": usage.ru_stime}
+
+
+def get_child_rusage_since(before: Dict[str, float]) -> Dict[str, float]:
+    after = get_child_rusage()
+    return {key: after[key] - before.get(key, 0.0) for key in after}
+
+
+def write_trace() -> None:
+    """Write all spans recorded so far to the trace file"""
+    if _trace_file is None:
+        return
+    with _events_lock:
+        events = list(_events)
+    try:
+        _trace_file.parent.mkdir(parents=True, exist_ok=True)
+        with _trace_file.open("w", encoding="utf-8") as trace_fh:
+            json.dump(
+                {"traceEvents": events, "displayTimeUnit": "ms"}, trace_fh, default=str,
+            )
+    except OSError as e:
+        logger.warning(f"Unable to write trace file {_trace_file}: {e}")
+    else:
+        logger.info(f"Wrote trace to {_trace_file}")
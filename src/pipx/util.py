@@ -1,17 +1,39 @@
 import logging
 import os
+import re
 import shutil
 import subprocess
 import sys
 import textwrap
+import threading
+import uuid
+from collections import deque
 from pathlib import Path
-from typing import Dict, List, NoReturn, Optional, Sequence, Tuple, Union
-
+from typing import (
+    IO,
+    Any,
+    Deque,
+    Dict,
+    List,
+    NoReturn,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from pipx import constants, metrics, trace
 from pipx.animate import show_cursor
 from pipx.constants import WINDOWS
 
 logger = logging.getLogger(__name__)
 
+PYVENV_CFG_FILENAME = "pyvenv.cfg"
+
+# Lines of subprocess output kept in memory by run_subprocess, for
+#   subprocess_post_check to show on failure.  All output goes to the log file.
+SUBPROCESS_OUTPUT_TAIL_LINES = 200
+
 
 class PipxError(Exception):
     def __init__(self, message: str, wrap_message: bool = True):
@@ -21,8 +43,54 @@ class PipxError(Exception):
             super().__init__(message)
 
 
-def rmdir(path: Path) -> None:
-    logger.info(f"removing directory {path}")
+# Run by a detached interpreter so that it neither depends on pipx being
+#   importable nor delays the pipx command that trashed the directories.
+#   Files are unlinked by a pool of threads, which is much faster than a
+#   single-threaded rmtree for trees with tens of thousands of files.
+_EMPTY_TRASH_SCRIPT = textwrap.dedent(
+    """
+    import os
+    import shutil
+    import sys
+    from concurrent.futures import ThreadPoolExecutor
+
+    def unlink_all(dirpath, names):
+        for name in names:
+            try:
+                os.unlink(os.path.join(dirpath, name))
+            except OSError:
+                pass
+
+    trash_dir = sys.argv[1]
+    # loop, because more directories may be trashed while this runs
+    while True:
+        try:
+            entries = os.listdir(trash_dir)
+        except OSError:
+            break
+        if not entries:
+            break
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for entry in entries:
+                for dirpath, dirnames, filenames in os.walk(
+                    os.path.join(trash_dir, entry)
+                ):
+                    executor.submit(unlink_all, dirpath, filenames)
+                    # os.walk lists symlinks to directories without following
+                    executor.submit(
+                        unlink_all,
+                        dirpath,
+                        [d for d in dirnames if os.path.islink(os.path.join(dirpath, d))],
+                    )
+        for entry in entries:
+            shutil.rmtree(os.path.join(trash_dir, entry), ignore_errors=True)
+    """
+)
+
+_trash_emptier: Optional[subprocess.Popen] = None
+
+
+def _rmtree(path: Path) -> None:
     try:
         if WINDOWS:
             os.system(f'rmdir /S /Q "{str(path)}"')
@@ -32,6 +100,72 @@ def rmdir(path: Path) -> None:
         pass
 
 
+def rmdir(path: Path) -> None:
+    """Remove directory path.
+
+    The directory is renamed into pipx's trash directory, which is instant on
+    the same filesystem, and then deleted by a detached background process.
+    Falls back to deleting it in place if it cannot be moved.
+    """
+    logger.info(f"removing directory {path}")
+    if not path.exists():
+        return
+
+    trash_dir = constants.PIPX_TRASH_DIR
+    if trash_dir not in path.parents:
+        try:
+            trash_dir.mkdir(parents=True, exist_ok=True)
+            path.rename(trash_dir / f"{path.name}-{uuid.uuid4().hex}")
+        except OSError as e:
+            # e.g. path is on a different filesystem than PIPX_HOME
+            logger.info(f"Unable to move {path} to trash ({e}), deleting in place")
+        else:
+            empty_trash_in_background()
+            return
+    _rmtree(path)
+
+
+def empty_trash_in_background() -> None:
+    """Start a detached process that deletes everything in pipx's trash
+    directory, unless one started by this pipx run is still at work
+    """
+    global _trash_emptier
+    if _trash_emptier is not None and _trash_emptier.poll() is None:
+        return
+    trash_dir = constants.PIPX_TRASH_DIR
+    try:
+        if not next(trash_dir.iterdir(), None):
+            return
+    except OSError:
+        return
+    _trash_emptier = spawn_detached(
+        [sys.executable, "-c", _EMPTY_TRASH_SCRIPT, str(trash_dir)]
+    )
+
+
+def spawn_detached(cmd: Sequence[Union[str, Path]]) -> subprocess.Popen:
+    """Start cmd in the background, detached from pipx and its terminal, and do
+    not wait for it
+    """
+    logger.info(f"spawning detached {' '.join(str(c) for c in cmd)}")
+    kwargs: Dict[str, Any] = {}
+    if WINDOWS:
+        kwargs["creationflags"] = (
+            subprocess.DETACHED_PROCESS  # type: ignore[attr-defined]
+            | subprocess.CREATE_NEW_PROCESS_GROUP  # type: ignore[attr-defined]
+        )
+    else:
+        kwargs["start_new_session"] = True
+    return subprocess.Popen(
+        [str(c) for c in cmd],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        close_fds=True,
+        **kwargs,
+    )
+
+
 def mkdir(path: Path) -> None:
     if path.is_dir():
         return
@@ -77,17 +211,41 @@ else:
         return bin_path, python_path
 
 
+def read_pyvenv_cfg(venv_dir: Path) -> Dict[str, str]:
+    cfg: Dict[str, str] = {}
+    try:
+        cfg_text = (venv_dir / PYVENV_CFG_FILENAME).read_text(encoding="utf-8")
+    except OSError:
+        return cfg
+    for line in cfg_text.splitlines():
+        key, sep, value = line.partition("=")
+        if sep:
+            cfg[key.strip().lower()] = value.strip()
+    return cfg
+
+
+def parse_major_minor(version: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Return (major, minor) from strings like '3.8.5' or 'Python 3.8.5'"""
+    if version is None:
+        return None
+    match = re.search(r"(\d+)\.(\d+)", version)
+    if match is None:
+        return None
+    return (int(match.group(1)), int(match.group(2)))
+
+
 def get_site_packages(python: Path) -> Path:
     output = run_subprocess(
         [python, "-c", "import sysconfig; print(sysconfig.get_path('purelib'))"],
         capture_stderr=False,
+        output_tail_lines=None,
     ).stdout
     path = Path(output.strip())
     path.mkdir(parents=True, exist_ok=True)
     return path
 
 
-def _fix_subprocess_env(env: Dict[str, str]) -> Dict[str, str]:
+def fix_subprocess_env(env: Dict[str, str]) -> Dict[str, str]:
     # Remove PYTHONPATH because some platforms (macOS with Homebrew) add pipx
     #   directories to it, and can make it appear to venvs as though pipx
     #   dependencies are in the venv path (#233)
@@ -105,37 +263,117 @@ def _fix_subprocess_env(env: Dict[str, str]) -> Dict[str, str]:
     return env
 
 
+class OutputTail:
+    """The last lines of a subprocess output stream"""
+
+    def __init__(self, max_lines: Optional[int]) -> None:
+        self.lines: Deque[str] = deque(maxlen=max_lines)
+        self.dropped = 0
+
+    def append(self, line: str) -> None:
+        if self.lines.maxlen is not None and len(self.lines) == self.lines.maxlen:
+            self.dropped += 1
+        self.lines.append(line)
+
+    def text(self) -> str:
+        output = "".join(self.lines)
+        if self.dropped:
+            output = (
+                f"[... {self.dropped} earlier lines omitted, see log file ...]\n"
+                + output
+            )
+        return output
+
+
+def read_subprocess_output(
+    stream: IO[str], name: str, tail: OutputTail, sentinel: Optional[str] = None
+) -> Optional[str]:
+    """Log each line of stream as it arrives, and keep the last lines in tail.
+
+    Reads until EOF and returns None, or if sentinel is given, until sentinel
+    is read and returns the rest of its line.
+    """
+    for line in stream:
+        if sentinel is not None and sentinel in line:
+            (line, _, status) = line.partition(sentinel)
+            if line:
+                logger.debug("%s: %s", name, line.rstrip())
+                tail.append(line)
+            return status.strip()
+        logger.debug("%s: %s", name, line.rstrip())
+        tail.append(line)
+    return None
+
+
 def run_subprocess(
     cmd: Sequence[Union[str, Path]],
     capture_stdout: bool = True,
     capture_stderr: bool = True,
     log_cmd_str: Optional[str] = None,
+    output_tail_lines: Optional[int] = SUBPROCESS_OUTPUT_TAIL_LINES,
 ) -> subprocess.CompletedProcess:
-    """Run arbitrary command as subprocess, capturing stderr and stout"""
+    """Run arbitrary command as subprocess, capturing stderr and stout
+
+    Captured output is logged line by line as it is produced.  Only the last
+    output_tail_lines lines of each stream are returned, or all of the output
+    if output_tail_lines is None, which callers parsing output should use.
+    """
     env = dict(os.environ)
-    env = _fix_subprocess_env(env)
+    env = fix_subprocess_env(env)
 
     if log_cmd_str is None:
         log_cmd_str = " ".join(str(c) for c in cmd)
     logger.info(f"running {log_cmd_str}")
     # windows cannot take Path objects, only strings
     cmd_str_list = [str(c) for c in cmd]
-    completed_process = subprocess.run(
-        cmd_str_list,
-        env=env,
-        stdout=subprocess.PIPE if capture_stdout else None,
-        stderr=subprocess.PIPE if capture_stderr else None,
-        encoding="utf-8",
-        universal_newlines=True,
-    )
-
-    if capture_stdout:
-        logger.debug(f"stdout: {completed_process.stdout}".rstrip())
-    if capture_stderr:
-        logger.debug(f"stderr: {completed_process.stderr}".rstrip())
-    logger.debug(f"returncode: {completed_process.returncode}")
+    with trace.span("run_subprocess", argv=log_cmd_str) as span_args:
+        rusage_before = trace.get_child_rusage()
+        process = subprocess.Popen(
+            cmd_str_list,
+            env=env,
+            stdout=subprocess.PIPE if capture_stdout else None,
+            stderr=subprocess.PIPE if capture_stderr else None,
+            encoding="utf-8",
+            errors="replace",
+            universal_newlines=True,
+        )
 
-    return completed_process
+        # Read both pipes concurrently, or the process blocks once the pipe we
+        #   are not reading fills up
+        readers = []
+        outputs: Dict[str, OutputTail] = {}
+        for (name, stream) in (
+            ("stdout", process.stdout),
+            ("stderr", process.stderr),
+        ):
+            if stream is None:
+                continue
+            outputs[name] = OutputTail(output_tail_lines)
+            reader = threading.Thread(
+                target=read_subprocess_output, args=(stream, name, outputs[name])
+            )
+            reader.daemon = True
+            reader.start()
+            readers.append(reader)
+        try:
+            for reader in readers:
+                reader.join()
+            returncode = process.wait()
+        except BaseException:
+            process.kill()
+            process.wait()
+            raise
+        for stream in (process.stdout, process.stderr):
+            if stream is not None:
+                stream.close()
+        span_args["returncode"] = returncode
+        span_args.update(trace.get_child_rusage_since(rusage_before))
+
+    stdout = outputs["stdout"].text() if capture_stdout else None
+    stderr = outputs["stderr"].text() if capture_stderr else None
+    logger.debug(f"returncode: {returncode}")
+
+    return subprocess.CompletedProcess(cmd_str_list, returncode, stdout, stderr)
 
 
 def subprocess_post_check(
@@ -165,12 +403,17 @@ def exec_app(
 
     if env is None:
         env = dict(os.environ)
-    env = _fix_subprocess_env(env)
+    env = fix_subprocess_env(env)
 
     # make sure we show cursor again before handing over control
     show_cursor()
+    # nothing after this point runs in pipx
+    metrics.finish_command(0)
+    trace.write_trace()
 
     logger.info("exec_app: " + " ".join([str(c) for c in cmd]))
+    # write out the log file, exec does not run atexit handlers
+    logging.shutdown()
 
     if WINDOWS:
         sys.exit(
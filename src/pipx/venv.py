@@ -3,12 +3,14 @@ import logging
 import time
 from pathlib import Path
 from subprocess import CompletedProcess
-from typing import Dict, Generator, List, NoReturn, Set
+from typing import Dict, Generator, List, NoReturn, Optional, Set
 
 from packaging.utils import canonicalize_name
 
+import pipx.shared_libs  # import instead of from so mockable in tests
+from pipx import constants, dedup_store, trace, wheelhouse
 from pipx.animate import animate
-from pipx.constants import PIPX_SHARED_PTH, ExitCode
+from pipx.constants import PIPX_SHARED_DETACHED, PIPX_SHARED_PTH, ExitCode
 from pipx.emojies import hazard
 from pipx.interpreter import DEFAULT_PYTHON
 from pipx.package_specifier import (
@@ -17,15 +19,17 @@ from pipx.package_specifier import (
     parse_specifier_for_install,
     parse_specifier_for_metadata,
 )
+from pipx.pip_worker import PipWorker, PipWorkerError
 from pipx.pipx_metadata_file import PackageInfo, PipxMetadata
-from pipx.shared_libs import shared_libs
 from pipx.util import (
     PipxError,
     exec_app,
     full_package_description,
     get_site_packages,
     get_venv_paths,
+    parse_major_minor,
     pipx_wrap,
+    read_pyvenv_cfg,
     rmdir,
     run_subprocess,
     subprocess_post_check,
@@ -61,46 +65,94 @@ class VenvContainer:
         return self._root.joinpath(canonicalize_name(package))
 
     def verify_shared_libs(self) -> None:
+        """Create or upgrade the shared libs of each Python version used by
+        venvs in this container.  Done once here, so that venvs can then be
+        opened read-only (e.g. by `pipx list` worker processes).
+        """
+        verified: Set[Path] = set()
         for p in self.iter_venv_dirs():
-            Venv(p)
+            venv = Venv(p, read_only=True)
+            if venv.shared_libs.root not in verified and venv.uses_shared_libs:
+                venv.verify_shared_libs()
+                verified.add(venv.shared_libs.root)
 
 
 class Venv:
     """Abstraction for a virtual environment with various useful methods for pipx"""
 
     def __init__(
-        self, path: Path, *, verbose: bool = False, python: str = DEFAULT_PYTHON
+        self,
+        path: Path,
+        *,
+        verbose: bool = False,
+        python: str = DEFAULT_PYTHON,
+        read_only: bool = False,
     ) -> None:
+        """Opening an existing venv creates or upgrades the shared libs it
+        uses, unless read_only is True.  A read_only Venv can be inspected but
+        refuses to change the venv or the shared libs.
+        """
         self.root = path
         self.python = python
         self.bin_path, self.python_path = get_venv_paths(self.root)
-        self.pipx_metadata = PipxMetadata(venv_dir=path)
         self.verbose = verbose
         self.do_animation = not verbose
+        self.read_only = read_only
+        self._pipx_metadata: Optional[PipxMetadata] = None
+        self._shared_libs_detached: Optional[bool] = None
+        self._shared_libs: Optional[pipx.shared_libs._SharedLibs] = None
+        self._pip_worker: Optional[PipWorker] = None
+        self._pip_worker_failed = False
         try:
             self._existing = self.root.exists() and next(self.root.iterdir())
         except StopIteration:
             self._existing = False
 
-        if self._existing and self.uses_shared_libs:
-            if shared_libs.is_valid:
-                if shared_libs.needs_upgrade:
-                    shared_libs.upgrade(verbose=verbose)
-            else:
-                shared_libs.create(verbose)
-
-            if not shared_libs.is_valid:
-                raise PipxError(
-                    pipx_wrap(
-                        f"""
-                        Error: pipx's shared venv {shared_libs.root} is invalid
-                        and needs re-installation. To fix this, install or
-                        reinstall a package. For example:
-                        """
-                    )
-                    + f"\n  pipx install {self.root.name} --force",
-                    wrap_message=False,
+        if not read_only and self._existing and self.uses_shared_libs:
+            self.verify_shared_libs()
+
+    @property
+    def shared_libs(self) -> "pipx.shared_libs._SharedLibs":
+        """The shared libs for the Python version of this venv"""
+        if self._shared_libs is None:
+            cfg = read_pyvenv_cfg(self.root)
+            self._shared_libs = pipx.shared_libs.get_shared_libs(
+                parse_major_minor(cfg.get("version_info", cfg.get("version"))),
+                str(self.python_path.resolve()),
+            )
+        return self._shared_libs
+
+    def verify_shared_libs(self) -> None:
+        """Create or upgrade the shared libs as needed"""
+        shared_libs = self.shared_libs
+        if shared_libs.is_valid:
+            if shared_libs.needs_upgrade:
+                shared_libs.upgrade(verbose=self.verbose)
+        else:
+            shared_libs.create(self.verbose)
+
+        if not shared_libs.is_valid:
+            raise PipxError(
+                pipx_wrap(
+                    f"""
+                    Error: pipx's shared venv {shared_libs.root} is invalid
+                    and needs re-installation. To fix this, install or
+                    reinstall a package. For example:
+                    """
                 )
+                + f"\n  pipx install {self.root.name} --force",
+                wrap_message=False,
+            )
+
+    def _check_writable(self) -> None:
+        if self.read_only:
+            raise PipxError(f"venv {self.root} was opened read-only")
+
+    @property
+    def pipx_metadata(self) -> PipxMetadata:
+        if self._pipx_metadata is None:
+            self._pipx_metadata = PipxMetadata(venv_dir=self.root)
+        return self._pipx_metadata
 
     @property
     def name(self) -> str:
@@ -117,11 +169,19 @@ class Venv:
     def uses_shared_libs(self) -> bool:
         if self._existing:
             pth_files = self.root.glob("**/" + PIPX_SHARED_PTH)
-            return next(pth_files, None) is not None
+            return next(pth_files, None) is not None or self.shared_libs_detached
         else:
             # always use shared libs when creating a new venv
             return True
 
+    @property
+    def shared_libs_detached(self) -> bool:
+        """True if the shared libs are only on sys.path when pipx runs pip"""
+        if self._shared_libs_detached is None:
+            detached_files = self.root.glob("**/" + PIPX_SHARED_DETACHED)
+            self._shared_libs_detached = next(detached_files, None) is not None
+        return self._shared_libs_detached
+
     @property
     def package_metadata(self) -> Dict[str, PackageInfo]:
         return_dict = self.pipx_metadata.injected_packages.copy()
@@ -141,13 +201,27 @@ class Venv:
             return self.pipx_metadata.main_package.package
 
     def create_venv(self, venv_args: List[str], pip_args: List[str]) -> None:
-        with animate("creating virtual environment", self.do_animation):
+        self._check_writable()
+        with trace.span("create_venv", venv=str(self.root)), animate(
+            "creating virtual environment", self.do_animation
+        ):
             cmd = [self.python, "-m", "venv", "--without-pip"]
             venv_process = run_subprocess(cmd + venv_args + [str(self.root)])
         subprocess_post_check(venv_process)
 
-        shared_libs.create(self.verbose)
-        pipx_pth = get_site_packages(self.python_path) / PIPX_SHARED_PTH
+        # the shared libs of the Python version of the new venv
+        self._shared_libs = None
+        self.shared_libs.create(self.verbose)
+        self.write_shared_libs_pth()
+
+        self.pipx_metadata.venv_args = venv_args
+        self.pipx_metadata.python_version = self.get_python_version()
+
+    def write_shared_libs_pth(self) -> None:
+        self._check_writable()
+        site_packages = get_site_packages(self.python_path)
+        detached = constants.PIPX_DETACH_SHARED_LIBS
+        pipx_pth = site_packages / PIPX_SHARED_PTH
         # write path pointing to the shared libs site-packages directory
         # example pipx_pth location:
         #   ~/.local/pipx/venvs/black/lib/python3.8/site-packages/pipx_shared.pth
@@ -157,16 +231,30 @@ class Venv:
         # https://docs.python.org/3/library/site.html
         # A path configuration file is a file whose name has the form 'name.pth'.
         # its contents are additional items (one per line) to be added to sys.path
-        pipx_pth.write_text(f"{shared_libs.site_packages}\n", encoding="utf-8")
-
-        self.pipx_metadata.venv_args = venv_args
-        self.pipx_metadata.python_version = self.get_python_version()
+        #
+        # With detached shared libs the path is written to a file site does not
+        #   read instead, and apps start without pip/setuptools/wheel on
+        #   sys.path.  pipx then runs the shared pip against the venv, see
+        #   _pip_cmd.
+        if detached:
+            (site_packages / PIPX_SHARED_DETACHED).write_text(
+                f"{self.shared_libs.site_packages}\n", encoding="utf-8"
+            )
+            if pipx_pth.exists():
+                pipx_pth.unlink()
+        else:
+            pipx_pth.write_text(f"{self.shared_libs.site_packages}\n", encoding="utf-8")
+            if (site_packages / PIPX_SHARED_DETACHED).exists():
+                (site_packages / PIPX_SHARED_DETACHED).unlink()
+        self._shared_libs_detached = detached
 
     def safe_to_remove(self) -> bool:
         return not self._existing
 
     def remove_venv(self) -> None:
+        self._check_writable()
         if self.safe_to_remove():
+            self.close_pip_worker()
             rmdir(self.root)
         else:
             logger.warning(
@@ -180,8 +268,9 @@ class Venv:
             )
 
     def upgrade_packaging_libraries(self, pip_args: List[str]) -> None:
+        self._check_writable()
         if self.uses_shared_libs:
-            shared_libs.upgrade(verbose=self.verbose)
+            self.shared_libs.upgrade(verbose=self.verbose, from_index=True)
         else:
             # TODO: setuptools and wheel? Original code didn't bother
             # but shared libs code does.
@@ -276,9 +365,10 @@ class Venv:
         self, package: str, package_extras: Set[str]
     ) -> VenvMetadata:
         data_start = time.time()
-        venv_metadata = inspect_venv(
-            package, package_extras, self.bin_path, self.python_path
-        )
+        with trace.span("inspect_venv", venv=str(self.root), package=package):
+            venv_metadata = inspect_venv(
+                package, package_extras, self.bin_path, self.python_path
+            )
         logger.info(
             f"get_venv_metadata_for_package: {1e3*(time.time()-data_start):.0f}ms"
         )
@@ -318,11 +408,13 @@ class Venv:
         self.pipx_metadata.write()
 
     def get_python_version(self) -> str:
-        return run_subprocess([str(self.python_path), "--version"]).stdout.strip()
+        return run_subprocess(
+            [str(self.python_path), "--version"], output_tail_lines=None
+        ).stdout.strip()
 
     def list_installed_packages(self) -> Set[str]:
         cmd_run = run_subprocess(
-            [str(self.python_path), "-m", "pip", "list", "--format=json"]
+            self._pip_cmd() + ["list", "--format=json"], output_tail_lines=None
         )
         pip_list = json.loads(cmd_run.stdout.strip())
         return set([x["name"] for x in pip_list])
@@ -366,14 +458,81 @@ class Venv:
             suffix=suffix,
         )
 
-    def _run_pip(self, cmd: List[str]) -> CompletedProcess:
-        cmd = [str(self.python_path), "-m", "pip"] + cmd
+    def build_wheels(
+        self, package_specs: List[str], wheel_dir: Path, pip_args: List[str]
+    ) -> None:
+        """Build wheels of package_specs and their dependencies for this venv's
+        interpreter, and save them in wheel_dir.  Wheels already in the
+        wheelhouse are copied from it instead of being built again.
+        """
+        cmd = ["wheel", "--wheel-dir", str(wheel_dir)] + wheelhouse.get_pip_args()
+        if "--find-links" not in cmd and constants.PIPX_WHEELHOUSE_DIR.is_dir():
+            cmd += ["--find-links", str(constants.PIPX_WHEELHOUSE_DIR)]
+        cmd += pip_args + package_specs
         if not self.verbose:
             cmd.append("-q")
-        return run_subprocess(cmd)
+        with animate(f"building wheels for {self.name}", self.do_animation):
+            pip_process = run_subprocess(self._pip_cmd() + cmd)
+        subprocess_post_check(pip_process, raise_error=False)
+        if pip_process.returncode:
+            raise PipxError(f"Error building wheels for {self.name}.")
+
+    def _pip_cmd(self) -> List[str]:
+        if self.shared_libs_detached:
+            # Only pip itself is importable from the shared libs this way, so
+            #   packages in the shared libs (e.g. packaging, required by
+            #   wheel) cannot satisfy requirements of packages in the venv.
+            return [
+                str(self.shared_libs.python_path),
+                "-m",
+                "pip",
+                "--python",
+                str(self.python_path),
+            ]
+        return [str(self.python_path), "-m", "pip"]
+
+    def _get_pip_worker(self) -> Optional[PipWorker]:
+        # The worker imports pip from the venv's own sys.path, which does not
+        #   include the shared libs when they are detached
+        if (
+            not constants.PIPX_PIP_WORKER
+            or self._pip_worker_failed
+            or self.shared_libs_detached
+        ):
+            return None
+        if self._pip_worker is None:
+            self._pip_worker = PipWorker(self.python_path)
+        return self._pip_worker
+
+    def close_pip_worker(self) -> None:
+        if self._pip_worker is not None:
+            self._pip_worker.close()
+            self._pip_worker = None
+
+    def _run_pip(self, cmd: List[str]) -> CompletedProcess:
+        self._check_writable()
+        if cmd[0] == "install":
+            cmd = cmd[:1] + wheelhouse.get_pip_args() + cmd[1:]
+        if not self.verbose:
+            cmd = cmd + ["-q"]
+        pip_process = None
+        pip_worker = self._get_pip_worker()
+        if pip_worker is not None:
+            try:
+                pip_process = pip_worker.run(cmd)
+            except (PipWorkerError, OSError) as e:
+                logger.info(f"Not using pip worker: {e}")
+                self._pip_worker_failed = True
+                self.close_pip_worker()
+        if pip_process is None:
+            pip_process = run_subprocess(self._pip_cmd() + cmd)
+        if cmd[0] == "install" and constants.PIPX_DEDUP and not pip_process.returncode:
+            with trace.span("dedup_venv", venv=self.name):
+                dedup_store.dedup_venv(self.root)
+        return pip_process
 
     def run_pip_get_exit_code(self, cmd: List[str]) -> ExitCode:
-        cmd = [str(self.python_path), "-m", "pip"] + cmd
+        cmd = self._pip_cmd() + cmd
         if not self.verbose:
             cmd.append("-q")
         returncode = run_subprocess(
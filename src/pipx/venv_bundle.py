@@ -0,0 +1,284 @@
+"""Bundles of venvs, written by `pipx export` and read by `pipx import` and
+the artifact cache.
+
+A bundle is a tar archive, optionally compressed, whose first member,
+pipx-bundle.json, describes the venvs in it: where they were and the
+platform and Python they were built for.  The venvs follow, in venvs/NAME/.
+Readers check pipx-bundle.json before unpacking anything.
+"""
+
+import json
+import logging
+import posixpath
+import tarfile
+import time
+from contextlib import contextmanager
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Dict, Generator, List, Optional, Sequence, Tuple
+
+from pipx.util import PipxError, run_subprocess, subprocess_post_check
+from pipx.venv import Venv
+from pipx.version import __version__
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_SPEC_VERSION = "0.1"
+BUNDLE_INFO_NAME = "pipx-bundle.json"
+BUNDLE_VENVS_DIR = "venvs"
+# compression of bundles, by file name suffix
+BUNDLE_SUFFIXES = {
+    ".tar": "",
+    ".tar.gz": "gz",
+    ".tgz": "gz",
+    ".tar.xz": "xz",
+    ".tar.zst": "zst",
+    ".tzst": "zst",
+}
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# everything that decides whether compiled extensions of a venv can run with
+#   another interpreter
+_PYTHON_TAGS_SCRIPT = """
+import json, sys, sysconfig
+print(json.dumps({
+    "platform": sysconfig.get_platform(),
+    "implementation": sys.implementation.name,
+    "python_version": "%d.%d" % sys.version_info[:2],
+    "soabi": sysconfig.get_config_var("SOABI"),
+}))
+"""
+
+
+def get_python_tags(python: str) -> Dict[str, Optional[str]]:
+    process = run_subprocess(
+        [python, "-c", _PYTHON_TAGS_SCRIPT],
+        capture_stderr=False,
+        output_tail_lines=None,
+    )
+    subprocess_post_check(process)
+    return json.loads(process.stdout)
+
+
+def _get_compression(bundle_path: Path) -> str:
+    for (suffix, compression) in BUNDLE_SUFFIXES.items():
+        if bundle_path.name.endswith(suffix):
+            return compression
+    raise PipxError(
+        f"""
+        Unknown bundle type {bundle_path.name!r}. Bundle file names must end
+        with one of {', '.join(BUNDLE_SUFFIXES)}.
+        """
+    )
+
+
+def _import_zstandard() -> Any:
+    try:
+        import zstandard  # type: ignore
+    except ImportError:
+        raise PipxError(
+            "Bundles compressed with zstd require the zstandard package. "
+            "Install it alongside pipx, or use a .tar.gz or .tar.xz bundle."
+        )
+    return zstandard
+
+
+@contextmanager
+def open_bundle_for_writing(
+    bundle_path: Path,
+) -> Generator[tarfile.TarFile, None, None]:
+    compression = _get_compression(bundle_path)
+    with bundle_path.open("wb") as bundle_fh:
+        if compression == "zst":
+            zstandard = _import_zstandard()
+            compressor = zstandard.ZstdCompressor(threads=-1)
+            with compressor.stream_writer(
+                bundle_fh, closefd=False
+            ) as zst_fh, tarfile.open(fileobj=zst_fh, mode="w|") as tar:
+                yield tar
+        else:
+            with tarfile.open(fileobj=bundle_fh, mode=f"w|{compression}") as tar:
+                yield tar
+
+
+@contextmanager
+def open_bundle_for_reading(
+    bundle_path: Path,
+) -> Generator[tarfile.TarFile, None, None]:
+    try:
+        bundle_fh = bundle_path.open("rb")
+    except OSError as e:
+        raise PipxError(f"Unable to read bundle {bundle_path}: {e}")
+    with bundle_fh:
+        if bundle_fh.read(4) == _ZSTD_MAGIC:
+            bundle_fh.seek(0)
+            zstandard = _import_zstandard()
+            with zstandard.ZstdDecompressor().stream_reader(
+                bundle_fh
+            ) as zst_fh, tarfile.open(fileobj=zst_fh, mode="r|") as tar:
+                yield tar
+        else:
+            bundle_fh.seek(0)
+            with tarfile.open(fileobj=bundle_fh, mode="r|*") as tar:
+                yield tar
+
+
+def _get_exposed_apps(venv: Venv) -> List[str]:
+    apps = []
+    for package_info in venv.package_metadata.values():
+        if package_info.include_apps:
+            apps += package_info.apps
+            if package_info.include_dependencies:
+                apps += package_info.apps_of_dependencies
+    return sorted(set(apps))
+
+
+def get_venv_info(
+    venv: Venv, tags_by_python: Dict[Path, Dict[str, Optional[str]]]
+) -> Dict[str, Any]:
+    """What pipx-bundle.json records about venv.  tags_by_python caches the
+    tags of interpreters already asked for them.
+    """
+    base_python = venv.python_path.resolve()
+    if base_python not in tags_by_python:
+        tags_by_python[base_python] = get_python_tags(str(venv.python_path))
+    return {
+        "root": str(venv.root),
+        "package": venv.main_package_name,
+        "apps": _get_exposed_apps(venv),
+        **tags_by_python[base_python],
+    }
+
+
+def write_bundle(bundle_path: Path, venvs_info: Dict[str, Any]) -> None:
+    """Write the venvs described by venvs_info, as returned by get_venv_info
+    and keyed by venv name, to bundle_path
+    """
+    bundle_info = json.dumps(
+        {
+            "pipx_bundle_spec_version": BUNDLE_SPEC_VERSION,
+            "pipx_version": __version__,
+            "venvs": venvs_info,
+        },
+        indent=4,
+        sort_keys=True,
+    ).encode("utf-8")
+    info_member = tarfile.TarInfo(BUNDLE_INFO_NAME)
+    info_member.size = len(bundle_info)
+    info_member.mtime = int(time.time())
+
+    try:
+        with open_bundle_for_writing(bundle_path) as tar:
+            # first, so that readers can check it before unpacking anything
+            tar.addfile(info_member, BytesIO(bundle_info))
+            for (name, venv_info) in venvs_info.items():
+                tar.add(venv_info["root"], arcname=f"{BUNDLE_VENVS_DIR}/{name}")
+    except (Exception, KeyboardInterrupt):
+        if bundle_path.exists():
+            bundle_path.unlink()
+        raise
+
+
+def _read_info_member(
+    tar: tarfile.TarFile, bundle_path: Path
+) -> Tuple[tarfile.TarInfo, Dict[str, Any]]:
+    info_member = tar.next()
+    if info_member is None or info_member.name != BUNDLE_INFO_NAME:
+        raise PipxError(f"{bundle_path} is not a pipx bundle")
+    info_fh = tar.extractfile(info_member)
+    assert info_fh is not None
+    bundle_info = json.loads(info_fh.read().decode("utf-8"))
+    if bundle_info.get("pipx_bundle_spec_version", "").split(".")[0] != "0":
+        raise PipxError(
+            f"{bundle_path} was written by a newer version of pipx "
+            f"({bundle_info.get('pipx_version')})"
+        )
+    return (info_member, bundle_info["venvs"])
+
+
+def read_bundle_venvs_info(bundle_path: Path) -> Dict[str, Any]:
+    """The venvs in bundle_path, as passed to write_bundle"""
+    with open_bundle_for_reading(bundle_path) as tar:
+        return _read_info_member(tar, bundle_path)[1]
+
+
+def check_compatible(
+    venvs_info: Dict[str, Any], python: str, python_tags: Dict[str, Optional[str]]
+) -> None:
+    problems = []
+    for (name, venv_info) in venvs_info.items():
+        for tag in ("platform", "implementation", "python_version", "soabi"):
+            if venv_info.get(tag) != python_tags[tag]:
+                problems.append(
+                    f"{name}: {tag} {venv_info.get(tag)}, "
+                    f"but {python_tags[tag]} for {python}"
+                )
+                break
+    if problems:
+        raise PipxError(
+            "Cannot import venvs built for another platform or Python:\n    "
+            + "\n    ".join(problems),
+            wrap_message=False,
+        )
+
+
+def _check_member(member: tarfile.TarInfo, venv_names: Sequence[str]) -> bool:
+    """Whether member may be unpacked: a file, directory or link inside one of
+    the venvs of the bundle.  Raises PipxError for members that no pipx bundle
+    contains.
+    """
+    parts = member.name.split("/")
+    if (
+        len(parts) < 2
+        or parts[0] != BUNDLE_VENVS_DIR
+        or parts[1] not in venv_names
+        or ".." in parts
+        or not (member.isfile() or member.isdir() or member.issym() or member.islnk())
+    ):
+        raise PipxError(f"Invalid bundle member {member.name!r}")
+    if member.islnk():
+        # files hardlinked to each other in the exported venvs, e.g. by
+        #   `pipx dedup`, are stored once and linked
+        link_parts = member.linkname.split("/")
+        if (
+            len(link_parts) < 3
+            or link_parts[0] != BUNDLE_VENVS_DIR
+            or link_parts[1] not in venv_names
+            or ".." in link_parts
+        ):
+            raise PipxError(f"Invalid bundle member {member.name!r}")
+    if member.issym():
+        target = posixpath.normpath(
+            posixpath.join(posixpath.dirname(member.name), member.linkname)
+        )
+        if posixpath.isabs(member.linkname) or not target.startswith(
+            f"{BUNDLE_VENVS_DIR}/{parts[1]}/"
+        ):
+            # links to the interpreter, made again for the local one by
+            #   relocate_venv_in_place
+            logger.info(f"Not unpacking link {member.name} -> {member.linkname}")
+            return False
+    return True
+
+
+def unpack_bundle(
+    bundle_path: Path,
+    dest_dir: Path,
+    python: str,
+    python_tags: Dict[str, Optional[str]],
+) -> Dict[str, Any]:
+    """Unpack the venvs in bundle_path to dest_dir/venvs/NAME, after checking that
+    they can run with python, whose tags are python_tags.  Returns their info,
+    keyed by NAME.
+    """
+    with open_bundle_for_reading(bundle_path) as tar:
+        (info_member, venvs_info) = _read_info_member(tar, bundle_path)
+        check_compatible(venvs_info, python, python_tags)
+        extract_kwargs = {"filter": "tar"} if hasattr(tarfile, "tar_filter") else {}
+        for member in tar:
+            # iterating starts again from the first member, read above
+            if member is info_member:
+                continue
+            if _check_member(member, list(venvs_info)):
+                tar.extract(member, str(dest_dir), **extract_kwargs)
+    return venvs_info
@@ -12,6 +12,7 @@ try:
 except ImportError:
     import importlib_metadata as metadata  # type: ignore
 
+from pipx import trace
 from pipx.constants import WINDOWS
 from pipx.util import PipxError, run_subprocess
 
@@ -208,6 +209,7 @@ def fetch_info_in_venv(venv_python_path) -> Tuple[List[str], Dict[str, str], str
             [venv_python_path, "-c", command_str],
             capture_stderr=False,
             log_cmd_str="<fetch_info_in_venv commands>",
+            output_tail_lines=None,
         ).stdout
     )
     return (
@@ -229,26 +231,31 @@ def inspect_venv(
     root_req = Requirement(root_package_name)
     root_req.extras = root_package_extras
 
-    (venv_sys_path, venv_env, venv_python_version) = fetch_info_in_venv(
-        venv_python_path
-    )
+    with trace.span("fetch_info_in_venv"):
+        (venv_sys_path, venv_env, venv_python_version) = fetch_info_in_venv(
+            venv_python_path
+        )
 
-    venv_inspect_info = VenvInspectInformation(
-        bin_path=venv_bin_path,
-        env=venv_env,
-        distributions=list(metadata.distributions(path=venv_sys_path)),
-    )
+    with trace.span("read_distributions") as span_args:
+        venv_inspect_info = VenvInspectInformation(
+            bin_path=venv_bin_path,
+            env=venv_env,
+            distributions=list(metadata.distributions(path=venv_sys_path)),
+        )
+        span_args["distributions"] = len(venv_inspect_info.distributions)
 
     root_dist = get_dist(root_req.name, venv_inspect_info.distributions)
     if root_dist is None:
         raise PipxError(
             "Pipx Internal Error: cannot find package {root_req.name!r} metadata."
         )
-    app_paths_of_dependencies = _dfs_package_apps(
-        root_dist, root_req, venv_inspect_info, app_paths_of_dependencies
-    )
+    with trace.span("find_dependency_apps"):
+        app_paths_of_dependencies = _dfs_package_apps(
+            root_dist, root_req, venv_inspect_info, app_paths_of_dependencies
+        )
 
-    apps = get_apps(root_dist, venv_bin_path)
+    with trace.span("find_apps"):
+        apps = get_apps(root_dist, venv_bin_path)
     app_paths = [venv_bin_path / app for app in apps]
     if WINDOWS:
         app_paths = _windows_extra_app_paths(app_paths)
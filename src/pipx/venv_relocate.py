@@ -0,0 +1,194 @@
+import logging
+from pathlib import Path
+from typing import Iterable, List, Sequence
+
+from pipx.pipx_metadata_file import PackageInfo, PipxMetadata
+from pipx.util import (
+    get_venv_paths,
+    read_pyvenv_cfg,
+    run_subprocess,
+    subprocess_post_check,
+)
+from pipx.venv import Venv
+
+logger = logging.getLogger(__name__)
+
+# Only look at the first few lines of scripts for interpreter paths.  pip
+#   writes a '#!/bin/sh' + exec trampoline instead of a plain shebang when the
+#   interpreter path is too long, and the path then appears on line 3.
+_SCRIPT_HEADER_LINES = 3
+
+
+def get_venv_python_version(venv_dir: Path, pipx_metadata: PipxMetadata) -> str:
+    """Version of the interpreter a venv was built with, without running it"""
+    cfg = read_pyvenv_cfg(venv_dir)
+    version = cfg.get("version_info", cfg.get("version"))
+    if version is None and pipx_metadata.python_version is not None:
+        version = pipx_metadata.python_version
+    return version or ""
+
+
+def get_python_version(python: str) -> str:
+    process = run_subprocess(
+        [python, "-c", "import platform; print(platform.python_version())"],
+        capture_stderr=False,
+        output_tail_lines=None,
+    )
+    subprocess_post_check(process)
+    return process.stdout.strip()
+
+
+def retarget_interpreter(venv_dir: Path, python: str, venv_args: List[str]) -> None:
+    """Point pyvenv.cfg and the interpreter links of venv_dir at python"""
+    # 'venv --upgrade' rewrites pyvenv.cfg and recreates the python
+    #   executables in bin/ without touching site-packages
+    process = run_subprocess(
+        [python, "-m", "venv", "--upgrade", "--without-pip"]
+        + venv_args
+        + [str(venv_dir)]
+    )
+    subprocess_post_check(process)
+
+
+def rewrite_shebangs(
+    bin_path: Path, old_bin_paths: Iterable[Path], new_bin_path: Path
+) -> List[Path]:
+    """Replace interpreter paths under any of old_bin_paths in the headers of
+    scripts in bin_path.  Returns the scripts modified.
+    """
+    replacements = [
+        (str(old).encode("utf-8"), str(new_bin_path).encode("utf-8"))
+        for old in old_bin_paths
+        if old != new_bin_path
+    ]
+    if not replacements:
+        return []
+
+    rewritten = []
+    for script in bin_path.iterdir():
+        if script.is_symlink() or not script.is_file():
+            continue
+        try:
+            with script.open("rb") as script_fh:
+                if script_fh.read(2) != b"#!":
+                    continue
+                script_fh.seek(0)
+                content = script_fh.read()
+        except OSError:
+            continue
+
+        lines = content.split(b"\n")
+        header = b"\n".join(lines[:_SCRIPT_HEADER_LINES])
+        new_header = header
+        for (old, new) in replacements:
+            new_header = new_header.replace(old, new)
+        if new_header == header:
+            continue
+
+        body = lines[_SCRIPT_HEADER_LINES:]
+        new_content = b"\n".join([new_header] + body)
+        mode = script.stat().st_mode
+        script.write_bytes(new_content)
+        script.chmod(mode)
+        rewritten.append(script)
+        logger.info(f"rewrote interpreter path in {script}")
+
+    return rewritten
+
+
+def _relocate_path(path: Path, old_root: Path, new_root: Path) -> Path:
+    try:
+        return new_root / path.relative_to(old_root)
+    except ValueError:
+        return path
+
+
+def _relocate_package_info(
+    package_info: PackageInfo, old_root: Path, new_root: Path
+) -> PackageInfo:
+    return package_info._replace(
+        app_paths=[
+            _relocate_path(p, old_root, new_root) for p in package_info.app_paths
+        ],
+        app_paths_of_dependencies={
+            dep: [_relocate_path(p, old_root, new_root) for p in paths]
+            for (dep, paths) in package_info.app_paths_of_dependencies.items()
+        },
+    )
+
+
+def get_recorded_venv_roots(pipx_metadata: PipxMetadata) -> List[Path]:
+    """Venv locations recorded in the absolute app paths of pipx_metadata"""
+    roots = set()
+    package_infos = [pipx_metadata.main_package] + list(
+        pipx_metadata.injected_packages.values()
+    )
+    for package_info in package_infos:
+        app_paths = list(package_info.app_paths)
+        for dep_paths in package_info.app_paths_of_dependencies.values():
+            app_paths += dep_paths
+        for app_path in app_paths:
+            # app paths are always VENV_ROOT/bin/APP (or Scripts on Windows)
+            roots.add(app_path.parent.parent)
+    return sorted(roots)
+
+
+def relocate_metadata_paths(
+    pipx_metadata: PipxMetadata, old_root: Path, new_root: Path
+) -> None:
+    pipx_metadata.main_package = _relocate_package_info(
+        pipx_metadata.main_package, old_root, new_root
+    )
+    pipx_metadata.injected_packages = {
+        name: _relocate_package_info(package_info, old_root, new_root)
+        for (name, package_info) in pipx_metadata.injected_packages.items()
+    }
+
+
+def prepare_venv_move(src: Path, dest: Path, pipx_metadata: PipxMetadata) -> None:
+    """Rewrite the paths inside the venv at src so it is valid once renamed to
+    dest
+    """
+    src_bin_path, _ = get_venv_paths(src)
+    dest_bin_path, _ = get_venv_paths(dest)
+    rewrite_shebangs(src_bin_path, [src_bin_path], dest_bin_path)
+    relocate_metadata_paths(pipx_metadata, src, dest)
+    pipx_metadata.write()
+
+
+def swap_venv_dirs(staged_dir: Path, venv_dir: Path, old_venv_dir: Path) -> None:
+    """Move venv_dir out of the way to old_venv_dir and staged_dir into its
+    place.  Both are renames, so venv_dir is only missing for an instant.
+    """
+    if venv_dir.exists():
+        venv_dir.rename(old_venv_dir)
+    try:
+        staged_dir.rename(venv_dir)
+    except OSError:
+        if old_venv_dir.exists():
+            old_venv_dir.rename(venv_dir)
+        raise
+
+
+def relocate_venv_in_place(
+    venv: Venv, python: str, old_roots: Sequence[Path] = ()
+) -> None:
+    """Point venv at python and rewrite the paths in its scripts and pipx
+    metadata that refer to old_roots, or to any other location recorded in
+    its metadata, to its current location
+    """
+    venv_dir = venv.root
+    retarget_interpreter(venv_dir, python, venv.pipx_metadata.venv_args)
+    all_old_roots = set(old_roots) | set(get_recorded_venv_roots(venv.pipx_metadata))
+    all_old_roots.discard(venv_dir)
+    rewrite_shebangs(
+        venv.bin_path,
+        [root / venv.bin_path.name for root in all_old_roots],
+        venv.bin_path,
+    )
+    if venv.uses_shared_libs:
+        venv.write_shared_libs_pth()
+    for old_root in all_old_roots:
+        relocate_metadata_paths(venv.pipx_metadata, old_root, venv_dir)
+    venv.pipx_metadata.python_version = venv.get_python_version()
+    venv.pipx_metadata.write()
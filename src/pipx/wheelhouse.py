@@ -0,0 +1,112 @@
+"""A local directory of wheels, $PIPX_HOME/wheelhouse, shared by all venvs.
+
+`pipx wheelhouse fill` builds (or downloads) wheels of the packages of
+installed venvs into it.  pip is pointed at it with --find-links when the
+wheelhouse mode is "prefer", so wheels built once are used by every venv
+instead of rebuilding sdists, and only at it when the mode is "offline", so
+that installs need no network at all.
+
+Wheels are stored flat, by file name, as --find-links requires.  index.json
+maps each file name to the sha256 of its contents: a wheel built again (e.g.
+from an sdist, which is rarely reproducible) does not replace the one
+already stored, so all venvs share identical files.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from pipx import constants
+from pipx.util import PipxError
+
+logger = logging.getLogger(__name__)
+
+WHEELHOUSE_MODES = ["prefer", "offline"]
+WHEELHOUSE_INDEX = "index.json"
+
+_mode: Optional[str] = None
+_add_lock = threading.Lock()
+
+
+def set_mode(mode: Optional[str]) -> None:
+    """Set the wheelhouse mode for this pipx command, overriding the
+    PIPX_WHEELHOUSE environment variable
+    """
+    global _mode
+    _mode = mode
+
+
+def get_mode() -> str:
+    """ "prefer", "offline", or "" if pip should not use the wheelhouse"""
+    mode = _mode if _mode is not None else constants.PIPX_WHEELHOUSE_MODE
+    if mode and mode not in WHEELHOUSE_MODES:
+        raise PipxError(
+            f"Unknown wheelhouse mode {mode!r}, "
+            f"must be one of {', '.join(WHEELHOUSE_MODES)}"
+        )
+    return mode
+
+
+def get_pip_args() -> List[str]:
+    """Arguments for `pip install` (and `pip wheel`) that make it use the
+    wheelhouse according to the wheelhouse mode
+    """
+    mode = get_mode()
+    if mode == "offline":
+        return ["--no-index", "--find-links", str(constants.PIPX_WHEELHOUSE_DIR)]
+    if mode == "prefer" and constants.PIPX_WHEELHOUSE_DIR.is_dir():
+        return ["--find-links", str(constants.PIPX_WHEELHOUSE_DIR)]
+    return []
+
+
+def _get_sha256(path: Path) -> str:
+    sha256 = hashlib.sha256()
+    with path.open("rb") as wheel_fh:
+        for block in iter(lambda: wheel_fh.read(1024 * 1024), b""):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+def read_index() -> Dict[str, str]:
+    try:
+        with (constants.PIPX_WHEELHOUSE_DIR / WHEELHOUSE_INDEX).open(
+            "r", encoding="utf-8"
+        ) as index_fh:
+            return json.load(index_fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def add_wheels(wheel_dir: Path) -> List[str]:
+    """Move the wheels in wheel_dir, which must be on the same filesystem,
+    into the wheelhouse.  Returns the file names of the wheels that were not
+    in the wheelhouse before.
+    """
+    wheelhouse_dir = constants.PIPX_WHEELHOUSE_DIR
+    added = []
+    with _add_lock:
+        index = read_index()
+        for wheel_path in sorted(wheel_dir.glob("*.whl")):
+            sha256 = _get_sha256(wheel_path)
+            stored_path = wheelhouse_dir / wheel_path.name
+            if stored_path.is_file():
+                if index.get(wheel_path.name, sha256) != sha256:
+                    logger.info(
+                        f"Keeping stored {wheel_path.name}, "
+                        f"which differs from the one just built"
+                    )
+                wheel_path.unlink()
+                continue
+            os.replace(str(wheel_path), str(stored_path))
+            index[wheel_path.name] = sha256
+            added.append(wheel_path.name)
+        index_path = wheelhouse_dir / WHEELHOUSE_INDEX
+        tmp_index_path = index_path.with_name(f".{WHEELHOUSE_INDEX}.tmp")
+        with tmp_index_path.open("w", encoding="utf-8") as index_fh:
+            json.dump(index, index_fh, indent=4, sort_keys=True)
+        os.replace(str(tmp_index_path), str(index_path))
+    return added
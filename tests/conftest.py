@@ -3,7 +3,7 @@ from pathlib import Path
 
 import pytest  # type: ignore
 
-from pipx import constants, shared_libs, venv
+from pipx import constants, shared_libs, wheelhouse
 
 
 def pytest_addoption(parser):
@@ -40,13 +40,25 @@ def pipx_temp_env(tmp_path, monkeypatch):
 
     monkeypatch.setattr(constants, "PIPX_SHARED_LIBS", shared_dir)
     monkeypatch.setattr(shared_libs, "shared_libs", shared_libs._SharedLibs())
-    monkeypatch.setattr(venv, "shared_libs", shared_libs.shared_libs)
+    monkeypatch.setattr(shared_libs, "_pools", {})
 
     monkeypatch.setattr(constants, "PIPX_HOME", home_dir)
     monkeypatch.setattr(constants, "LOCAL_BIN_DIR", bin_dir)
     monkeypatch.setattr(constants, "PIPX_LOCAL_VENVS", home_dir / "venvs")
     monkeypatch.setattr(constants, "PIPX_VENV_CACHEDIR", home_dir / ".cache")
+    monkeypatch.setattr(constants, "PIPX_STAGING_DIR", home_dir / ".staging")
+    monkeypatch.setattr(constants, "PIPX_TRASH_DIR", home_dir / ".trash")
+    monkeypatch.setattr(
+        constants, "PIPX_COMPLETION_INDEX", home_dir / "completion_index.json"
+    )
     monkeypatch.setattr(constants, "PIPX_LOG_DIR", home_dir / "logs")
+    monkeypatch.setattr(constants, "PIPX_METRICS_DIR", home_dir / "metrics")
+    monkeypatch.setattr(constants, "PIPX_WHEELHOUSE_DIR", home_dir / "wheelhouse")
+    monkeypatch.setattr(constants, "PIPX_WHEELHOUSE_MODE", "")
+    monkeypatch.setattr(wheelhouse, "_mode", None)
+    monkeypatch.setattr(constants, "PIPX_DEDUP_STORE_DIR", home_dir / "store")
+    monkeypatch.setattr(constants, "PIPX_DEDUP", False)
+    monkeypatch.setattr(constants, "PIPX_ARTIFACT_CACHE", "")
 
     # macOS needs /usr/bin in PATH to compile certain packages, but
     #   applications in /usr/bin cause test_install.py tests to raise warnings
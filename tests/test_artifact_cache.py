@@ -0,0 +1,98 @@
+import http.server
+import shutil
+import subprocess
+import sys
+import threading
+from unittest import mock
+
+import pytest  # type: ignore
+
+from helpers import run_pipx_cli
+from pipx import constants
+from pipx.util import PipxError
+from pipx.venv import Venv
+
+
+class CacheRequestHandler(http.server.BaseHTTPRequestHandler):
+    entries = {}
+
+    def do_GET(self):
+        if self.path not in self.entries:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(self.entries[self.path])))
+        self.end_headers()
+        self.wfile.write(self.entries[self.path])
+
+    def do_PUT(self):
+        length = int(self.headers["Content-Length"])
+        self.entries[self.path] = self.rfile.read(length)
+        self.send_response(201)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def cache_server():
+    CacheRequestHandler.entries = {}
+    server = http.server.HTTPServer(("127.0.0.1", 0), CacheRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/pipx"
+    server.shutdown()
+    server.server_close()
+
+
+def execvpe_mock(cmd_path, cmd_args, env):
+    sys.exit(subprocess.run([str(x) for x in cmd_args], env=env).returncode)
+
+
+def run_pipx_cli_exit(pipx_cmd_list):
+    with pytest.raises(SystemExit) as sys_exit:
+        run_pipx_cli(pipx_cmd_list)
+    return sys_exit.value.code
+
+
+def fail_create_venv(*args, **kwargs):
+    raise PipxError("venv created instead of fetched from the cache")
+
+
+def reinstall_from_cache(monkeypatch):
+    # uninstalled venvs are deleted in the background, do it right away
+    shutil.rmtree(str(constants.PIPX_LOCAL_VENVS / "pycowsay"))
+    with monkeypatch.context() as m:
+        m.setattr(Venv, "create_venv", fail_create_venv)
+        assert not run_pipx_cli(["install", "pycowsay"])
+    assert not run_pipx_cli(["runpip", "pycowsay", "check"])
+
+
+def test_directory_cache(pipx_temp_env, monkeypatch, tmp_path):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(constants, "PIPX_ARTIFACT_CACHE", str(cache_dir))
+    assert not run_pipx_cli(["install", "pycowsay"])
+    assert len(list(cache_dir.glob("*.tar.gz"))) == 1
+    reinstall_from_cache(monkeypatch)
+
+    # an existing venv is reinstalled, not replaced from the cache
+    assert not run_pipx_cli(["install", "--force", "pycowsay"])
+    assert len(list(cache_dir.glob("*.tar.gz"))) == 1
+
+    # the same venv as installed, so pipx run uses it too
+    with mock.patch("os.execvpe", new=execvpe_mock), monkeypatch.context() as m:
+        m.setattr(Venv, "create_venv", fail_create_venv)
+        assert not run_pipx_cli_exit(["run", "--no-cache", "pycowsay", "moo"])
+
+
+def test_http_cache(pipx_temp_env, monkeypatch, cache_server):
+    monkeypatch.setattr(constants, "PIPX_ARTIFACT_CACHE", cache_server)
+    assert not run_pipx_cli(["install", "pycowsay"])
+    assert len(CacheRequestHandler.entries) == 1
+    reinstall_from_cache(monkeypatch)
+
+
+def test_cache_unreachable(pipx_temp_env, monkeypatch, cache_server):
+    monkeypatch.setattr(constants, "PIPX_ARTIFACT_CACHE", "http://127.0.0.1:1/pipx")
+    assert not run_pipx_cli(["install", "pycowsay"])
@@ -0,0 +1,57 @@
+import subprocess
+import sys
+
+import pytest  # type: ignore
+
+from helpers import run_pipx_cli
+from pipx import constants, venv_bundle
+from pipx.util import PipxError
+
+
+def test_export_import(pipx_temp_env, monkeypatch, capsys, tmp_path):
+    assert not run_pipx_cli(["install", "pycowsay"])
+    bundle_path = tmp_path / "bundle.tar.gz"
+    assert not run_pipx_cli(["export", "pycowsay", "-o", str(bundle_path)])
+    assert bundle_path.is_file()
+
+    # another PIPX_HOME and bin dir, as on a new machine
+    new_venvs = tmp_path / "newhome" / "venvs"
+    new_bin_dir = tmp_path / "newbin"
+    new_venvs.mkdir(parents=True)
+    monkeypatch.setattr(constants, "PIPX_LOCAL_VENVS", new_venvs)
+    monkeypatch.setattr(constants, "LOCAL_BIN_DIR", new_bin_dir)
+    assert not run_pipx_cli(["import", str(bundle_path)])
+    assert "imported pycowsay" in capsys.readouterr().out
+
+    app_path = new_bin_dir / ("pycowsay.exe" if constants.WINDOWS else "pycowsay")
+    assert app_path.exists()
+    if not constants.WINDOWS:
+        assert str(new_venvs) in app_path.read_text().splitlines()[0]
+    output = subprocess.run(
+        [str(app_path), "moo"], stdout=subprocess.PIPE, universal_newlines=True
+    ).stdout
+    assert "moo" in output
+
+    # already installed
+    assert run_pipx_cli(["import", str(bundle_path)])
+    assert not run_pipx_cli(["import", "--force", str(bundle_path)])
+
+
+def test_export_nothing(pipx_temp_env, capsys, tmp_path):
+    assert run_pipx_cli(["export", "-o", str(tmp_path / "bundle.tar")])
+    assert run_pipx_cli(["export", "--all", "-o", str(tmp_path / "bundle.zip")])
+    assert "Unknown bundle type" in capsys.readouterr().err
+
+
+def test_check_compatible():
+    tags = {
+        "platform": "linux-x86_64",
+        "implementation": "cpython",
+        "python_version": "3.8",
+        "soabi": "cpython-38-x86_64-linux-gnu",
+    }
+    venv_bundle.check_compatible({"black": dict(tags)}, sys.executable, tags)
+    with pytest.raises(PipxError, match="platform macosx"):
+        venv_bundle.check_compatible(
+            {"black": dict(tags, platform="macosx-11-arm64")}, sys.executable, tags
+        )
@@ -1,7 +1,49 @@
+import json
+import os
+import subprocess
+import sys
+
 from helpers import run_pipx_cli
+from pipx import constants, main
 
 
 def test_cli(monkeypatch, capsys):
     assert not run_pipx_cli(["completions"])
     captured = capsys.readouterr()
     assert "Add the appropriate command" in captured.out
+
+
+def test_completion_index(pipx_temp_env, tmp_path):
+    assert not run_pipx_cli(["install", "pycowsay"])
+    index = json.loads(constants.PIPX_COMPLETION_INDEX.read_text())
+    assert index["venvs"]["pycowsay"]["apps"] == ["pycowsay"]
+
+    # completion must answer from the index alone
+    completer = main.InstalledVenvsCompleter(tmp_path / "nonexistent")
+    assert completer.use("py") == ["pycowsay"]
+
+
+def test_completion_index_uninstall(pipx_temp_env):
+    assert not run_pipx_cli(["install", "pycowsay"])
+    assert not run_pipx_cli(["uninstall", "pycowsay"])
+    index = json.loads(constants.PIPX_COMPLETION_INDEX.read_text())
+    assert index["venvs"] == {}
+
+
+def test_shell_completion(pipx_temp_env, tmp_path):
+    assert not run_pipx_cli(["install", "pycowsay"])
+
+    output_file = tmp_path / "completions.txt"
+    comp_line = "pipx uninstall py"
+    env = dict(os.environ)
+    env.update(
+        {
+            "PIPX_HOME": str(constants.PIPX_HOME),
+            "_ARGCOMPLETE": "1",
+            "_ARGCOMPLETE_STDOUT_FILENAME": str(output_file),
+            "COMP_LINE": comp_line,
+            "COMP_POINT": str(len(comp_line)),
+        }
+    )
+    subprocess.run([sys.executable, "-m", "pipx"], env=env, check=True)
+    assert output_file.read_text().split("\013") == ["pycowsay "]
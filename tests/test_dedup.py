@@ -0,0 +1,49 @@
+import shutil
+
+from helpers import run_pipx_cli
+from pipx import constants, dedup_store
+
+
+def get_module_path(venv_name):
+    (site_packages,) = dedup_store.get_site_packages_dirs(
+        constants.PIPX_LOCAL_VENVS / venv_name
+    )
+    return site_packages / "pycowsay" / "main.py"
+
+
+def test_dedup(pipx_temp_env, capsys):
+    assert not run_pipx_cli(["install", "pycowsay"])
+    assert not run_pipx_cli(["install", "pycowsay", "--suffix=_b"])
+    capsys.readouterr()
+
+    assert not run_pipx_cli(["dedup"])
+    assert "Deduplicated" in capsys.readouterr().out
+    stat_a = get_module_path("pycowsay").stat()
+    stat_b = get_module_path("pycowsay-b").stat()
+    assert (stat_a.st_dev, stat_a.st_ino) == (stat_b.st_dev, stat_b.st_ino)
+    assert stat_a.st_nlink == 3
+    # written in place by pipx, so never shared
+    (site_packages,) = dedup_store.get_site_packages_dirs(
+        constants.PIPX_LOCAL_VENVS / "pycowsay"
+    )
+    assert (site_packages / constants.PIPX_SHARED_PTH).stat().st_nlink == 1
+
+    assert not run_pipx_cli(["dedup"])
+    assert "No new files" in capsys.readouterr().out
+
+    # uninstalled venvs are deleted in the background, do it right away
+    shutil.rmtree(str(constants.PIPX_LOCAL_VENVS / "pycowsay"))
+    shutil.rmtree(str(constants.PIPX_LOCAL_VENVS / "pycowsay-b"))
+    assert not run_pipx_cli(["dedup"])
+    assert "Removed" in capsys.readouterr().out
+    # only files of the shared libraries are left
+    assert all(
+        store_path.stat().st_nlink > 1
+        for store_path in constants.PIPX_DEDUP_STORE_DIR.glob("*/*")
+    )
+
+
+def test_dedup_after_install(pipx_temp_env, monkeypatch):
+    monkeypatch.setattr(constants, "PIPX_DEDUP", True)
+    assert not run_pipx_cli(["install", "pycowsay"])
+    assert get_module_path("pycowsay").stat().st_nlink == 2
@@ -116,6 +116,23 @@ def test_install_same_package_twice_no_force(pipx_temp_env, capsys):
     )
 
 
+def test_install_several_packages(pipx_temp_env, capsys):
+    assert not run_pipx_cli(["install", "pycowsay", PKG["black"]["spec"]])
+    captured = capsys.readouterr()
+    assert "Installed all 2 packages" in captured.out
+    assert (constants.PIPX_LOCAL_VENVS / "pycowsay").is_dir()
+    assert (constants.PIPX_LOCAL_VENVS / "black").is_dir()
+
+
+def test_install_several_packages_one_fails(pipx_temp_env, capsys):
+    assert run_pipx_cli(["install", "--jobs", "2", "pygdbmi", "pycowsay"])
+    captured = capsys.readouterr()
+    assert "No apps associated with package pygdbmi" in captured.err
+    assert "Installed 1 of 2 packages" in captured.err
+    assert (constants.PIPX_LOCAL_VENVS / "pycowsay").is_dir()
+    assert not (constants.PIPX_LOCAL_VENVS / "pygdbmi").exists()
+
+
 def test_include_deps(pipx_temp_env, capsys):
     assert run_pipx_cli(["install", PKG["jupyter"]["spec"]]) == 1
     assert not run_pipx_cli(["install", PKG["jupyter"]["spec"], "--include-deps"])
@@ -1,7 +1,11 @@
+import json
+import subprocess
+
 import pytest  # type: ignore
 
-from helpers import mock_legacy_venv, run_pipx_cli
+from helpers import app_name, mock_legacy_venv, run_pipx_cli
 from pipx import constants, util
+from pipx.commands.list_packages import choose_list_executor, iter_package_summaries
 
 
 def test_cli(pipx_temp_env, monkeypatch, capsys):
@@ -59,3 +63,51 @@ def test_list_suffix_legacy_venv(pipx_temp_env, monkeypatch, capsys, metadata_ve
     assert not run_pipx_cli(["list"])
     captured = capsys.readouterr()
     assert f"package pycowsay 0.0.0.1 (pycowsay{suffix})," in captured.out
+
+
+def test_list_executors(pipx_temp_env, capsys):
+    assert not run_pipx_cli(["install", "pycowsay"])
+    assert not run_pipx_cli(["install", "pycowsay", "--suffix=_x"])
+    venv_dirs = sorted(constants.PIPX_LOCAL_VENVS.iterdir())
+
+    assert choose_list_executor(1) == "serial"
+    summaries = [
+        summary for (summary, _) in iter_package_summaries(venv_dirs, False, "serial")
+    ]
+    assert len(summaries) == 2
+    for executor in ["threads", "processes"]:
+        assert [
+            summary
+            for (summary, _) in iter_package_summaries(venv_dirs, False, executor)
+        ] == summaries
+
+
+def test_list_json(pipx_temp_env, monkeypatch, capsys):
+    assert not run_pipx_cli(["install", "pycowsay"])
+    assert not run_pipx_cli(["install", "pycowsay", "--suffix=_x"])
+    (constants.LOCAL_BIN_DIR / "pycowsay_x").unlink()
+    capsys.readouterr()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("pipx list --json must not run subprocesses")
+
+    monkeypatch.setattr(subprocess, "Popen", fail)
+
+    assert not run_pipx_cli(["list", "--json"])
+    venvs = json.loads(capsys.readouterr().out)["venvs"]
+    assert sorted(venvs) == ["pycowsay", "pycowsay-x"]
+    record = venvs["pycowsay"]
+    assert record["main_package"]["package"] == "pycowsay"
+    assert record["main_package"]["package_version"]
+    assert record["python_version"].startswith("Python 3")
+    assert record["exposed_apps"] == [app_name("pycowsay")]
+    assert record["missing_apps"] == []
+    assert record["problems"] == []
+    assert venvs["pycowsay-x"]["missing_apps"] == [app_name("pycowsay") + "_x"]
+
+    assert not run_pipx_cli(["list", "--json-lines"])
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line) for line in lines] == [
+        venvs["pycowsay"],
+        venvs["pycowsay-x"],
+    ]
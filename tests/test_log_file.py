@@ -0,0 +1,51 @@
+import logging
+
+from helpers import run_pipx_cli
+from pipx import constants
+from pipx.log_file import LOG_FILENAME, BackgroundFileHandler
+
+
+def _close_log_file():
+    pipx_logger = logging.getLogger("pipx")
+    for handler in list(pipx_logger.handlers):
+        if isinstance(handler, BackgroundFileHandler):
+            pipx_logger.removeHandler(handler)
+            handler.close()
+
+
+def test_single_log_file(pipx_temp_env):
+    constants.PIPX_LOG_DIR.mkdir(parents=True)
+    old_log = constants.PIPX_LOG_DIR / "cmd_2020-01-01_00.00.00.log"
+    old_log.write_text("old log")
+
+    assert not run_pipx_cli(["list"])
+    assert run_pipx_cli(["uninstall", "--verbose", "nonexistent"])
+    _close_log_file()
+
+    assert [p.name for p in constants.PIPX_LOG_DIR.iterdir()] == [LOG_FILENAME]
+    log_text = (constants.PIPX_LOG_DIR / LOG_FILENAME).read_text()
+    assert "pipx list" in log_text
+    assert "pipx uninstall --verbose nonexistent" in log_text
+
+
+def test_no_log_file_for_fast_commands(pipx_temp_env):
+    assert not run_pipx_cli(["completions"])
+    _close_log_file()
+    assert not (constants.PIPX_LOG_DIR / LOG_FILENAME).exists()
+
+
+def test_log_file_rotation(tmp_path):
+    log_file = tmp_path / "logs" / LOG_FILENAME
+    handler = BackgroundFileHandler(log_file, max_bytes=1000, backup_count=2)
+    handler.setFormatter(logging.Formatter("{message}", style="{"))
+    for i in range(500):
+        handler.handle(logging.makeLogRecord({"msg": "line %d", "args": (i,)}))
+    handler.close()
+
+    assert sorted(p.name for p in log_file.parent.iterdir()) == [
+        LOG_FILENAME,
+        f"{LOG_FILENAME}.1",
+        f"{LOG_FILENAME}.2",
+    ]
+    assert log_file.read_text().splitlines()[-1] == "line 499"
+    assert log_file.stat().st_size <= 1000
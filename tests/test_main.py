@@ -1,4 +1,6 @@
+import subprocess
 import sys
+from typing import List
 from unittest import mock
 
 import pytest  # type: ignore
@@ -26,3 +28,47 @@ def test_version(monkeypatch, capsys):
     captured = capsys.readouterr()
     mock_exit.assert_called_with(0)
     assert main.__version__ in captured.out.strip()
+
+
+def _get_modules_imported_by(module: str) -> List[str]:
+    """Modules first imported while importing module, from -X importtime"""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    # lines are "import time: self | cumulative | <indent>name", and a module's
+    #   imports are listed before it with deeper indentation
+    entries = []
+    for line in process.stderr.splitlines():
+        if line.startswith("import time:") and not line.endswith("imported package"):
+            name_field = line.split("|")[-1]
+            indent = len(name_field) - len(name_field.lstrip())
+            entries.append((indent, name_field.strip()))
+    (module_index,) = [i for i, entry in enumerate(entries) if entry[1] == module]
+    module_indent = entries[module_index][0]
+    imported = []
+    for (indent, name) in reversed(entries[:module_index]):
+        if indent <= module_indent:
+            break
+        imported.append(name)
+    return imported
+
+
+def test_import_time_budget():
+    # Everything here is only needed once a command runs, not for startup,
+    #   `pipx --version`, `pipx --help` or shell completion
+    imported = _get_modules_imported_by("pipx.main")
+    assert imported
+    for module in [
+        "argcomplete",
+        "logging.config",
+        "multiprocessing",
+        "packaging",
+        "pipx.commands",
+        "pipx.venv",
+        "urllib.request",
+        "userpath",
+    ]:
+        assert module not in imported
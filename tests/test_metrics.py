@@ -0,0 +1,36 @@
+from helpers import run_pipx_cli
+from pipx import constants, metrics
+
+
+def _read_samples():
+    text = (constants.PIPX_METRICS_DIR / metrics.METRICS_FILENAME).read_text()
+    samples = {}
+    for line in text.splitlines():
+        if not line.startswith("#"):
+            (name, value) = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+def test_metrics_disabled(pipx_temp_env):
+    assert not run_pipx_cli(["list"])
+    assert not constants.PIPX_METRICS_DIR.exists()
+
+
+def test_metrics_textfile(pipx_temp_env, monkeypatch):
+    monkeypatch.setattr(constants, "PIPX_METRICS", True)
+
+    assert not run_pipx_cli(["install", "pycowsay"])
+    assert not run_pipx_cli(["list"])
+    assert not run_pipx_cli(["list"])
+    assert run_pipx_cli(["uninstall", "nonexistent"])
+
+    samples = _read_samples()
+    assert samples['pipx_commands_total{command="install",result="success"}'] == 1
+    assert samples['pipx_commands_total{command="list",result="success"}'] == 2
+    assert samples['pipx_commands_total{command="uninstall",result="failure"}'] == 1
+    assert samples['pipx_command_duration_seconds_count{command="list"}'] == 2
+    assert samples['pipx_command_duration_seconds_sum{command="install"}'] > 0
+    assert samples["pipx_venvs"] == 1
+    assert samples["pipx_venvs_bytes"] > 0
+    assert samples["pipx_last_command_timestamp_seconds"] > 0
@@ -0,0 +1,36 @@
+from pipx import constants, venv
+from pipx.pip_worker import PipWorker
+
+
+def test_pip_worker(pipx_temp_env):
+    test_venv = venv.Venv(constants.PIPX_LOCAL_VENVS / "test")
+    test_venv.create_venv(venv_args=[], pip_args=[])
+
+    worker = PipWorker(test_venv.python_path)
+    try:
+        assert worker.run(["install", "-q", "pycowsay"]).returncode == 0
+        pid = worker._process.pid
+        assert "pycowsay" in worker.run(["list"]).stdout
+        assert worker.run(["uninstall", "-y", "pycowsay"]).returncode == 0
+        assert "pycowsay" not in worker.run(["list"]).stdout
+        failed = worker.run(["install", "--no-such-option"])
+        assert failed.returncode != 0
+        assert "no such option" in failed.stderr
+        # all commands ran in the same process
+        assert worker._process.pid == pid
+    finally:
+        worker.close()
+    assert not worker.is_running
+
+
+def test_pip_worker_restarts_after_pip_changes(pipx_temp_env):
+    test_venv = venv.Venv(constants.PIPX_LOCAL_VENVS / "test")
+    test_venv.create_venv(venv_args=[], pip_args=[])
+
+    worker = PipWorker(test_venv.python_path)
+    try:
+        assert worker.run(["install", "-q", "--upgrade", "pip"]).returncode == 0
+        assert not worker.is_running
+        assert worker.run(["list"]).returncode == 0
+    finally:
+        worker.close()
@@ -2,7 +2,10 @@ import sys
 
 import pytest  # type: ignore
 
-from helpers import mock_legacy_venv, run_pipx_cli
+from helpers import app_name, mock_legacy_venv, run_pipx_cli
+from pipx import constants
+from pipx.util import PipxError
+from pipx.venv import Venv
 
 
 def test_reinstall(pipx_temp_env, capsys):
@@ -52,3 +55,27 @@ def test_reinstall_specifier(pipx_temp_env, capsys):
     assert not run_pipx_cli(["reinstall", "--python", sys.executable, "pylint"])
     captured = capsys.readouterr()
     assert "installed package pylint 2.3.1" in captured.out
+
+
+def test_reinstall_staged(pipx_temp_env, capsys):
+    assert not run_pipx_cli(["install", "pycowsay"])
+    assert not run_pipx_cli(
+        ["reinstall", "--staged", "--python", sys.executable, "pycowsay"]
+    )
+    assert "installed package pycowsay" in capsys.readouterr().out
+    assert (constants.LOCAL_BIN_DIR / app_name("pycowsay")).resolve().is_file()
+    assert not list(constants.PIPX_STAGING_DIR.iterdir())
+
+
+def test_reinstall_staged_failure_keeps_venv(pipx_temp_env, monkeypatch, capsys):
+    assert not run_pipx_cli(["install", "pycowsay"])
+
+    def install_package_error(*args, **kwargs):
+        raise PipxError("raised in test to fail the staged install")
+
+    monkeypatch.setattr(Venv, "install_package", install_package_error)
+    assert run_pipx_cli(
+        ["reinstall", "--staged", "--python", sys.executable, "pycowsay"]
+    )
+    assert (constants.LOCAL_BIN_DIR / app_name("pycowsay")).resolve().is_file()
+    assert not list(constants.PIPX_STAGING_DIR.iterdir())
@@ -0,0 +1,46 @@
+import shutil
+import subprocess
+import sys
+
+from helpers import app_name, run_pipx_cli
+from pipx import constants, pipx_metadata_file, util
+
+
+def test_relocate_nonexistent(pipx_temp_env, capsys):
+    assert run_pipx_cli(["relocate", "--python", sys.executable, "nonexistent"])
+    assert "Nothing to relocate for nonexistent" in capsys.readouterr().out
+
+
+def test_relocate(pipx_temp_env, capsys):
+    assert not run_pipx_cli(["install", "pycowsay"])
+    assert not run_pipx_cli(["relocate", "--python", sys.executable, "pycowsay"])
+    assert "relocated pycowsay" in capsys.readouterr().out
+
+
+def test_relocate_all_moved_pipx_home(pipx_temp_env, monkeypatch, capsys):
+    assert not run_pipx_cli(["install", "pycowsay"])
+
+    old_home = constants.PIPX_HOME
+    new_home = old_home.parent / "movedpipxhome"
+    shutil.move(str(old_home), str(new_home))
+    monkeypatch.setattr(constants, "PIPX_HOME", new_home)
+    monkeypatch.setattr(constants, "PIPX_LOCAL_VENVS", new_home / "venvs")
+    monkeypatch.setattr(constants, "PIPX_VENV_CACHEDIR", new_home / ".cache")
+    monkeypatch.setattr(constants, "PIPX_LOG_DIR", new_home / "logs")
+    monkeypatch.setattr(
+        constants, "PIPX_COMPLETION_INDEX", new_home / "completion_index.json"
+    )
+
+    assert not run_pipx_cli(["relocate-all", "--python", sys.executable])
+
+    venv_dir = new_home / "venvs" / "pycowsay"
+    bin_path, _ = util.get_venv_paths(venv_dir)
+    metadata = pipx_metadata_file.PipxMetadata(venv_dir)
+    assert metadata.main_package.app_paths == [bin_path / app_name("pycowsay")]
+
+    exposed_app = constants.LOCAL_BIN_DIR / app_name("pycowsay")
+    assert exposed_app.resolve() == (bin_path / app_name("pycowsay")).resolve()
+    assert (
+        subprocess.run([str(exposed_app), "moo"], stdout=subprocess.PIPE).returncode
+        == 0
+    )
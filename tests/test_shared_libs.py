@@ -1,9 +1,14 @@
 import os
+import subprocess
+import sys
 import time
 
 import pytest  # type: ignore
 
-from pipx import shared_libs
+from helpers import run_pipx_cli, which_python
+from pipx import constants, shared_libs, util
+from pipx.util import PipxError
+from pipx.venv import Venv
 
 
 @pytest.mark.parametrize(
@@ -22,3 +27,99 @@ def test_auto_update_shared_libs(capsys, pipx_temp_env, mtime_minus_now, needs_u
     os.utime(shared_libs.shared_libs.pip_path, (access_time, mtime_minus_now + now))
 
     assert shared_libs.shared_libs.needs_upgrade is needs_upgrade
+
+
+def test_create_shared_libs_offline(pipx_temp_env, monkeypatch):
+    # nothing may come from the package index
+    monkeypatch.setenv("PIP_INDEX_URL", "http://127.0.0.1:1/simple")
+    shared_libs.shared_libs.create()
+    assert shared_libs.shared_libs.is_valid
+    assert not shared_libs.shared_libs.needs_upgrade
+    assert not shared_libs.shared_libs.has_been_updated_this_run
+
+
+def test_upgrade_shared(pipx_temp_env, capsys):
+    assert not run_pipx_cli(["upgrade-shared"])
+    assert "upgraded shared libraries" in capsys.readouterr().out
+    assert shared_libs.shared_libs.has_been_updated_this_run
+
+
+def test_detached_shared_libs(pipx_temp_env, monkeypatch, capsys):
+    monkeypatch.setattr(constants, "PIPX_DETACH_SHARED_LIBS", True)
+    assert not run_pipx_cli(["install", "pycowsay"])
+
+    venv_dir = constants.PIPX_LOCAL_VENVS / "pycowsay"
+    assert not list(venv_dir.glob("**/" + constants.PIPX_SHARED_PTH))
+    assert list(venv_dir.glob("**/" + constants.PIPX_SHARED_DETACHED))
+
+    _, python_path = util.get_venv_paths(venv_dir)
+    assert subprocess.run([str(python_path), "-c", "import pip"]).returncode != 0
+
+    # pipx itself can still run pip in the venv
+    assert not run_pipx_cli(["inject", "pycowsay", "black"])
+    assert not run_pipx_cli(["runpip", "pycowsay", "list"])
+    assert "black" in capsys.readouterr().out
+
+
+def test_read_only_venv_leaves_shared_libs(pipx_temp_env, monkeypatch, capsys):
+    assert not run_pipx_cli(["install", "pycowsay"])
+    shared_libs.shared_libs.has_been_updated_this_run = False
+    old_mtime = time.time() - shared_libs.SHARED_LIBS_MAX_AGE_SEC - 5 * 60
+    os.utime(shared_libs.shared_libs.pip_path, (old_mtime, old_mtime))
+    upgrades = []
+    monkeypatch.setattr(
+        shared_libs.shared_libs, "upgrade", lambda **kwargs: upgrades.append(kwargs)
+    )
+
+    venv = Venv(constants.PIPX_LOCAL_VENVS / "pycowsay", read_only=True)
+    assert venv.main_package_name == "pycowsay"
+    assert not upgrades
+    with pytest.raises(PipxError, match="read-only"):
+        venv.upgrade_package("pycowsay", "pycowsay", [], False, True, True)
+
+    # pipx list maintains the shared libs once, in the parent process
+    assert not run_pipx_cli(["list"])
+    assert len(upgrades) == 1
+
+
+def find_other_python():
+    """An interpreter of another major.minor version than sys.executable"""
+    for minor in range(6, 14):
+        if minor != sys.version_info.minor:
+            python = which_python(f"python3.{minor}")
+            if python:
+                return python
+    return None
+
+
+# found before pipx_temp_env empties PATH
+OTHER_PYTHON = find_other_python()
+
+
+def test_shared_libs_per_python_version(pipx_temp_env, capfd):
+    other_python = OTHER_PYTHON
+    if other_python is None:
+        pytest.skip("needs an interpreter of another Python version")
+    assert not run_pipx_cli(["install", "pycowsay"])
+    assert not run_pipx_cli(
+        ["install", "pycowsay", "--python", other_python, "--suffix=-other"]
+    )
+    (other_pth,) = (constants.PIPX_LOCAL_VENVS / "pycowsay-other").glob(
+        "**/" + constants.PIPX_SHARED_PTH
+    )
+    other_shared_libs = other_pth.read_text().strip()
+    assert other_shared_libs.startswith(f"{constants.PIPX_SHARED_LIBS}-3.")
+    (default_pth,) = (constants.PIPX_LOCAL_VENVS / "pycowsay").glob(
+        "**/" + constants.PIPX_SHARED_PTH
+    )
+    assert (
+        default_pth.read_text()
+        .strip()
+        .startswith(f"{constants.PIPX_SHARED_LIBS}{os.sep}")
+    )
+
+    # pip of the venv's own Python version
+    capfd.readouterr()
+    assert not run_pipx_cli(["runpip", "pycowsay-other", "--version"])
+    assert other_shared_libs in capfd.readouterr().out
+    assert len(list(shared_libs.iter_shared_libs())) == 2
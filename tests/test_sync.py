@@ -0,0 +1,66 @@
+import json
+
+from helpers import run_pipx_cli
+from package_info import PKG
+from pipx import constants
+
+
+def write_manifest(tmp_path, packages):
+    manifest_path = tmp_path / "manifest.json"
+    manifest_path.write_text(json.dumps({"package": packages}))
+    return str(manifest_path)
+
+
+def test_sync_install_then_noop(pipx_temp_env, capsys, tmp_path):
+    manifest = write_manifest(tmp_path, [{"spec": "pycowsay"}])
+    assert not run_pipx_cli(["sync", manifest])
+    assert (constants.PIPX_LOCAL_VENVS / "pycowsay").is_dir()
+    capsys.readouterr()
+
+    assert not run_pipx_cli(["sync", manifest])
+    assert "are in sync" in capsys.readouterr().out
+
+
+def test_sync_toml(pipx_temp_env, capsys, tmp_path):
+    manifest_path = tmp_path / "manifest.toml"
+    manifest_path.write_text('[[package]]\nspec = "pycowsay"\n')
+    assert not run_pipx_cli(["sync", "--dry-run", str(manifest_path)])
+    assert "install pycowsay" in capsys.readouterr().out
+    assert not (constants.PIPX_LOCAL_VENVS / "pycowsay").exists()
+
+
+def test_sync_inject_and_prune(pipx_temp_env, capsys, tmp_path):
+    assert not run_pipx_cli(["install", "pycowsay"])
+    assert not run_pipx_cli(["install", PKG["pylint"]["spec"]])
+    manifest = write_manifest(
+        tmp_path, [{"spec": "pycowsay", "inject": [PKG["black"]["spec"]]}]
+    )
+    capsys.readouterr()
+
+    assert not run_pipx_cli(["sync", "--dry-run", manifest])
+    assert "inject pycowsay" in capsys.readouterr().out
+    # without --prune, packages not in the manifest are left alone
+    assert (constants.PIPX_LOCAL_VENVS / "pylint").is_dir()
+
+    assert not run_pipx_cli(["sync", "--prune", manifest])
+    assert not (constants.PIPX_LOCAL_VENVS / "pylint").exists()
+    assert not run_pipx_cli(["sync", "--prune", manifest])
+    assert "are in sync" in capsys.readouterr().out
+
+
+def test_sync_reinstall_on_extra_injected(pipx_temp_env, capsys, tmp_path):
+    assert not run_pipx_cli(["install", "pycowsay"])
+    assert not run_pipx_cli(["inject", "pycowsay", PKG["black"]["spec"]])
+    manifest = write_manifest(tmp_path, [{"spec": "pycowsay"}])
+    capsys.readouterr()
+
+    assert not run_pipx_cli(["sync", "--dry-run", manifest])
+    assert "reinstall pycowsay (black injected but not in manifest)" in (
+        capsys.readouterr().out
+    )
+
+
+def test_sync_bad_manifest(pipx_temp_env, capsys, tmp_path):
+    manifest = write_manifest(tmp_path, [{"spec": "pycowsay", "extras": ["x"]}])
+    assert run_pipx_cli(["sync", manifest])
+    assert "unknown" in capsys.readouterr().err
@@ -0,0 +1,40 @@
+import json
+
+from helpers import run_pipx_cli
+from pipx import trace
+
+
+def _load_spans(trace_file):
+    events = json.loads(trace_file.read_text())["traceEvents"]
+    return [event for event in events if event["ph"] == "X"]
+
+
+def test_trace_install(pipx_temp_env, monkeypatch, tmp_path):
+    monkeypatch.setattr(trace, "_trace_file", None)
+    trace_file = tmp_path / "trace.json"
+
+    assert not run_pipx_cli(["install", "--trace", str(trace_file), "pycowsay"])
+
+    spans = _load_spans(trace_file)
+    span_names = {span["name"] for span in spans}
+    for name in [
+        "pipx install",
+        "create_venv",
+        "inspect_venv",
+        "fetch_info_in_venv",
+        "expose_apps",
+    ]:
+        assert name in span_names
+    subprocess_spans = [s for s in spans if s["name"] == "run_subprocess"]
+    assert subprocess_spans
+    assert all(s["args"]["returncode"] == 0 for s in subprocess_spans)
+    assert all(s["dur"] >= 0 for s in spans)
+
+
+def test_trace_env_var(pipx_temp_env, monkeypatch, tmp_path):
+    monkeypatch.setattr(trace, "_trace_file", None)
+    trace_file = tmp_path / "trace.json"
+    monkeypatch.setenv("PIPX_TRACE", str(trace_file))
+
+    assert not run_pipx_cli(["list"])
+    assert [s["name"] for s in _load_spans(trace_file)] == ["pipx list"]
@@ -1,6 +1,7 @@
 import pytest  # type: ignore
 
-from helpers import mock_legacy_venv, run_pipx_cli
+from helpers import app_name, mock_legacy_venv, run_pipx_cli
+from pipx import constants, pipx_metadata_file
 
 
 def test_upgrade(pipx_temp_env, capsys):
@@ -75,3 +76,20 @@ def test_upgrade_no_include_injected(pipx_temp_env, capsys):
     captured = capsys.readouterr()
     assert "upgraded package pylint" in captured.out
     assert "upgraded package black" not in captured.out
+
+
+def test_upgrade_staged(pipx_temp_env, capsys):
+    assert not run_pipx_cli(["install", "pycowsay==0.0.0.1"])
+    assert not run_pipx_cli(["upgrade", "--staged", "pycowsay"])
+    captured = capsys.readouterr()
+    assert "upgraded package pycowsay from 0.0.0.1 to" in captured.out
+    assert str(constants.PIPX_STAGING_DIR) not in captured.out
+
+    venv_dir = constants.PIPX_LOCAL_VENVS / "pycowsay"
+    metadata = pipx_metadata_file.PipxMetadata(venv_dir)
+    assert all(
+        app_path.parent.parent == venv_dir
+        for app_path in metadata.main_package.app_paths
+    )
+    assert (constants.LOCAL_BIN_DIR / app_name("pycowsay")).resolve().is_file()
+    assert not list(constants.PIPX_STAGING_DIR.iterdir())
@@ -0,0 +1,55 @@
+import logging
+import subprocess
+import sys
+
+from pipx import constants, util
+
+
+def test_rmdir_moves_to_trash(pipx_temp_env, monkeypatch):
+    spawned = []
+    monkeypatch.setattr(util, "_trash_emptier", None)
+    monkeypatch.setattr(util, "spawn_detached", spawned.append)
+
+    doomed = constants.PIPX_LOCAL_VENVS / "doomed"
+    (doomed / "sub").mkdir(parents=True)
+    for i in range(20):
+        (doomed / "sub" / f"file{i}.txt").write_text("data")
+    (doomed / "link").symlink_to(doomed / "sub")
+
+    util.rmdir(doomed)
+    assert not doomed.exists()
+    assert len(list(constants.PIPX_TRASH_DIR.iterdir())) == 1
+    assert len(spawned) == 1
+
+    # run the background deletion in the foreground
+    assert subprocess.run([str(c) for c in spawned[0]]).returncode == 0
+    assert not list(constants.PIPX_TRASH_DIR.iterdir())
+
+
+def test_rmdir_nonexistent(pipx_temp_env):
+    util.rmdir(constants.PIPX_LOCAL_VENVS / "nonexistent")
+
+
+def test_run_subprocess_output_tail(caplog):
+    caplog.set_level(logging.DEBUG, logger="pipx")
+    cmd = [
+        sys.executable,
+        "-c",
+        "import sys\n"
+        "for i in range(5000):\n"
+        "    print(f'out {i}')\n"
+        "    print(f'err {i}', file=sys.stderr)\n",
+    ]
+
+    process = util.run_subprocess(cmd, output_tail_lines=10)
+    assert process.returncode == 0
+    stdout_lines = process.stdout.splitlines()
+    assert stdout_lines[0] == "[... 4990 earlier lines omitted, see log file ...]"
+    assert stdout_lines[1:] == [f"out {i}" for i in range(4990, 5000)]
+    assert process.stderr.splitlines()[-1] == "err 4999"
+    # everything still reaches the log
+    assert "stdout: out 0" in caplog.text
+    assert "stderr: err 0" in caplog.text
+
+    process = util.run_subprocess(cmd, output_tail_lines=None)
+    assert len(process.stdout.splitlines()) == 5000
@@ -0,0 +1,55 @@
+import json
+
+import pytest  # type: ignore
+
+from helpers import run_pipx_cli
+from pipx import constants, wheelhouse
+from pipx.util import PipxError
+
+
+def test_get_pip_args(pipx_temp_env, monkeypatch):
+    assert wheelhouse.get_pip_args() == []
+    # no --find-links for a wheelhouse that was never filled
+    monkeypatch.setattr(constants, "PIPX_WHEELHOUSE_MODE", "prefer")
+    assert wheelhouse.get_pip_args() == []
+    constants.PIPX_WHEELHOUSE_DIR.mkdir(parents=True)
+    assert wheelhouse.get_pip_args() == [
+        "--find-links",
+        str(constants.PIPX_WHEELHOUSE_DIR),
+    ]
+    wheelhouse.set_mode("offline")
+    assert wheelhouse.get_pip_args()[0] == "--no-index"
+    wheelhouse.set_mode("online")
+    with pytest.raises(PipxError):
+        wheelhouse.get_pip_args()
+
+
+def test_add_wheels_keeps_stored(pipx_temp_env, tmp_path):
+    constants.PIPX_WHEELHOUSE_DIR.mkdir(parents=True)
+    wheel_dir = tmp_path / "built"
+    wheel_dir.mkdir()
+    (wheel_dir / "a-1.0-py3-none-any.whl").write_bytes(b"first")
+    assert wheelhouse.add_wheels(wheel_dir) == ["a-1.0-py3-none-any.whl"]
+
+    (wheel_dir / "a-1.0-py3-none-any.whl").write_bytes(b"rebuilt")
+    assert wheelhouse.add_wheels(wheel_dir) == []
+    stored_path = constants.PIPX_WHEELHOUSE_DIR / "a-1.0-py3-none-any.whl"
+    assert stored_path.read_bytes() == b"first"
+    assert list(wheel_dir.iterdir()) == []
+    index = json.loads((constants.PIPX_WHEELHOUSE_DIR / "index.json").read_text())
+    assert list(index) == ["a-1.0-py3-none-any.whl"]
+
+
+def test_wheelhouse_fill_then_offline_install(pipx_temp_env, capsys):
+    assert not run_pipx_cli(["install", "pycowsay"])
+    assert not run_pipx_cli(["wheelhouse", "fill"])
+    assert "Added" in capsys.readouterr().out
+    assert list(constants.PIPX_WHEELHOUSE_DIR.glob("pycowsay-*.whl"))
+    assert list(constants.PIPX_WHEELHOUSE_DIR.glob("pip-*.whl"))
+
+    assert not run_pipx_cli(["wheelhouse", "fill"])
+    assert "No new wheels" in capsys.readouterr().out
+
+    assert not run_pipx_cli(["uninstall", "pycowsay"])
+    assert not run_pipx_cli(["install", "--offline", "pycowsay"])
+    assert run_pipx_cli(["install", "--offline", "black"])